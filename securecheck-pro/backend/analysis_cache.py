@@ -0,0 +1,157 @@
+"""
+SSL 분석 결과 캐시 모듈
+
+같은 대상(도메인, 포트, 스키마)에 대한 반복 분석을 TTL + LRU 캐시로 흡수합니다.
+stale_while_revalidate 가 설정되면 TTL 이 지난 결과를 즉시 반환하면서 백그라운드에서 다시 분석합니다.
+같은 대상에 대한 동시 요청은 진행 중인 하나의 분석을 함께 기다립니다 (single-flight).
+분석을 기다리던 요청이 모두 취소되면(클라이언트 연결 종료, 작업 취소) 분석도 중단하여 스캔 연결을 반납합니다.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from metrics import background_errors
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, int, str]
+
+
+def normalize_target(url: str) -> CacheKey:
+    """URL을 (도메인, 포트, 스키마) 키로 정규화합니다 - SSLAnalyzer.analyze 의 포트 규칙과 동일"""
+    parsed_url = urlparse(url)
+    scheme = (parsed_url.scheme or 'https').lower()
+    domain = (parsed_url.hostname or parsed_url.path).lower().rstrip('.')
+    try:
+        port = parsed_url.port
+    except ValueError:
+        port = None
+    if port is None:
+        port = 443 if scheme == 'https' else 80
+    return domain, port, scheme
+
+
+class AnalysisCache:
+    """분석 결과 TTL + LRU 캐시"""
+
+    def __init__(self, ttl: float = 300, max_entries: int = 1000, stale_while_revalidate: float = 0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_while_revalidate = stale_while_revalidate
+
+        # key -> (저장 시각(monotonic), 분석 결과), 가장 최근에 사용한 항목이 끝에 위치
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict]]" = OrderedDict()
+        # 진행 중인 분석 (동시 요청 병합용)
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+        # 진행 중인 분석별 기다리는 요청 수 (백그라운드 갱신은 기다리는 요청이 없어도 계속 실행)
+        self._waiters: Dict[asyncio.Task, int] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_ratio': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            'coalesced': self.coalesced,
+            'inflight': len(self._inflight),
+            'size': len(self._entries)
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_or_analyze(self, url: str, analyze: Callable[[str], Awaitable[Dict]],
+                             bypass: bool = False) -> Tuple[Dict, Optional[float]]:
+        """캐시된 결과 또는 새 분석 결과를 반환합니다.
+
+        반환값: (분석 결과, 캐시 나이(초) - 새로 분석한 경우 None)
+        """
+        key = normalize_target(url)
+
+        if not bypass:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                age = time.monotonic() - stored_at
+                if age <= self.ttl:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return dict(result), age
+                if age <= self.ttl + self.stale_while_revalidate:
+                    self.stale_hits += 1
+                    self._entries.move_to_end(key)
+                    self._schedule_refresh(key, url, analyze)
+                    return dict(result), age
+                del self._entries[key]
+
+        self.misses += 1
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # 같은 대상을 이미 분석 중이면 그 결과를 공유 (강제 재분석 요청 포함)
+            self.coalesced += 1
+        else:
+            inflight = self._start_analysis(key, url, analyze)
+        result = await self._wait(key, inflight)
+        return dict(result), None
+
+    async def _wait(self, key: CacheKey, task: asyncio.Task) -> Dict:
+        """진행 중인 분석을 기다립니다 - 마지막으로 기다리던 요청이 취소되면 분석도 취소"""
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                # 새 요청이 취소 중인 분석에 합류하지 않도록 바로 제거
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _store(self, key: CacheKey, result: Dict):
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _start_analysis(self, key: CacheKey, url: str, analyze: Callable[[str], Awaitable[Dict]]) -> asyncio.Task:
+        """분석을 별도 태스크로 실행 - 먼저 요청한 클라이언트가 끊겨도 대기 중인 다른 요청은 결과를 받음"""
+        async def run():
+            try:
+                result = await analyze(url)
+                # 마감 시간 초과로 일부 단계가 빠진 결과는 캐시하지 않음
+                if not result.get('timed_out'):
+                    self._store(key, result)
+                return result
+            finally:
+                # 취소된 뒤 같은 대상의 새 분석이 시작되었을 수 있으므로 자신인 경우에만 제거
+                if self._inflight.get(key) is asyncio.current_task():
+                    del self._inflight[key]
+
+        def log_failure(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is not None:
+                background_errors.inc(('analysis',))
+                logger.warning('분석 실패: %s - %s', url, task.exception())
+
+        task = asyncio.create_task(run())
+        task.add_done_callback(log_failure)
+        self._inflight[key] = task
+        return task
+
+    def _schedule_refresh(self, key: CacheKey, url: str, analyze: Callable[[str], Awaitable[Dict]]):
+        """만료된 항목을 백그라운드에서 다시 분석 (대상당 하나의 갱신 작업만 실행)"""
+        if key not in self._inflight:
+            self._start_analysis(key, url, analyze)
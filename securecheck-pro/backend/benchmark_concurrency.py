@@ -0,0 +1,168 @@
+"""
+SSLAnalyzer 동시성 벤치마크
+
+로컬 루프백에 느린 TLS 서버(핸드셰이크 전에 지연)를 띄우고 N개의 분석을 동시에 실행하여
+분석별 지연 시간(p50/p95/p99)과 이벤트 루프 최대 정지 시간을 측정합니다.
+
+사용법:
+    python benchmark_concurrency.py --concurrency 50 --delay 0.5
+
+블로킹 구현과 비교하려면 이전 커밋을 체크아웃한 상태에서 같은 명령을 실행하면 됩니다.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from typing import List
+
+from scan_governor import ScanGovernor
+from ssl_analyzer import SSLAnalyzer
+
+
+def create_self_signed_cert(directory: str) -> tuple:
+    """openssl CLI로 localhost용 자체 서명 인증서를 생성합니다"""
+    cert_path = os.path.join(directory, 'cert.pem')
+    key_path = os.path.join(directory, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+         '-keyout', key_path, '-out', cert_path, '-days', '30',
+         '-subj', '/CN=localhost'],
+        check=True, capture_output=True
+    )
+    return cert_path, key_path
+
+
+async def start_slow_tls_server(cert_path: str, key_path: str, delay: float):
+    """TCP 수락 후 delay초 기다린 뒤 TLS 핸드셰이크와 간단한 HTTP 응답을 처리하는 서버"""
+    loop = asyncio.get_running_loop()
+    server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    server_context.load_cert_chain(cert_path, key_path)
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1024)
+    listener.setblocking(False)
+
+    async def handle(sock: socket.socket):
+        writer = None
+        try:
+            # 지연 동안 소켓을 읽지 않아 ClientHello가 커널 버퍼에 남아 있도록 함
+            await asyncio.sleep(delay)
+            reader = asyncio.StreamReader()
+            protocol = asyncio.StreamReaderProtocol(reader)
+            transport, _ = await loop.connect_accepted_socket(lambda: protocol, sock, ssl=server_context)
+            writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+            await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout=5)
+            body = b'ok'
+            writer.write(
+                b'HTTP/1.1 200 OK\r\n'
+                b'Content-Type: text/plain\r\n'
+                b'X-Frame-Options: DENY\r\n'
+                b'Content-Length: ' + str(len(body)).encode() + b'\r\n'
+                b'Connection: close\r\n\r\n' + body
+            )
+            await writer.drain()
+        except Exception:
+            # 포트 테스트처럼 핸드셰이크 직후 끊는 연결은 무시
+            pass
+        finally:
+            if writer is not None:
+                writer.close()
+            else:
+                sock.close()
+
+    async def accept_loop():
+        while True:
+            sock, _ = await loop.sock_accept(listener)
+            asyncio.create_task(handle(sock))
+
+    accept_task = asyncio.create_task(accept_loop())
+    port = listener.getsockname()[1]
+
+    async def close():
+        accept_task.cancel()
+        await asyncio.gather(accept_task, return_exceptions=True)
+        listener.close()
+
+    return close, port
+
+
+def start_server_thread(cert_path: str, key_path: str, delay: float) -> tuple:
+    """분석기가 루프를 블로킹해도 서버는 응답하도록 별도 스레드의 이벤트 루프에서 서버를 실행합니다"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    close, port = asyncio.run_coroutine_threadsafe(
+        start_slow_tls_server(cert_path, key_path, delay), loop
+    ).result()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(close(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+
+    return stop, port
+
+
+async def measure_loop_stall(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """이벤트 루프가 예정보다 늦게 깨어난 최대 시간(초)을 측정합니다"""
+    max_stall = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_stall = max(max_stall, time.perf_counter() - started - interval)
+    return max_stall
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run_benchmark(concurrency: int, delay: float):
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = create_self_signed_cert(directory)
+        stop_server, port = start_server_thread(cert_path, key_path, delay)
+        # 모든 분석이 같은 루프백 IP 로 향하므로 대상별 속도 제한 없이 전역 동시성만 적용 (분석 자체의 지연 측정)
+        analyzer = SSLAnalyzer(governor=ScanGovernor(max_concurrency=max(200, concurrency * 4)))
+        await analyzer.start()
+        url = f'https://localhost:{port}'
+
+        async def timed_analysis() -> float:
+            started = time.perf_counter()
+            await analyzer.analyze(url)
+            return time.perf_counter() - started
+
+        stop = asyncio.Event()
+        stall_task = asyncio.create_task(measure_loop_stall(stop))
+        wall_started = time.perf_counter()
+        latencies = await asyncio.gather(*[timed_analysis() for _ in range(concurrency)])
+        wall_time = time.perf_counter() - wall_started
+        stop.set()
+        max_stall = await stall_task
+
+        await analyzer.close()
+        stop_server()
+
+    print(f'동시 분석 수: {concurrency}, 핸드셰이크 지연: {delay:.2f}s')
+    print(f'전체 소요 시간: {wall_time:.2f}s')
+    print(f'p50: {percentile(latencies, 50):.2f}s  '
+          f'p95: {percentile(latencies, 95):.2f}s  '
+          f'p99: {percentile(latencies, 99):.2f}s')
+    print(f'이벤트 루프 최대 정지: {max_stall * 1000:.0f}ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='SSLAnalyzer 동시성 벤치마크')
+    parser.add_argument('--concurrency', type=int, default=20, help='동시에 실행할 분석 수')
+    parser.add_argument('--delay', type=float, default=0.5, help='서버 핸드셰이크 지연(초)')
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.concurrency, args.delay))
@@ -0,0 +1,479 @@
+"""
+SSLAnalyzer 처리량 벤치마크 (로컬 TLS 대상 서버 모음)
+
+루프백에 여러 종류의 대상 서버를 띄우고, 동시 실행 수를 바꿔 가며 분석을 반복하여
+초당 분석 수, 분석별 지연 시간(p50/p95/p99), 이벤트 루프 최대 정지 시간, 최대 메모리 사용량을 측정합니다.
+인터넷에 접속하지 않으므로 분석 경로의 성능 회귀를 언제든 같은 조건에서 확인할 수 있습니다.
+
+대상 서버:
+    valid          벤치마크용 CA 가 발급한 정상 인증서 (분석기 신뢰 저장소에 CA 추가)
+    untrusted      신뢰하지 않는 CA 가 발급한 인증서
+    self_signed    자체 서명 인증서
+    expired        만료된 인증서
+    not_yet_valid  아직 유효 기간이 시작되지 않은 인증서
+    plain_http     TLS 없이 HTTP 만 응답
+    slow           TCP 수락 후 --slow-delay 초 뒤에 핸드셰이크
+    refused        수신 대기하지 않는 포트
+
+심층 분석(--deep-scan) 확인용 대상 (프로토콜/암호 스위트 고정, 인증서는 valid 와 같은 CA 발급):
+    tls10_only       TLS 1.0 만 허용
+    tls13_only       TLS 1.3 만 허용
+    static_rsa_only  TLS 1.2 이하 + RSA 키 교환(kRSA) 암호만 허용 (RSA 인증서)
+    null_cipher      TLS 1.2 이하 + 일반 암호와 함께 암호화 없는(eNULL) 암호도 허용
+
+각 대상의 분석 결과(ssl_status)가 예상과 다르면 함께 출력하므로 기능 회귀도 확인할 수 있습니다.
+--deep-scan 을 지정하면 위 대상의 supported_protocols / weak_cipher_groups / 수용한 암호 그룹도 확인합니다.
+
+사용법:
+    python benchmark_farm.py --concurrency 1 10 50 --analyses 200
+    python benchmark_farm.py --targets valid slow --json > result.json
+    python benchmark_farm.py --targets tls10_only tls13_only static_rsa_only null_cipher --deep-scan \\
+        --concurrency 1 --analyses 4
+"""
+
+import argparse
+import asyncio
+import datetime
+import ipaddress
+import json
+import os
+import resource
+import socket
+import ssl
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from cryptography.x509.oid import NameOID
+
+from benchmark_concurrency import measure_loop_stall, percentile
+from scan_governor import ScanGovernor
+from ssl_analyzer import SSLAnalyzer
+from ssl_contexts import SSLContextRegistry
+
+HOST = '127.0.0.1'
+
+# 대상별 예상 ssl_status (None 이면 확인하지 않음)
+EXPECTED_STATUS = {
+    'valid': 'valid',
+    'untrusted': 'verify_failed',
+    'self_signed': 'self_signed',
+    'expired': 'expired',
+    'not_yet_valid': 'not_yet_valid',
+    'plain_http': 'no_ssl',
+    'slow': 'valid',
+    'refused': 'no_ssl',
+    'tls10_only': 'valid',
+    'tls13_only': 'valid',
+    'static_rsa_only': 'valid',
+    'null_cipher': 'valid',
+}
+
+# 심층 분석 대상별 서버 설정 (최소/최대 프로토콜 버전, OpenSSL 암호 문자열 - TLS 1.2 이하에만 적용)
+SERVER_PROFILES = {
+    'tls10_only': (ssl.TLSVersion.TLSv1, ssl.TLSVersion.TLSv1, 'ECDHE-ECDSA-AES128-SHA:@SECLEVEL=0'),
+    'tls13_only': (ssl.TLSVersion.TLSv1_3, ssl.TLSVersion.TLSv1_3, None),
+    'static_rsa_only': (None, ssl.TLSVersion.TLSv1_2, 'kRSA'),
+    'null_cipher': (None, ssl.TLSVersion.TLSv1_2, 'ECDHE-ECDSA-AES128-GCM-SHA256:ECDHE-ECDSA-NULL-SHA:@SECLEVEL=0'),
+}
+
+# 심층 분석 대상별 예상 결과 (protocol_scan 의 supported_protocols, weak_cipher_groups, 수용한 암호 그룹)
+EXPECTED_PROTOCOL_SCAN = {
+    'tls10_only': {'supported_protocols': ['TLSv1'], 'weak_cipher_groups': [], 'accepted_cipher_groups': []},
+    'tls13_only': {'supported_protocols': ['TLSv1.3'], 'weak_cipher_groups': [], 'accepted_cipher_groups': []},
+    'static_rsa_only': {'supported_protocols': ['TLSv1.2'], 'weak_cipher_groups': [],
+                        'accepted_cipher_groups': ['static_rsa']},
+    'null_cipher': {'supported_protocols': ['TLSv1.2'], 'weak_cipher_groups': ['null'],
+                    'accepted_cipher_groups': ['null']},
+}
+
+HTTP_RESPONSE = (
+    b'HTTP/1.1 200 OK\r\n'
+    b'Content-Type: text/plain\r\n'
+    b'Strict-Transport-Security: max-age=31536000\r\n'
+    b'X-Frame-Options: DENY\r\n'
+    b'Content-Length: 2\r\n'
+    b'Connection: close\r\n\r\nok'
+)
+
+# 평문 HTTP 서버가 TLS ClientHello 같은 HTTP 가 아닌 요청에 보내는 응답
+BAD_REQUEST_RESPONSE = b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'
+
+
+class CertificateFactory:
+    """벤치마크용 CA 와 대상별 인증서를 cryptography 로 생성하여 PEM 파일로 저장합니다"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def _name(common_name: str) -> x509.Name:
+        return x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+
+    def save(self, name: str, certificate: x509.Certificate, key=None) -> Tuple[str, Optional[str]]:
+        cert_path = os.path.join(self.directory, f'{name}.crt')
+        with open(cert_path, 'wb') as f:
+            f.write(certificate.public_bytes(serialization.Encoding.PEM))
+        if key is None:
+            return cert_path, None
+        key_path = os.path.join(self.directory, f'{name}.key')
+        with open(key_path, 'wb') as f:
+            f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                      serialization.NoEncryption()))
+        return cert_path, key_path
+
+    def authority(self, name: str):
+        """자체 서명 CA 인증서와 키"""
+        key = ec.generate_private_key(ec.SECP256R1())
+        now = datetime.datetime.now(datetime.timezone.utc)
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(self._name(name)).issuer_name(self._name(name))
+            .public_key(key.public_key()).serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=3650))
+            .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+            .add_extension(x509.KeyUsage(digital_signature=True, content_commitment=False, key_encipherment=False,
+                                         data_encipherment=False, key_agreement=False, key_cert_sign=True,
+                                         crl_sign=True, encipher_only=False, decipher_only=False), critical=True)
+            .add_extension(x509.SubjectKeyIdentifier.from_public_key(key.public_key()), critical=False)
+            .sign(key, hashes.SHA256())
+        )
+        return certificate, key
+
+    def leaf(self, name: str, issuer=None, not_before_days: int = -1, not_after_days: int = 90,
+             key_type: str = 'ec') -> Tuple[str, str]:
+        """HOST 용 서버 인증서 - issuer 가 None 이면 자체 서명 (인증서 체인 파일, 키 파일 경로 반환)
+
+        key_type: 'ec'(P-256) 또는 'rsa'(2048비트, RSA 키 교환 암호 대상용)
+        """
+        if key_type == 'rsa':
+            key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        else:
+            key = ec.generate_private_key(ec.SECP256R1())
+        now = datetime.datetime.now(datetime.timezone.utc)
+        subject = self._name('localhost')
+        issuer_certificate, issuer_key = issuer if issuer is not None else (None, key)
+        builder = (
+            x509.CertificateBuilder()
+            .subject_name(subject)
+            .issuer_name(issuer_certificate.subject if issuer_certificate is not None else subject)
+            .public_key(key.public_key()).serial_number(x509.random_serial_number())
+            .not_valid_before(now + datetime.timedelta(days=not_before_days))
+            .not_valid_after(now + datetime.timedelta(days=not_after_days))
+            .add_extension(x509.SubjectAlternativeName([
+                x509.DNSName('localhost'), x509.IPAddress(ipaddress.ip_address(HOST))
+            ]), critical=False)
+            .add_extension(x509.ExtendedKeyUsage([x509.oid.ExtendedKeyUsageOID.SERVER_AUTH]), critical=False)
+        )
+        if issuer_certificate is not None:
+            builder = builder.add_extension(
+                x509.AuthorityKeyIdentifier.from_issuer_public_key(issuer_certificate.public_key()), critical=False
+            )
+        certificate = builder.sign(issuer_key, hashes.SHA256())
+        cert_path, key_path = self.save(name, certificate, key)
+        if issuer_certificate is not None:
+            # 서버가 CA 인증서까지 체인으로 전송
+            with open(cert_path, 'ab') as f:
+                f.write(issuer_certificate.public_bytes(serialization.Encoding.PEM))
+        return cert_path, key_path
+
+
+class TargetFarm:
+    """별도 스레드의 이벤트 루프에서 대상 서버들을 실행합니다 (분석기 루프와 분리)"""
+
+    def __init__(self, slow_delay: float = 0.2):
+        self.slow_delay = slow_delay
+        self.ports: Dict[str, int] = {}
+        self.trusted_ca_path: Optional[str] = None
+
+        self._directory = tempfile.TemporaryDirectory()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._servers: List[asyncio.AbstractServer] = []
+        self._listeners: List[socket.socket] = []
+        self._accept_tasks: List[asyncio.Task] = []
+
+    def start(self, targets: List[str]):
+        certificates = CertificateFactory(self._directory.name)
+        trusted_ca = certificates.authority('SecureCheck Benchmark Root CA')
+        untrusted_ca = certificates.authority('SecureCheck Benchmark Untrusted CA')
+        self.trusted_ca_path, _ = certificates.save('trusted_ca', trusted_ca[0])
+
+        chains = {
+            'valid': lambda: certificates.leaf('valid', trusted_ca),
+            'untrusted': lambda: certificates.leaf('untrusted', untrusted_ca),
+            'self_signed': lambda: certificates.leaf('self_signed'),
+            'expired': lambda: certificates.leaf('expired', trusted_ca, not_before_days=-120, not_after_days=-30),
+            'not_yet_valid': lambda: certificates.leaf('not_yet_valid', trusted_ca,
+                                                       not_before_days=30, not_after_days=120),
+            'slow': lambda: certificates.leaf('slow', trusted_ca),
+            'tls10_only': lambda: certificates.leaf('tls10_only', trusted_ca),
+            'tls13_only': lambda: certificates.leaf('tls13_only', trusted_ca),
+            'static_rsa_only': lambda: certificates.leaf('static_rsa_only', trusted_ca, key_type='rsa'),
+            'null_cipher': lambda: certificates.leaf('null_cipher', trusted_ca),
+        }
+
+        self._thread.start()
+        for target in targets:
+            if target == 'refused':
+                self.ports[target] = self._unused_port()
+                continue
+            context = None
+            if target in chains:
+                context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+                context.load_cert_chain(*chains[target]())
+                if target in SERVER_PROFILES:
+                    self._apply_profile(context, *SERVER_PROFILES[target])
+            delay = self.slow_delay if target == 'slow' else 0.0
+            self.ports[target] = asyncio.run_coroutine_threadsafe(self._serve(context, delay), self._loop).result()
+
+    def stop(self):
+        async def close():
+            for task in self._accept_tasks:
+                task.cancel()
+            await asyncio.gather(*self._accept_tasks, return_exceptions=True)
+            for listener in self._listeners:
+                listener.close()
+            for server in self._servers:
+                server.close()
+
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._directory.cleanup()
+
+    def url(self, target: str) -> str:
+        return f'https://{HOST}:{self.ports[target]}'
+
+    @staticmethod
+    def _apply_profile(context: ssl.SSLContext, minimum: Optional[ssl.TLSVersion],
+                       maximum: Optional[ssl.TLSVersion], ciphers: Optional[str]):
+        with warnings.catch_warnings():
+            # TLS 1.0 지정 시 DeprecationWarning
+            warnings.simplefilter('ignore', DeprecationWarning)
+            if minimum is not None:
+                context.minimum_version = minimum
+            if maximum is not None:
+                context.maximum_version = maximum
+        if ciphers is not None:
+            context.set_ciphers(ciphers)
+
+    @staticmethod
+    def _unused_port() -> int:
+        """바인딩 후 바로 닫은 포트 - 연결하면 즉시 거부됨"""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind((HOST, 0))
+            return sock.getsockname()[1]
+
+    async def _serve(self, context: Optional[ssl.SSLContext], delay: float) -> int:
+        """HTTP 요청 하나에 응답하는 서버 - context 가 None 이면 평문 HTTP, delay 만큼 핸드셰이크 지연"""
+        loop = asyncio.get_running_loop()
+
+        async def respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            try:
+                if context is None:
+                    # TLS 레코드(0x16)로 시작하면 nginx 등처럼 요청 끝을 기다리지 않고 바로 400 응답
+                    first = await asyncio.wait_for(reader.read(1), timeout=5)
+                    if first == b'\x16':
+                        writer.write(BAD_REQUEST_RESPONSE)
+                        await writer.drain()
+                        return
+                await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout=5)
+                writer.write(HTTP_RESPONSE)
+                await writer.drain()
+            except Exception:
+                # 포트 테스트처럼 핸드셰이크 직후 끊는 연결은 무시
+                pass
+            finally:
+                writer.close()
+
+        if delay <= 0:
+            server = await asyncio.start_server(respond, HOST, 0, ssl=context, backlog=1024)
+            self._servers.append(server)
+            return server.sockets[0].getsockname()[1]
+
+        # 지연 동안 소켓을 읽지 않아 ClientHello 가 커널 버퍼에 남아 있도록 직접 수락
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((HOST, 0))
+        listener.listen(1024)
+        listener.setblocking(False)
+        self._listeners.append(listener)
+
+        async def handle(sock: socket.socket):
+            try:
+                await asyncio.sleep(delay)
+                reader = asyncio.StreamReader()
+                protocol = asyncio.StreamReaderProtocol(reader)
+                transport, _ = await loop.connect_accepted_socket(lambda: protocol, sock, ssl=context)
+            except Exception:
+                sock.close()
+                return
+            await respond(reader, asyncio.StreamWriter(transport, protocol, reader, loop))
+
+        async def accept_loop():
+            while True:
+                sock, _ = await loop.sock_accept(listener)
+                asyncio.create_task(handle(sock))
+
+        self._accept_tasks.append(asyncio.create_task(accept_loop()))
+        return listener.getsockname()[1]
+
+
+def protocol_scan_mismatches(protocol_scan: Dict, expected: Dict) -> List[str]:
+    """심층 분석 결과와 예상 값이 다른 항목 설명 목록"""
+    actual = {
+        'supported_protocols': protocol_scan.get('supported_protocols'),
+        'weak_cipher_groups': protocol_scan.get('weak_cipher_groups'),
+        'accepted_cipher_groups': [name for name, accepted in protocol_scan.get('cipher_groups', {}).items()
+                                   if accepted],
+    }
+    return [f'{key}={actual[key]} (예상 {value})' for key, value in expected.items() if actual[key] != value]
+
+
+def peak_rss_mb() -> float:
+    """프로세스 최대 상주 메모리 (MB) - Linux 는 KB, macOS 는 바이트 단위"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+async def run_level(analyzer: SSLAnalyzer, farm: TargetFarm, targets: List[str],
+                    concurrency: int, analyses: int, trace_memory: bool) -> Dict:
+    """동시 실행 수 concurrency 로 analyses 건의 분석을 대상 순서대로 돌아가며 실행합니다"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    per_target: Dict[str, List[float]] = {target: [] for target in targets}
+    mismatches: Counter = Counter()
+    errors: Counter = Counter()
+
+    async def timed_analysis(index: int):
+        target = targets[index % len(targets)]
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await analyzer.analyze(farm.url(target))
+            except Exception as e:
+                errors[f'{target}: {type(e).__name__}'] += 1
+                return
+            elapsed = time.perf_counter() - started
+        latencies.append(elapsed)
+        per_target[target].append(elapsed)
+        expected = EXPECTED_STATUS.get(target)
+        if expected is not None and result.get('ssl_status') != expected:
+            mismatches[f"{target}: {result.get('ssl_status')} (예상 {expected})"] += 1
+        if analyzer.deep_scan and target in EXPECTED_PROTOCOL_SCAN:
+            for mismatch in protocol_scan_mismatches(result.get('protocol_scan') or {},
+                                                     EXPECTED_PROTOCOL_SCAN[target]):
+                mismatches[f'{target}: {mismatch}'] += 1
+
+    if trace_memory:
+        tracemalloc.reset_peak()
+    stop = asyncio.Event()
+    stall_task = asyncio.create_task(measure_loop_stall(stop))
+    wall_started = time.perf_counter()
+    await asyncio.gather(*[timed_analysis(i) for i in range(analyses)])
+    wall_time = time.perf_counter() - wall_started
+    stop.set()
+    max_stall = await stall_task
+
+    return {
+        'concurrency': concurrency,
+        'analyses': len(latencies),
+        'wall_time_s': round(wall_time, 3),
+        'analyses_per_second': round(len(latencies) / wall_time, 1) if wall_time else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        'max_loop_stall_ms': round(max_stall * 1000, 1),
+        'peak_traced_mb': round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1) if trace_memory else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'target_p50_ms': {target: round(percentile(values, 50) * 1000, 1)
+                          for target, values in per_target.items() if values},
+        'status_mismatches': dict(mismatches),
+        'errors': dict(errors),
+    }
+
+
+def print_level(level: Dict):
+    print(f"동시 분석 수: {level['concurrency']}, 분석 {level['analyses']}건, 소요 시간 {level['wall_time_s']:.2f}s")
+    print(f"  처리량: {level['analyses_per_second']:.1f} 분석/초")
+    if level['p50_ms'] is not None:
+        print(f"  p50: {level['p50_ms']:.1f}ms  p95: {level['p95_ms']:.1f}ms  p99: {level['p99_ms']:.1f}ms")
+    print(f"  이벤트 루프 최대 정지: {level['max_loop_stall_ms']:.0f}ms")
+    memory = f"  최대 메모리: RSS {level['peak_rss_mb']:.1f}MB"
+    if level['peak_traced_mb'] is not None:
+        memory += f", Python 힙(tracemalloc) {level['peak_traced_mb']:.1f}MB"
+    print(memory)
+    print('  대상별 p50: ' + ', '.join(f'{target} {ms:.0f}ms' for target, ms in level['target_p50_ms'].items()))
+    for mismatch, count in level['status_mismatches'].items():
+        print(f'  [결과 불일치] {mismatch} x{count}')
+    for error, count in level['errors'].items():
+        print(f'  [오류] {error} x{count}')
+
+
+async def run_benchmark(args: argparse.Namespace):
+    farm = TargetFarm(slow_delay=args.slow_delay)
+    farm.start(args.targets)
+    if args.trace_memory:
+        tracemalloc.start()
+
+    # 모든 대상이 같은 루프백 IP 이므로 대상별 속도 제한 없이 전역 동시성만 적용
+    analyzer = SSLAnalyzer(
+        ssl_contexts=SSLContextRegistry(cafile=farm.trusted_ca_path),
+        governor=ScanGovernor(max_concurrency=max(args.concurrency) * 4),
+        analysis_timeout=args.timeout,
+        deep_scan=args.deep_scan
+    )
+    await analyzer.start()
+    levels = []
+    try:
+        if args.warmup:
+            # CA 번들 로드, 인증서 파싱 캐시 등 최초 실행 비용 제외
+            await run_level(analyzer, farm, args.targets, len(args.targets), len(args.targets), False)
+        for concurrency in args.concurrency:
+            level = await run_level(analyzer, farm, args.targets, concurrency, args.analyses, args.trace_memory)
+            levels.append(level)
+            if not args.json:
+                print_level(level)
+    finally:
+        await analyzer.close()
+        farm.stop()
+
+    if args.json:
+        print(json.dumps({
+            'targets': args.targets,
+            'slow_delay_s': args.slow_delay,
+            'deep_scan': args.deep_scan,
+            'levels': levels,
+            'tls_sessions': analyzer.tls_sessions.stats(),
+            'scan_governor': analyzer.governor.stats(),
+        }, ensure_ascii=False, indent=2))
+    return levels
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='SSLAnalyzer 처리량 벤치마크 (로컬 TLS 대상 서버)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50], help='측정할 동시 분석 수 목록')
+    parser.add_argument('--analyses', type=int, default=200, help='동시 분석 수마다 실행할 분석 수')
+    parser.add_argument('--targets', nargs='+', choices=list(EXPECTED_STATUS), default=list(EXPECTED_STATUS),
+                        help='분석할 대상 종류 (순서대로 돌아가며 분석)')
+    parser.add_argument('--slow-delay', type=float, default=0.2, help='slow 대상의 핸드셰이크 지연(초)')
+    parser.add_argument('--timeout', type=float, default=10, help='분석 한 건의 제한 시간(초)')
+    parser.add_argument('--deep-scan', action='store_true', help='프로토콜/암호 스위트 심층 분석 포함')
+    parser.add_argument('--no-warmup', dest='warmup', action='store_false', help='측정 전 예열 분석 생략')
+    parser.add_argument('--no-trace-memory', dest='trace_memory', action='store_false',
+                        help='tracemalloc 을 끄고 측정 (처리량 측정 오버헤드 제거, RSS 만 기록)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON 으로 출력')
+    args = parser.parse_args()
+    levels = asyncio.run(run_benchmark(args))
+    # 결과 불일치/오류가 있으면 0 이 아닌 종료 코드 (CI 에서 회귀 감지용)
+    sys.exit(1 if any(level['status_mismatches'] or level['errors'] for level in levels) else 0)
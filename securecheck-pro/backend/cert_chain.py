@@ -0,0 +1,277 @@
+"""
+인증서 체인 분석 모듈
+
+서버가 보낸 DER 인증서 체인을 파싱하여 유효기간, 자체 서명 여부, SAN, 공개키, 서명 알고리즘, 체인 구성을 계산합니다.
+파싱 결과는 SHA-256 지문을 키로 캐시하므로 같은 인증서를 쓰는 여러 호스트(CDN, 와일드카드 인증서,
+www/non-www)를 분석할 때 다시 파싱하지 않습니다.
+
+analyze_certificate_chain 은 검증 없이(CERT_NONE) 한 번의 핸드셰이크로 수집한 체인을
+certifi 신뢰 저장소 기준으로 오프라인 검증하며, SSLAnalyzer._analyze_certificate_real 과 같은 결과 키를 반환합니다.
+"""
+
+import hashlib
+import ipaddress
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from cryptography import x509
+from cryptography.hazmat.primitives.asymmetric import dsa, ec, ed448, ed25519, rsa
+from cryptography.x509.oid import NameOID, SignatureAlgorithmOID
+from cryptography.x509.verification import DNSName, IPAddress, PolicyBuilder, Store, VerificationError
+
+from ssl_contexts import default_registry
+
+
+# getpeercert() 딕셔너리와 같은 속성 이름을 사용하기 위한 매핑
+_NAME_ATTRIBUTES = {
+    NameOID.COMMON_NAME: 'commonName',
+    NameOID.COUNTRY_NAME: 'countryName',
+    NameOID.STATE_OR_PROVINCE_NAME: 'stateOrProvinceName',
+    NameOID.LOCALITY_NAME: 'localityName',
+    NameOID.ORGANIZATION_NAME: 'organizationName',
+    NameOID.ORGANIZATIONAL_UNIT_NAME: 'organizationalUnitName',
+    NameOID.EMAIL_ADDRESS: 'emailAddress',
+    NameOID.SERIAL_NUMBER: 'serialNumber',
+    NameOID.DOMAIN_COMPONENT: 'domainComponent',
+}
+
+# 서명 알고리즘 OID -> 이름 (예: RSA_WITH_SHA256)
+_SIGNATURE_ALGORITHMS = {
+    oid: name for name, oid in vars(SignatureAlgorithmOID).items() if isinstance(oid, x509.ObjectIdentifier)
+}
+
+def get_trust_store() -> Store:
+    """certifi CA 번들로 만든 신뢰 저장소 (번들 파일이 바뀔 때만 다시 로드)"""
+    return default_registry.trust_store()
+
+
+def _name_to_dict(name: x509.Name) -> Dict[str, str]:
+    return {
+        _NAME_ATTRIBUTES.get(attribute.oid, attribute.oid.dotted_string): attribute.value
+        for attribute in name
+    }
+
+
+def _format_cert_time(value: datetime) -> str:
+    """getpeercert()와 같은 형식: 'Aug 18 00:00:00 2025 GMT'"""
+    return f"{value:%b} {value.day:2d} {value:%H:%M:%S %Y} GMT"
+
+
+def _format_serial(serial: int) -> str:
+    serial_hex = f'{serial:X}'
+    return serial_hex if len(serial_hex) % 2 == 0 else '0' + serial_hex
+
+
+def _public_key_info(public_key) -> Dict:
+    """공개키 종류와 길이(비트)"""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return {'key_type': 'RSA', 'key_size': public_key.key_size}
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        return {'key_type': 'EC', 'key_size': public_key.curve.key_size, 'key_curve': public_key.curve.name}
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return {'key_type': 'Ed25519', 'key_size': 256}
+    if isinstance(public_key, ed448.Ed448PublicKey):
+        return {'key_type': 'Ed448', 'key_size': 456}
+    if isinstance(public_key, dsa.DSAPublicKey):
+        return {'key_type': 'DSA', 'key_size': public_key.key_size}
+    return {'key_type': type(public_key).__name__, 'key_size': None}
+
+
+def _subject_alt_names(certificate: x509.Certificate) -> List[str]:
+    try:
+        san = certificate.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+    except (x509.ExtensionNotFound, ValueError):
+        return []
+    return san.get_values_for_type(x509.DNSName) + [str(ip) for ip in san.get_values_for_type(x509.IPAddress)]
+
+
+def _is_ca(certificate: x509.Certificate) -> bool:
+    try:
+        return certificate.extensions.get_extension_for_class(x509.BasicConstraints).value.ca
+    except (x509.ExtensionNotFound, ValueError):
+        return False
+
+
+class ParsedCertificate:
+    """DER 인증서 하나의 파싱 결과 - 호스트명/현재 시각과 무관한 정보만 담으므로 그대로 캐시 가능"""
+
+    __slots__ = ('fingerprint_sha256', 'certificate', 'subject_dict', 'issuer_dict', 'not_before', 'not_after',
+                 'serial_number', 'version', 'subject_alt_names', 'key_info', 'signature_algorithm', 'is_ca',
+                 'is_self_signed')
+
+    def __init__(self, der: bytes, fingerprint_sha256: str):
+        certificate = x509.load_der_x509_certificate(der)
+        self.fingerprint_sha256 = fingerprint_sha256
+        self.certificate = certificate
+        self.subject_dict = _name_to_dict(certificate.subject)
+        self.issuer_dict = _name_to_dict(certificate.issuer)
+        self.not_before = certificate.not_valid_before_utc
+        self.not_after = certificate.not_valid_after_utc
+        self.serial_number = _format_serial(certificate.serial_number)
+        self.version = certificate.version.value + 1
+        self.subject_alt_names = _subject_alt_names(certificate)
+        self.key_info = _public_key_info(certificate.public_key())
+        self.signature_algorithm = _SIGNATURE_ALGORITHMS.get(
+            certificate.signature_algorithm_oid, certificate.signature_algorithm_oid.dotted_string
+        )
+        self.is_ca = _is_ca(certificate)
+        self.is_self_signed = self.subject_dict == self.issuer_dict
+
+    def summary(self) -> Dict:
+        """체인 목록에 넣을 인증서 요약"""
+        return {
+            'subject_cn': self.subject_dict.get('commonName', ''),
+            'issuer_cn': self.issuer_dict.get('commonName', ''),
+            'fingerprint_sha256': self.fingerprint_sha256,
+            'not_after': _format_cert_time(self.not_after),
+            'signature_algorithm': self.signature_algorithm,
+            'is_ca': self.is_ca,
+            **self.key_info
+        }
+
+
+class CertificateCache:
+    """SHA-256 지문 -> 파싱된 인증서 LRU 캐시"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ParsedCertificate]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, der: bytes) -> ParsedCertificate:
+        fingerprint = hashlib.sha256(der).hexdigest()
+        parsed = self._entries.get(fingerprint)
+        if parsed is not None:
+            self.hits += 1
+            self._entries.move_to_end(fingerprint)
+            return parsed
+
+        self.misses += 1
+        parsed = ParsedCertificate(der, fingerprint)
+        self._entries[fingerprint] = parsed
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return parsed
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries)
+        }
+
+
+# 프로세스 전역 파싱 캐시
+default_certificate_cache = CertificateCache()
+
+
+def parse_certificate(der: bytes) -> ParsedCertificate:
+    return default_certificate_cache.parse(der)
+
+
+def _verify_chain(leaf: x509.Certificate, intermediates: List[x509.Certificate],
+                  hostname: str, now: datetime, trust_store: Store) -> Optional[str]:
+    """체인을 신뢰 저장소 기준으로 검증하고, 실패하면 오류 메시지를 반환합니다"""
+    try:
+        subject = IPAddress(ipaddress.ip_address(hostname))
+    except ValueError:
+        subject = DNSName(hostname)
+
+    verifier = PolicyBuilder().store(trust_store).time(now).build_server_verifier(subject)
+    try:
+        verifier.verify(leaf, intermediates)
+        return None
+    except VerificationError as e:
+        return str(e)
+
+
+def _no_certificate_result(error: str) -> Dict:
+    return {
+        'certificate_valid': False,
+        'certificate_error': error,
+        'ssl_status': 'connection_error',
+        'analysis_result': 'SSL 연결 오류',
+        'days_until_expiry': 0
+    }
+
+
+def verify_certificate_chain(der_chain: List[bytes], hostname: str, trust_store: Optional[Store] = None) -> Optional[str]:
+    """체인을 certifi 신뢰 저장소 기준으로 오프라인 검증하고, 실패하면 오류 메시지를 반환합니다"""
+    parsed_chain = [parse_certificate(der) for der in der_chain]
+    return _verify_chain(parsed_chain[0].certificate, [parsed.certificate for parsed in parsed_chain[1:]],
+                         hostname, datetime.now(timezone.utc), trust_store or get_trust_store())
+
+
+def describe_certificate_chain(der_chain: List[bytes], verification_error: Optional[str]) -> Dict:
+    """DER 체인(리프 인증서가 첫 번째)과 검증 결과로 인증서 분석 결과를 만듭니다
+
+    verification_error: 신뢰 체인/호스트명 검증 오류 (통과했으면 None)
+    """
+    if not der_chain:
+        return _no_certificate_result('No certificate presented by server')
+
+    parsed_chain = [parse_certificate(der) for der in der_chain]
+    leaf = parsed_chain[0]
+    now = datetime.now(timezone.utc)
+
+    not_before = leaf.not_before
+    not_after = leaf.not_after
+    is_valid = not_before <= now <= not_after
+    days_until_expiry = (not_after - now).days
+
+    # 상태 분류 우선순위: 유효기간 → 자체 서명 → 신뢰 체인/호스트명 검증
+    if not is_valid:
+        if now > not_after:
+            ssl_status = 'expired'
+            analysis_result = 'SSL 인증서가 만료된 경우'
+        else:
+            ssl_status = 'not_yet_valid'
+            analysis_result = 'SSL 인증서가 아직 유효하지 않은 경우'
+    elif leaf.is_self_signed:
+        ssl_status = 'self_signed'
+        analysis_result = '자체 서명 인증서인 경우'
+    elif verification_error:
+        ssl_status = 'verify_failed'
+        analysis_result = '인증서 검증 실패'
+    else:
+        ssl_status = 'valid'
+        analysis_result = '정상적인 SSL 인증서'
+
+    result = {
+        # 신뢰할 수 없는 인증서는 유효하지 않은 것으로 처리
+        'certificate_valid': is_valid and verification_error is None,
+        'certificate_expired': now > not_after,
+        'certificate_verified': verification_error is None,
+        'days_until_expiry': days_until_expiry,
+        'not_before': _format_cert_time(not_before),
+        'not_after': _format_cert_time(not_after),
+        'subject_cn': leaf.subject_dict.get('commonName', ''),
+        'issuer_cn': leaf.issuer_dict.get('commonName', ''),
+        'is_self_signed': leaf.is_self_signed,
+        'ssl_status': ssl_status,
+        'analysis_result': analysis_result,
+        'subject_dict': leaf.subject_dict,
+        'issuer_dict': leaf.issuer_dict,
+        'serial_number': leaf.serial_number,
+        'version': leaf.version,
+        'fingerprint_sha256': leaf.fingerprint_sha256,
+        'subject_alt_names': leaf.subject_alt_names,
+        'signature_algorithm': leaf.signature_algorithm,
+        **leaf.key_info,
+        'chain': [parsed.summary() for parsed in parsed_chain],
+        'chain_length': len(der_chain)
+    }
+    if verification_error:
+        result['verification_error'] = verification_error
+    return result
+
+
+def analyze_certificate_chain(der_chain: List[bytes], hostname: str, trust_store: Optional[Store] = None) -> Dict:
+    """DER 체인(리프 인증서가 첫 번째)을 오프라인으로 검증하고 분석합니다"""
+    if not der_chain:
+        return _no_certificate_result('No certificate presented by server')
+    return describe_certificate_chain(der_chain, verify_certificate_chain(der_chain, hostname, trust_store))
@@ -0,0 +1,221 @@
+"""
+비동기 DNS 리졸버 모듈
+
+SSLAnalyzer 가 이벤트 루프를 블로킹하지 않고 도메인을 조회하도록 합니다.
+- aiodns(c-ares)가 설치되어 있으면 A/AAAA 레코드를 직접 조회하고 레코드 TTL 을 따름
+- 없거나 조회 결과가 없으면 loop.getaddrinfo 로 대체 (/etc/hosts 포함, TTL 은 기본값 사용)
+- 실패한 조회(NXDOMAIN 등)는 짧은 시간 동안 부정 캐시
+"""
+
+import asyncio
+import ipaddress
+import socket
+import time
+from typing import Dict, List, Tuple
+
+from aiohttp.abc import AbstractResolver
+
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
+
+
+class DNSResolutionError(OSError):
+    """도메인 조회 실패 (부정 캐시 대상)"""
+
+
+class AsyncResolver:
+    """TTL 을 따르는 캐시가 포함된 비동기 DNS 리졸버"""
+
+    def __init__(self, default_ttl: float = 60, min_ttl: float = 5, max_ttl: float = 3600,
+                 negative_ttl: float = 30, max_entries: int = 10000):
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+
+        # host -> (만료 시각, 조회 결과 또는 DNSResolutionError)
+        self._cache: Dict[str, Tuple[float, object]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._aiodns_resolver = None
+
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+
+    def stats(self) -> Dict:
+        """캐시 적중/미스 카운터"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'negative_hits': self.negative_hits,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'size': len(self._cache)
+        }
+
+    def clear(self):
+        self._cache.clear()
+
+    async def resolve(self, host: str) -> Dict:
+        """도메인을 IPv4/IPv6 주소 목록으로 조회합니다 (실패 시 DNSResolutionError)"""
+        try:
+            ip = ipaddress.ip_address(host)
+            return self._build_result(host, [str(ip)], 0, cached=False)
+        except ValueError:
+            pass
+
+        now = time.monotonic()
+        cached = self._cache.get(host)
+        if cached is not None and cached[0] > now:
+            self.hits += 1
+            entry = cached[1]
+            if isinstance(entry, DNSResolutionError):
+                self.negative_hits += 1
+                raise DNSResolutionError(str(entry))
+            return dict(entry, dns_cached=True)
+
+        # 같은 도메인을 동시에 조회하는 경우 진행 중인 조회 결과를 공유
+        inflight = self._inflight.get(host)
+        if inflight is not None:
+            self.hits += 1
+            entry = await asyncio.shield(inflight)
+            if isinstance(entry, DNSResolutionError):
+                raise DNSResolutionError(str(entry))
+            return dict(entry, dns_cached=True)
+
+        # 조회는 별도 태스크에서 실행 - 처음 요청한 쪽이 취소되어도 함께 기다리는 요청은 결과를 받음
+        self.misses += 1
+        task = asyncio.create_task(self._lookup_and_store(host))
+        self._inflight[host] = task
+        task.add_done_callback(lambda done: self._finish_inflight(host, done))
+        entry = await asyncio.shield(task)
+
+        if isinstance(entry, DNSResolutionError):
+            raise entry
+        return entry
+
+    async def _lookup_and_store(self, host: str) -> object:
+        """조회 결과 또는 DNSResolutionError 를 캐시에 저장하고 반환합니다"""
+        try:
+            addresses, ttl = await self._lookup(host)
+        except DNSResolutionError as e:
+            self._store(host, self.negative_ttl, e)
+            return e
+        entry = self._build_result(host, addresses, ttl, cached=False)
+        self._store(host, ttl, entry)
+        return entry
+
+    def _finish_inflight(self, host: str, task: asyncio.Task):
+        if self._inflight.get(host) is task:
+            del self._inflight[host]
+        # 기다리는 요청이 모두 취소된 뒤 실패한 경우 '처리되지 않은 예외' 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    def _store(self, host: str, ttl: float, entry: object):
+        if len(self._cache) >= self.max_entries:
+            # 가장 오래전에 저장된 항목부터 제거
+            self._cache.pop(next(iter(self._cache)))
+        self._cache.pop(host, None)
+        self._cache[host] = (time.monotonic() + ttl, entry)
+
+    def _build_result(self, host: str, addresses: List[str], ttl: float, cached: bool) -> Dict:
+        ipv4 = [a for a in addresses if ':' not in a]
+        ipv6 = [a for a in addresses if ':' in a]
+        return {
+            'hostname': host,
+            'aliases': [],
+            'ip_addresses': ipv4,
+            'ipv6_addresses': ipv6,
+            'dns_ttl': ttl,
+            'dns_cached': cached
+        }
+
+    def _clamp_ttl(self, ttl: float) -> float:
+        return max(self.min_ttl, min(self.max_ttl, ttl))
+
+    async def _lookup(self, host: str) -> Tuple[List[str], float]:
+        if aiodns is not None:
+            addresses, ttl = await self._lookup_aiodns(host)
+            if addresses:
+                return addresses, self._clamp_ttl(ttl)
+        return await self._lookup_getaddrinfo(host), self.default_ttl
+
+    async def _lookup_aiodns(self, host: str) -> Tuple[List[str], float]:
+        if self._aiodns_resolver is None:
+            self._aiodns_resolver = aiodns.DNSResolver()
+
+        answers = await asyncio.gather(
+            self._query_aiodns(host, 'A'),
+            self._query_aiodns(host, 'AAAA'),
+            return_exceptions=True
+        )
+        addresses = []
+        ttls = []
+        for answer in answers:
+            if isinstance(answer, Exception):
+                continue
+            for address, ttl in answer:
+                if address not in addresses:
+                    addresses.append(address)
+                    ttls.append(ttl)
+        return addresses, min(ttls) if ttls else self.default_ttl
+
+    async def _query_aiodns(self, host: str, qtype: str) -> List[Tuple[str, int]]:
+        """(주소, TTL) 목록 반환 - aiodns 4.x(query_dns)와 3.x(query) API 모두 지원"""
+        if hasattr(self._aiodns_resolver, 'query_dns'):
+            result = await self._aiodns_resolver.query_dns(host, qtype)
+            return [(record.data.addr, record.ttl) for record in result.answer
+                    if hasattr(record.data, 'addr')]
+        records = await self._aiodns_resolver.query(host, qtype)
+        return [(record.host, record.ttl) for record in records]
+
+    async def _lookup_getaddrinfo(self, host: str) -> List[str]:
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError) as e:
+            raise DNSResolutionError(str(e)) from e
+
+        addresses = []
+        for _, _, _, _, sockaddr in infos:
+            if sockaddr[0] not in addresses:
+                addresses.append(sockaddr[0])
+        if not addresses:
+            raise DNSResolutionError(f'No address records for {host}')
+        return addresses
+
+
+class AiohttpResolver(AbstractResolver):
+    """aiohttp 커넥터가 AsyncResolver 의 캐시를 함께 사용하도록 하는 어댑터"""
+
+    def __init__(self, resolver: AsyncResolver):
+        self.resolver = resolver
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[Dict]:
+        dns_info = await self.resolver.resolve(host)
+        addresses = []
+        if family in (socket.AF_INET, socket.AF_UNSPEC):
+            addresses += [(address, socket.AF_INET) for address in dns_info['ip_addresses']]
+        if family in (socket.AF_INET6, socket.AF_UNSPEC):
+            addresses += [(address, socket.AF_INET6) for address in dns_info['ipv6_addresses']]
+        if not addresses:
+            raise DNSResolutionError(f'No address records for {host}')
+
+        return [
+            {
+                'hostname': host,
+                'host': address,
+                'port': port,
+                'family': address_family,
+                'proto': 0,
+                'flags': socket.AI_NUMERICHOST
+            }
+            for address, address_family in addresses
+        ]
+
+    async def close(self) -> None:
+        pass
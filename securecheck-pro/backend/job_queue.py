@@ -0,0 +1,266 @@
+"""
+비동기 분석 작업(job) 모듈
+
+분석 요청을 즉시 작업 ID 로 접수하고, 고정된 수의 워커가 대기열에서 작업을 꺼내 분석합니다.
+HTTP 연결이 분석 시간 동안 열려 있을 필요가 없으므로 느린 대상이 프록시/서버 연결을 붙잡지 않습니다.
+
+작업 상태: queued -> running -> succeeded / failed / cancelled
+끝난 작업은 finished_ttl 초 동안(최대 max_finished 개) 조회할 수 있습니다.
+
+repository(작업 기록 전용 저장소)가 주어지면 상태가 바뀔 때마다 작업 기록을 저장하므로,
+여러 워커 프로세스로 실행해도(SQLite 저장소) 다른 워커가 접수한 작업을 lookup() 으로 조회할 수 있습니다.
+저장소의 보관 기간은 finished_ttl 과 같게 만들어야 합니다 (기록은 끝난 시점에 마지막으로 저장됨).
+실행 중인 작업의 취소는 작업을 실행하는 워커에서만 가능하고, 끝난 작업의 기록은 delete() 로 삭제합니다.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from metrics import background_errors
+from result_repository import ResultRepository
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """대기 중인 작업이 max_queued 에 도달하여 새 작업을 받을 수 없음"""
+
+
+class AnalysisJob:
+    """분석 작업 한 건의 상태"""
+
+    __slots__ = ('id', 'url', 'force_refresh', 'status', 'created_at', 'started_at', 'finished_at',
+                 'result', 'error', 'task', '_finished_monotonic')
+
+    def __init__(self, url: str, force_refresh: bool = False):
+        self.id = str(uuid.uuid4())
+        self.url = url
+        self.force_refresh = force_refresh
+        self.status = QUEUED
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self._finished_monotonic: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def finish(self, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = datetime.now().isoformat()
+        self._finished_monotonic = time.monotonic()
+        self.task = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'url': self.url,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class JobManager:
+    """작업 대기열과 제한된 수의 분석 워커"""
+
+    def __init__(self, run: Callable[[str, bool], Awaitable[Dict[str, Any]]], workers: int = 20,
+                 max_queued: int = 1000, finished_ttl: float = 3600, max_finished: int = 10000,
+                 repository: Optional[ResultRepository] = None):
+        # run(url, force_refresh) -> 응답 데이터 (main.run_analysis)
+        self.run = run
+        # 작업 기록을 공유할 저장소 - 분석 결과 저장소와 분리 (None 이면 이 프로세스에서만 조회 가능)
+        self.repository = repository
+        self.workers = workers
+        self.max_queued = max_queued
+        self.finished_ttl = finished_ttl
+        self.max_finished = max_finished
+
+        self._jobs: Dict[str, AnalysisJob] = {}
+        # 끝난 작업 id (끝난 순서대로) - 보관 기간/개수 제한용
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    def stats(self) -> Dict:
+        return {
+            'workers': self.workers,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'running': sum(1 for job in self._jobs.values() if job.status == RUNNING),
+            'max_queued': self.max_queued,
+            'submitted': self.submitted,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'rejected': self.rejected,
+            'tracked': len(self._jobs),
+            'shared': self.repository is not None
+        }
+
+    async def start(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        """워커를 멈추고 진행 중/대기 중인 작업을 취소합니다"""
+        for job in list(self._jobs.values()):
+            if not job.finished:
+                if job.task is not None:
+                    job.task.cancel()
+                self._mark_finished(job, CANCELLED, error='서버 종료로 작업이 취소되었습니다.')
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def submit(self, url: str, force_refresh: bool = False) -> AnalysisJob:
+        """작업을 대기열에 넣고 바로 반환합니다 - 대기열이 가득 차면 JobQueueFull"""
+        if self._queue is None:
+            raise RuntimeError('JobManager.start() 가 호출되지 않았습니다.')
+        self._expire_finished()
+        job = AnalysisJob(url, force_refresh)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise JobQueueFull(f'대기 중인 분석 작업이 너무 많습니다 (최대 {self.max_queued}개).')
+        self._jobs[job.id] = job
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        self._expire_finished()
+        return self._jobs.get(job_id)
+
+    async def lookup(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 - 이 프로세스의 작업이 아니면 저장소에 저장된 기록 (보관 기간이 지났으면 None)"""
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.repository is None:
+            return None
+        try:
+            return await self.repository.get(job_id)
+        except Exception as e:
+            background_errors.inc(('job_store',))
+            logger.warning('작업 기록 조회 실패: %s - %s', job_id, e)
+            return None
+
+    async def persist(self, job: AnalysisJob):
+        """작업 기록을 저장소에 저장 (실패해도 이 프로세스의 작업 처리는 계속)"""
+        if self.repository is None:
+            return
+        try:
+            await self.repository.save(job.id, job.to_dict())
+        except Exception as e:
+            background_errors.inc(('job_store',))
+            logger.warning('작업 기록 저장 실패: %s - %s', job.id, e)
+
+    async def delete(self, job_id: str):
+        """끝난 작업의 기록을 삭제합니다 (이후 lookup 은 None)"""
+        job = self._jobs.get(job_id)
+        if job is not None and not job.finished:
+            raise ValueError(f'끝나지 않은 작업은 삭제할 수 없습니다: {job_id}')
+        self._jobs.pop(job_id, None)
+        self._finished.pop(job_id, None)
+        if self.repository is not None:
+            await self.repository.delete(job_id)
+
+    def cancel(self, job_id: str) -> Optional[AnalysisJob]:
+        """작업을 취소합니다 - 이미 끝난 작업은 그대로 반환, 없는 작업은 None"""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        if job.task is not None:
+            # 실행 중 - 분석 태스크 취소
+            job.task.cancel()
+        # 대기 중인 작업은 워커가 꺼낼 때 건너뜀
+        self._mark_finished(job, CANCELLED, error='사용자가 작업을 취소했습니다.')
+        return job
+
+    async def _worker(self):
+        while True:
+            job: AnalysisJob = await self._queue.get()
+            try:
+                if job.finished:
+                    continue
+                job.status = RUNNING
+                job.started_at = datetime.now().isoformat()
+                job.task = asyncio.create_task(self.run(job.url, job.force_refresh))
+                await self.persist(job)
+                try:
+                    result = await job.task
+                except asyncio.CancelledError:
+                    if self._is_stopping():
+                        raise
+                    # 작업만 취소됨 (cancel 에서 이미 cancelled 로 기록) - 워커는 계속 실행
+                    continue
+                except Exception as e:
+                    if not job.finished:
+                        self._mark_finished(job, FAILED, error=f'분석 중 오류 발생: {str(e)}')
+                else:
+                    # 취소 요청과 분석 완료가 겹치면 취소가 우선
+                    if not job.finished:
+                        self._mark_finished(job, SUCCEEDED, result=result)
+                await self.persist(job)
+            finally:
+                self._queue.task_done()
+
+    def _is_stopping(self) -> bool:
+        current = asyncio.current_task()
+        return current is not None and current.cancelling() > 0
+
+    def _mark_finished(self, job: AnalysisJob, status: str, result: Optional[Dict[str, Any]] = None,
+                       error: Optional[str] = None):
+        job.finish(status, result=result, error=error)
+        if status == SUCCEEDED:
+            self.succeeded += 1
+        elif status == FAILED:
+            self.failed += 1
+        else:
+            self.cancelled += 1
+        self._finished[job.id] = None
+        while len(self._finished) > self.max_finished:
+            expired_id, _ = self._finished.popitem(last=False)
+            self._jobs.pop(expired_id, None)
+
+    def _expire_finished(self):
+        now = time.monotonic()
+        while self._finished:
+            job_id = next(iter(self._finished))
+            job = self._jobs.get(job_id)
+            if job is not None and now - job._finished_monotonic <= self.finished_ttl:
+                break
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
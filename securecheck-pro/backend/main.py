@@ -1,16 +1,78 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, HttpUrl
-from typing import List, Dict, Any
+from pydantic import BaseModel, HttpUrl, ValidationError
+from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import functools
+import json
+import os
+import time
 import uuid
 from datetime import datetime
 
-from ssl_analyzer import SSLAnalyzer
+from ssl_analyzer import SSLAnalyzer, ProgressCallback
+from scan_governor import ScanGovernor
+from analysis_cache import AnalysisCache
+from metrics import (
+    phase_timing_snapshot, phase_histograms, PrometheusWriter, RequestMetricsMiddleware, event_loop_lag,
+    http_requests, http_request_durations, analysis_grades, pdf_generation_seconds, pdf_size_bytes, background_errors
+)
+from cert_chain import default_certificate_cache
+from result_repository import create_result_repository, MemoryResultRepository
+from job_queue import JobManager, JobQueueFull, FINISHED_STATUSES
 from report_generator_tsc import create_tsc_style_pdf_report
 
-# 분석 결과를 저장할 메모리 저장소 (실제로는 데이터베이스를 사용해야 함)
-analysis_results = {}
+# 일괄 분석 제한
+BATCH_MAX_URLS = 50000
+BATCH_MAX_CONCURRENCY = 200
+
+# PDF 보고서 다운로드를 위한 분석 결과 저장소 (최대 5만 건 / 256MB / 24시간, 초과 시 오래된 결과부터 삭제)
+# 최대 크기의 일괄 분석 결과가 모두 남아 있어야 항목별 PDF 를 받을 수 있으므로 항목 수는 BATCH_MAX_URLS 이상,
+# 바이트 예산은 결과 한 건(약 4KB) x 5만 건이 들어가도록 설정
+# RESULT_STORE_URL=sqlite:///analysis_results.db 로 지정하면 여러 워커와 재시작 사이에서 결과를 공유
+RESULT_STORE_URL = os.environ.get("RESULT_STORE_URL", "memory://")
+RESULT_STORE_MAX_ENTRIES = max(10000, BATCH_MAX_URLS)
+RESULT_STORE_MAX_BYTES = 256 * 1024 * 1024
+RESULT_STORE_TTL_SECONDS = 24 * 60 * 60
+analysis_results = create_result_repository(
+    RESULT_STORE_URL,
+    max_entries=RESULT_STORE_MAX_ENTRIES,
+    max_bytes=RESULT_STORE_MAX_BYTES,
+    ttl=RESULT_STORE_TTL_SECONDS
+)
+
+# 비동기 분석 작업 (워커 수 = 동시에 실행하는 분석 수, 대기열이 가득 차면 503, 끝난 작업은 1시간 동안 조회 가능)
+# JOB_STORE_URL(기본값 RESULT_STORE_URL)이 SQLite 이면 작업 기록을 별도 테이블에 저장하여 어느 워커에서나 조회 가능
+# 분석 결과와 보관 기간/항목 수 제한을 따로 적용하므로 작업이 몰려도 보고서용 결과를 밀어내지 않음
+# (메모리 저장소는 프로세스마다 따로 있으므로 단일 워커로 실행해야 함)
+JOB_WORKERS = 20
+JOB_MAX_QUEUED = 1000
+JOB_MAX_FINISHED = 10000
+JOB_RESULT_TTL_SECONDS = 60 * 60
+JOB_STORE_URL = os.environ.get("JOB_STORE_URL", RESULT_STORE_URL)
+job_records = create_result_repository(
+    JOB_STORE_URL,
+    max_entries=JOB_MAX_QUEUED + JOB_MAX_FINISHED,
+    max_bytes=64 * 1024 * 1024,
+    ttl=JOB_RESULT_TTL_SECONDS,
+    table="analysis_jobs",
+    removed_table="removed_jobs"
+)
+
+# 진행 상황 스트리밍(SSE) 중 이벤트가 없을 때 연결 유지용 주석을 보내는 간격(초)
+STREAM_KEEPALIVE_SECONDS = 10
+
+# 분석 한 건의 전체 마감 시간(초) - 초과 시 완료된 단계까지의 결과를 timed_out 으로 표시하여 반환
+ANALYSIS_TIMEOUT_SECONDS = 20
+
+# 외부 스캔 연결 제한 - 전역 동시 연결 수, 대상 IP별 초당 연결 수(SCAN_PER_TARGET_RATE 를 지정한 경우에만 제한)
+# 같은 IP 를 공유하는 여러 도메인(CDN, 가상 호스트)의 분석이 서로 지연되지 않도록 대상별 제한은 기본적으로 끔
+SCAN_MAX_CONCURRENCY = 200
+SCAN_PER_TARGET_RATE = float(os.environ["SCAN_PER_TARGET_RATE"]) if os.environ.get("SCAN_PER_TARGET_RATE") else None
+SCAN_PER_TARGET_BURST = 100
 
 def _generate_issues_from_ssl_result(ssl_result: Dict[str, Any]) -> List[Dict[str, str]]:
     """SSL 결과에서 이슈 목록 생성"""
@@ -105,10 +167,37 @@ def _generate_recommendations_from_ssl_result(ssl_result: Dict[str, Any]) -> Lis
     
     return recommendations
 
+# 전역 인스턴스 (www/non-www 변형은 경쟁 방식으로 분석, 분석 한 건당 ANALYSIS_TIMEOUT_SECONDS 안에 응답)
+ssl_analyzer = SSLAnalyzer(
+    race_variants=True,
+    analysis_timeout=ANALYSIS_TIMEOUT_SECONDS,
+    governor=ScanGovernor(
+        max_concurrency=SCAN_MAX_CONCURRENCY,
+        per_target_rate=SCAN_PER_TARGET_RATE,
+        per_target_burst=SCAN_PER_TARGET_BURST
+    )
+)
+# 같은 대상의 반복 분석을 흡수하는 결과 캐시 (5분 TTL, 만료 후 1분간 이전 결과 반환 + 백그라운드 갱신)
+analysis_cache = AnalysisCache(ttl=300, max_entries=1000, stale_while_revalidate=60)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 수명 동안 공유 HTTP 커넥션 풀, 분석 작업 워커, 결과 저장소 연결을 유지합니다."""
+    await ssl_analyzer.start()
+    await job_manager.start()
+    event_loop_lag.start()
+    yield
+    await event_loop_lag.stop()
+    await job_manager.close()
+    await ssl_analyzer.close()
+    await analysis_results.close()
+    await job_records.close()
+
 app = FastAPI(
     title="원클릭 SSL체크 API",
     description="웹사이트 SSL/TLS 보안을 원클릭으로 분석하고 보고서를 생성하는 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -120,10 +209,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 경로별 요청 수/응답 시간 기록 (/metrics)
+app.add_middleware(RequestMetricsMiddleware)
+
 
 # 요청/응답 모델
 class AnalyzeRequest(BaseModel):
     url: HttpUrl
+    force_refresh: bool = False  # True 이면 캐시를 무시하고 다시 분석
+
+class BatchAnalyzeRequest(BaseModel):
+    urls: List[str]
+    concurrency: int = 20  # 동시에 분석할 최대 URL 수 (BATCH_MAX_CONCURRENCY 로 제한)
+    force_refresh: bool = False
 
 class SecurityIssue(BaseModel):
     type: str
@@ -139,64 +237,341 @@ class BusinessImpact(BaseModel):
 class AnalyzeResponse(BaseModel):
     id: str
     url: str
-    ssl_grade: str
-    security_score: int
+    ssl_grade: Optional[str] = None  # 마감 시간 초과로 인증서를 확인하지 못하면 None (등급 판정 보류)
+    security_score: Optional[int] = None
     issues: List[SecurityIssue]
     business_impact: BusinessImpact
     recommendations: List[str]
     created_at: str
+    cached: bool = False
+    cache_age_seconds: int = 0
+    timed_out: bool = False  # 마감 시간 초과로 일부 단계 결과가 빠진 경우 True
+    timed_out_phases: List[str] = []
 
-# 전역 인스턴스
-ssl_analyzer = SSLAnalyzer()
+class JobResponse(BaseModel):
+    id: str
+    url: str
+    status: str  # queued / running / succeeded / failed / cancelled
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[AnalyzeResponse] = None  # succeeded 인 경우 /api/v1/analyze 와 같은 응답
+    error: Optional[str] = None
 
 @app.get("/")
 async def root():
     """API root endpoint"""
     return {"message": "원클릭 SSL체크 API", "version": "1.0.0"}
 
+@app.get("/api/v1/stats")
+async def get_stats():
+    """분석 캐시, 동시 요청 병합, 결과 저장소, DNS/인증서 파싱/TLS 세션 캐시, 스캔 동시성 상태와 단계별 소요 시간 히스토그램을 반환합니다."""
+    return {
+        "analysis_cache": analysis_cache.stats(),
+        "result_store": analysis_results.stats(),
+        "job_store": job_records.stats(),
+        "dns_cache": ssl_analyzer.resolver.stats(),
+        "scan_governor": ssl_analyzer.governor.stats(),
+        "certificate_cache": default_certificate_cache.stats(),
+        "tls_sessions": ssl_analyzer.tls_sessions.stats(),
+        "jobs": job_manager.stats(),
+        "event_loop_lag": event_loop_lag.stats(),
+        "phase_timings": phase_timing_snapshot()
+    }
+
+def render_metrics() -> str:
+    """현재 상태를 Prometheus 텍스트 형식으로 구성합니다 (시리즈 수는 경로/등급/단계 수로 제한됨)."""
+    writer = PrometheusWriter(prefix="securecheck_")
+
+    # HTTP 요청
+    writer.labeled("http_requests_total", "counter", "HTTP requests by route template, method and status.",
+                   http_requests.label_names, http_requests.values.items())
+    writer.histograms("http_request_duration_seconds", "HTTP request latency by route template and method.",
+                      http_request_durations.label_names, http_request_durations.histograms.items())
+    writer.gauge("http_requests_in_progress", "HTTP requests currently being handled.",
+                 RequestMetricsMiddleware.in_progress)
+
+    # 분석 단계별 소요 시간, 등급 분포, PDF 보고서
+    writer.histograms("analysis_phase_duration_seconds", "Analysis duration by phase.",
+                      ("phase",), [((phase,), histogram) for phase, histogram in phase_histograms.items()])
+    writer.labeled("analysis_grades_total", "counter", "Analysis responses by SSL grade.",
+                   analysis_grades.label_names, analysis_grades.values.items())
+    writer.histogram("pdf_generation_duration_seconds", "PDF report generation time.", pdf_generation_seconds)
+    writer.histogram("pdf_size_bytes", "Generated PDF report size.", pdf_size_bytes)
+
+    # 캐시 적중/병합 (적중률은 rate(..._total) 로 계산하는 것을 권장, hit_ratio 는 시작 이후 누적값)
+    cache = analysis_cache.stats()
+    writer.labeled("analysis_cache_lookups_total", "counter", "Analysis cache lookups by result.", ("result",),
+                   [(("hit",), cache["hits"]), (("stale_hit",), cache["stale_hits"]), (("miss",), cache["misses"])])
+    writer.counter("analysis_cache_coalesced_total", "Requests that joined an in-flight analysis of the same target.",
+                   cache["coalesced"])
+    writer.gauge("analysis_cache_entries", "Cached analysis results.", cache["size"])
+    dns = ssl_analyzer.resolver.stats()
+    certificates = default_certificate_cache.stats()
+    sessions = ssl_analyzer.tls_sessions.stats()
+    writer.labeled("cache_hit_ratio", "gauge", "Cumulative cache hit ratio since start.", ("cache",), [
+        (("analysis",), cache["hit_ratio"]),
+        (("dns",), dns["hit_ratio"]),
+        (("certificate",), certificates["hit_ratio"]),
+        (("tls_session",), sessions["resumption_ratio"])
+    ])
+    writer.labeled("cache_lookups_total", "counter", "DNS and certificate parse cache lookups by result.",
+                   ("cache", "result"), [
+                       (("dns", "hit"), dns["hits"]), (("dns", "miss"), dns["misses"]),
+                       (("certificate", "hit"), certificates["hits"]), (("certificate", "miss"), certificates["misses"])
+                   ])
+    writer.labeled("tls_handshakes_total", "counter", "TLS handshakes by session resumption.", ("type",),
+                   [(("resumed",), sessions["resumed"]), (("full",), sessions["full_handshakes"])])
+
+    # 진행 중인 스캔/작업
+    governor = ssl_analyzer.governor.stats()
+    jobs = job_manager.stats()
+    writer.gauge("analyses_in_flight", "Distinct analyses currently running.", cache["inflight"])
+    writer.gauge("scans_active", "Scans holding a scan governor slot.", governor["active"])
+    writer.gauge("scans_queued", "Scans waiting for a scan governor slot.", governor["queued"])
+    writer.gauge("scan_concurrency_limit", "Current adaptive scan concurrency limit.", governor["limit"])
+    writer.labeled("jobs", "gauge", "Analysis jobs by state.", ("state",),
+                   [(("queued",), jobs["queued"]), (("running",), jobs["running"])])
+    writer.labeled("jobs_finished_total", "counter", "Finished analysis jobs by status.", ("status",), [
+        (("succeeded",), jobs["succeeded"]), (("failed",), jobs["failed"]), (("cancelled",), jobs["cancelled"])
+    ])
+    writer.counter("jobs_rejected_total", "Job submissions rejected because the queue was full.", jobs["rejected"])
+    writer.labeled("background_errors_total", "counter", "Errors outside the request path by source.",
+                   background_errors.label_names, background_errors.values.items())
+
+    # 이벤트 루프 지연
+    writer.histogram("event_loop_lag_seconds", "Event loop scheduling delay.", event_loop_lag.histogram)
+    writer.gauge("event_loop_lag_max_seconds", "Largest event loop delay since start.", event_loop_lag.max)
+
+    return writer.render()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus 수집용 메트릭 (텍스트 형식 0.0.4)"""
+    return Response(content=render_metrics(), media_type=PrometheusWriter.CONTENT_TYPE)
+
+async def run_analysis(url: str, force_refresh: bool = False,
+                       progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """URL을 분석하고 응답 데이터를 구성하여 analysis_results 에 저장합니다.
+
+    progress 가 주어지면 분석 단계가 끝날 때마다 호출 (캐시된 결과이거나 진행 중인 분석에 합류하면 호출되지 않음)
+    """
+    analysis_id = str(uuid.uuid4())
+
+    analyze = ssl_analyzer.analyze
+    if progress is not None:
+        analyze = functools.partial(ssl_analyzer.analyze, progress=progress)
+
+    # 실제 SSL 분석 수행 (캐시된 결과가 있으면 재사용, 같은 대상의 동시 요청은 하나의 분석을 공유)
+    ssl_result, cache_age = await analysis_cache.get_or_analyze(
+        url, analyze, bypass=force_refresh
+    )
+
+    # 보안 점수 계산
+    security_score = calculate_security_score(ssl_result)
+
+    # 문제점 추출
+    issues = extract_issues(ssl_result)
+
+    # 비즈니스 영향 계산
+    business_impact = calculate_business_impact(security_score, ssl_result, issues)
+
+    # 개선 권장사항 생성
+    recommendations = generate_recommendations(ssl_result, issues)
+
+    # 응답 데이터 구성
+    response_data = {
+        "id": analysis_id,
+        "url": url,
+        "ssl_grade": ssl_result.get("ssl_grade", "F"),
+        "security_score": security_score,
+        "issues": issues,
+        "business_impact": business_impact,
+        "recommendations": recommendations,
+        "created_at": datetime.now().isoformat(),
+        "cached": cache_age is not None,
+        "cache_age_seconds": int(cache_age or 0),
+        "timed_out": ssl_result.get("timed_out", False),
+        "timed_out_phases": ssl_result.get("timed_out_phases", []),
+        "ssl_result": ssl_result  # PDF 생성을 위한 원본 SSL 결과 포함
+    }
+
+    analysis_grades.inc((response_data["ssl_grade"] or "none",))
+
+    # 분석 결과 저장 (다른 워커로 들어온 다운로드 요청도 조회할 수 있도록 응답 전에 저장 완료)
+    # 마감 시간 초과로 일부 결과가 빠진 분석은 캐시처럼 저장하지 않음 (보고서 다운로드 불가, 다시 분석 필요)
+    if not response_data["timed_out"]:
+        await analysis_results.save(analysis_id, response_data)
+        print(f"분석 결과 저장됨: {analysis_id} - {url}")
+
+    return response_data
+
 @app.post("/api/v1/analyze", response_model=AnalyzeResponse)
 async def analyze_website(request: AnalyzeRequest):
     """웹사이트 보안 분석을 수행합니다."""
     try:
-        url = str(request.url)
-        analysis_id = str(uuid.uuid4())
-        
-        # 실제 SSL 분석 수행
-        ssl_result = await ssl_analyzer.analyze(url)
-        
-        # 보안 점수 계산
-        security_score = calculate_security_score(ssl_result)
-        
-        # 문제점 추출
-        issues = extract_issues(ssl_result)
-        
-        # 비즈니스 영향 계산
-        business_impact = calculate_business_impact(security_score, ssl_result, issues)
-        
-        # 개선 권장사항 생성
-        recommendations = generate_recommendations(ssl_result, issues)
-        
-        # 응답 데이터 구성
-        response_data = {
-            "id": analysis_id,
+        return await run_analysis(str(request.url), request.force_refresh)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
+
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+@app.get("/api/v1/analyze/stream")
+async def analyze_website_stream(url: str, force_refresh: bool = False):
+    """웹사이트 분석 진행 상황을 Server-Sent Events 로 스트리밍합니다.
+
+    phase 이벤트: 단계(dns, port, certificate, headers, redirect, grade 등)가 끝날 때마다 {domain, phase, data}
+    result 이벤트: /api/v1/analyze 와 같은 최종 응답 / error 이벤트: {detail}
+    """
+    try:
+        url = str(AnalyzeRequest(url=url).url)
+    except ValidationError:
+        raise HTTPException(status_code=422, detail="유효하지 않은 URL입니다.")
+
+    async def stream_events():
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def progress(domain: str, phase: str, data: Dict[str, Any]):
+            queue.put_nowait(("phase", {"domain": domain, "phase": phase, "data": data}))
+
+        async def analyze():
+            try:
+                response_data = await run_analysis(url, force_refresh, progress=progress)
+                queue.put_nowait(("result", jsonable_encoder(AnalyzeResponse(**response_data))))
+            except Exception as e:
+                queue.put_nowait(("error", {"detail": f"분석 중 오류 발생: {str(e)}"}))
+
+        task = asyncio.create_task(analyze())
+        try:
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 전송
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse_event(event, data)
+                if event in ("result", "error"):
+                    break
+        finally:
+            # 클라이언트 연결이 끊기면 응답 구성 중단 (같은 분석을 기다리는 다른 요청이 없으면 분석도 중단)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def run_job_analysis(url: str, force_refresh: bool = False) -> Dict[str, Any]:
+    """분석 작업 워커용 - 작업에는 PDF용 원본 ssl_result 를 빼고 API 응답 형태만 보관 (원본은 결과 저장소에 저장됨)"""
+    response_data = await run_analysis(url, force_refresh)
+    return {key: value for key, value in response_data.items() if key != "ssl_result"}
+
+job_manager = JobManager(
+    run_job_analysis,
+    workers=JOB_WORKERS,
+    max_queued=JOB_MAX_QUEUED,
+    finished_ttl=JOB_RESULT_TTL_SECONDS,
+    max_finished=JOB_MAX_FINISHED,
+    repository=None if isinstance(job_records, MemoryResultRepository) else job_records
+)
+
+@app.post("/api/v1/jobs", status_code=202, response_model=JobResponse)
+async def create_analysis_job(request: AnalyzeRequest, response: Response):
+    """분석 작업을 접수하고 바로 작업 ID 를 반환합니다 (결과는 GET /api/v1/jobs/{id} 로 조회)."""
+    try:
+        job = job_manager.submit(str(request.url), request.force_refresh)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    await job_manager.persist(job)
+    response.headers["Location"] = f"/api/v1/jobs/{job.id}"
+    return job.to_dict()
+
+@app.get("/api/v1/jobs/{job_id}", response_model=JobResponse)
+async def get_analysis_job(job_id: str):
+    """분석 작업의 상태와 (완료된 경우) 결과를 반환합니다."""
+    record = await job_manager.lookup(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"분석 작업이 존재하지 않습니다: {job_id}")
+    return record
+
+@app.delete("/api/v1/jobs/{job_id}", response_model=JobResponse)
+async def cancel_analysis_job(job_id: str):
+    """대기 중이거나 실행 중인 분석 작업을 취소합니다 (취소된 작업은 cancelled 로 남음).
+
+    이미 끝난 작업(succeeded / failed / cancelled)이면 작업 기록을 삭제하고 마지막 상태를 반환합니다 (이후 조회는 404).
+    """
+    job = job_manager.get(job_id)
+    if job is not None and not job.finished:
+        job_manager.cancel(job_id)
+        await job_manager.persist(job)
+        return job.to_dict()
+
+    record = await job_manager.lookup(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"분석 작업이 존재하지 않습니다: {job_id}")
+    if record["status"] not in FINISHED_STATUSES:
+        # 작업은 접수한 워커 프로세스에서 실행되므로 그 워커만 취소할 수 있음
+        raise HTTPException(status_code=409, detail=f"다른 워커에서 처리 중인 분석 작업입니다. 다시 시도해 주세요: {job_id}")
+    await job_manager.delete(job_id)
+    return record
+
+@app.post("/api/v1/analyze/batch")
+async def analyze_batch(request: BatchAnalyzeRequest):
+    """여러 URL을 제한된 동시성으로 분석하고, 끝나는 순서대로 NDJSON 으로 스트리밍합니다."""
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="분석할 URL이 없습니다.")
+    if len(request.urls) > BATCH_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BATCH_MAX_URLS}개의 URL만 분석할 수 있습니다.")
+
+    concurrency = max(1, min(request.concurrency, BATCH_MAX_CONCURRENCY, len(request.urls)))
+
+    async def analyze_item(index: int, raw_url: str) -> Dict[str, Any]:
+        try:
+            url = str(AnalyzeRequest(url=raw_url).url)
+        except ValidationError:
+            return {"index": index, "url": raw_url, "error": "유효하지 않은 URL입니다."}
+        try:
+            response_data = await run_analysis(url, request.force_refresh)
+        except Exception as e:
+            return {"index": index, "url": url, "error": f"분석 중 오류 발생: {str(e)}"}
+        return {
+            "index": index,
+            "id": response_data["id"],
             "url": url,
-            "ssl_grade": ssl_result.get("ssl_grade", "F"),
-            "security_score": security_score,
-            "issues": issues,
-            "business_impact": business_impact,
-            "recommendations": recommendations,
-            "created_at": datetime.now().isoformat(),
-            "ssl_result": ssl_result  # PDF 생성을 위한 원본 SSL 결과 포함
+            "ssl_grade": response_data["ssl_grade"],
+            "security_score": response_data["security_score"],
+            "issues": response_data["issues"],
+            "cached": response_data["cached"],
+            "timed_out": response_data["timed_out"],
+            "created_at": response_data["created_at"]
         }
 
-        # 분석 결과를 메모리에 저장 (실제로는 데이터베이스에 저장)
-        analysis_results[analysis_id] = response_data
-        print(f"분석 결과 저장됨: {analysis_id} - {url}")
-
-        return response_data
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
+    async def stream_results():
+        # 클라이언트가 느리게 읽으면 워커가 결과를 쌓아 두지 않고 기다리도록 대기열 크기를 워커 수로 제한
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        pending = iter(enumerate(request.urls))
+
+        async def worker():
+            # 워커 수만큼만 동시에 분석 (URL 수와 무관하게 태스크 수 고정)
+            for index, raw_url in pending:
+                await queue.put(await analyze_item(index, raw_url))
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            for _ in range(len(request.urls)):
+                item = await queue.get()
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+        finally:
+            # 클라이언트 연결이 끊기면 남은 분석 중단
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
 
 @app.get("/api/v1/reports/{report_id}/download")
 async def download_report(report_id: str):
@@ -205,10 +580,15 @@ async def download_report(report_id: str):
 
     try:
         # 저장된 분석 결과 조회
-        if report_id not in analysis_results:
+        saved_result = await analysis_results.get(report_id)
+        if saved_result is None:
+            if await analysis_results.removal_reason(report_id) is not None:
+                raise HTTPException(
+                    status_code=410,
+                    detail=f"보관 기간이 지나 삭제된 분석 결과입니다. 다시 분석해 주세요: {report_id}"
+                )
             raise HTTPException(status_code=404, detail=f"분석 결과가 존재하지 않습니다: {report_id}")
 
-        saved_result = analysis_results[report_id]
         ssl_result = saved_result.get("ssl_result", {})
 
         # PDF용 데이터 구성 - 실제 분석 결과 형식에 맞춤
@@ -234,7 +614,10 @@ async def download_report(report_id: str):
 
         print("PDF 생성 시작...")  # 디버그 로그
         print(f"분석 데이터 키: {list(analysis_data.keys())}")  # 디버그 로그
+        started = time.perf_counter()
         pdf_bytes = create_tsc_style_pdf_report(analysis_data)
+        pdf_generation_seconds.observe(time.perf_counter() - started)
+        pdf_size_bytes.observe(len(pdf_bytes))
         print(f"PDF 생성 완료: {len(pdf_bytes)} bytes")  # 디버그 로그
 
         def iter_pdf():
@@ -251,6 +634,9 @@ async def download_report(report_id: str):
         print("StreamingResponse 생성 완료")  # 디버그 로그
         return response
 
+    except HTTPException:
+        # 404/410 은 그대로 응답
+        raise
     except Exception as e:
         # 상세한 오류 로깅
         import traceback
@@ -262,13 +648,15 @@ async def download_report(report_id: str):
         return {"error": f"PDF 생성 중 오류가 발생했습니다: {str(e)}"}
 
 
-def calculate_security_score(ssl_result: dict) -> int:
+def calculate_security_score(ssl_result: dict) -> Optional[int]:
     """실제 SSL 분석 결과를 바탕으로 보안 점수를 계산합니다 (새로운 채점 기준)."""
 
     # SSL 상태에 따른 기본 점수
     ssl_status = ssl_result.get('ssl_status', 'connection_error')
 
-    if ssl_status == 'no_ssl' or not ssl_result.get('port_443_open', False):
+    if ssl_status == 'timed_out':
+        return None  # 마감 시간 초과: 판정 보류 (느린 서버를 취약한 서버로 채점하지 않음)
+    elif ssl_status == 'no_ssl' or not ssl_result.get('port_443_open', False):
         return 0  # F grade: No SSL
     elif ssl_status == 'expired':
         return 0  # F grade: Expired certificate
@@ -304,13 +692,21 @@ def calculate_security_score(ssl_result: dict) -> int:
 
 def extract_issues(ssl_result: dict) -> List[dict]:
     """SSL 분석 결과에서 보안 문제를 추출합니다 (TSC 보고서 기준)."""
-    print(ssl_result)
     issues = []
     
     ssl_status = ssl_result.get('ssl_status', 'connection_error')
     
+    # 0. 분석 제한 시간 초과 (확인하지 못한 항목은 문제로 단정하지 않음)
+    if ssl_status == 'timed_out':
+        issues.append({
+            "type": "timeout",
+            "severity": "medium",
+            "title": "분석 시간 초과",
+            "description": "제한 시간 안에 서버가 응답하지 않아 일부 항목을 확인하지 못했습니다. 잠시 후 다시 분석해 주세요."
+        })
+
     # 1. SSL 서비스 완전 부재 (TSC 보고서 주요 문제)
-    if ssl_status == 'no_ssl' or not ssl_result.get('port_443_open', False):
+    if ssl_status == 'no_ssl' or (not ssl_result.get('port_443_open', False) and ssl_status != 'timed_out'):
         issues.append({
             "type": "ssl_service",
             "severity": "critical",
@@ -395,10 +791,21 @@ def extract_issues(ssl_result: dict) -> List[dict]:
                 "title": "SSL 인증서 만료 임박",
                 "description": f"SSL 인증서가 {days_until_expiry}일 후에 만료됩니다."
             })
-    
+
+    # 6. 서버(IP)별 인증서 불일치 (전체 주소 분석 모드)
+    address_scan = ssl_result.get('address_scan') or {}
+    if address_scan.get('problem_addresses'):
+        issues.append({
+            "type": "certificate",
+            "severity": "high",
+            "title": "일부 서버의 인증서 문제",
+            "description": f"도메인이 가리키는 서버 중 {', '.join(address_scan['problem_addresses'])} 에서 "
+                           f"연결이 실패하거나 정상이 아닌 인증서를 제공합니다. 접속하는 서버에 따라 보안 경고가 표시될 수 있습니다."
+        })
+
     return issues
 
-def calculate_business_impact(security_score: int, ssl_result: dict, issues: List[dict]) -> dict:
+def calculate_business_impact(security_score: Optional[int], ssl_result: dict, issues: List[dict]) -> dict:
     """Updated business impact calculation matching new criteria."""
 
     # Business Metrics (from new criteria)
@@ -413,6 +820,9 @@ def calculate_business_impact(security_score: int, ssl_result: dict, issues: Lis
 
     # Get SSL grade
     ssl_grade = ssl_result.get("ssl_grade", "F")
+    if ssl_grade is None:
+        # 등급 판정 보류 (마감 시간 초과) - 영향을 추정하지 않음
+        return {"revenue_loss_annual": 0, "seo_impact": 0, "user_trust_impact": 0}
 
     # Security Loss Rates by Grade (from new criteria)
     loss_rates = {
@@ -446,7 +856,10 @@ def generate_recommendations(ssl_result: dict, issues: List[dict]) -> List[str]:
     
     ssl_status = ssl_result.get('ssl_status', 'connection_error')
     
-    if ssl_status == 'no_ssl' or not ssl_result.get('port_443_open', False):
+    if ssl_status == 'timed_out':
+        recommendations.append("서버 응답이 늦어 분석을 마치지 못했습니다. 잠시 후 다시 분석하세요.")
+
+    elif ssl_status == 'no_ssl' or not ssl_result.get('port_443_open', False):
         # TSC 보고서의 주요 권장사항
         recommendations.append("긴급: SSL 인증서 설치 및 HTTPS 서비스 활성화 (오늘 실행)")
         recommendations.append("필수: Let's Encrypt 무료 SSL 적용 (투자 0원)")
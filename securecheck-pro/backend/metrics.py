@@ -0,0 +1,281 @@
+"""
+분석 성능 계측 모듈
+
+분석 단계별 소요 시간을 기록하는 PhaseTimer 와
+프로세스 단위로 누적되는 히스토그램을 제공합니다.
+
+/metrics 용 Prometheus 텍스트 형식(0.0.4) 출력도 담당합니다.
+관측 시점에는 정수 카운터만 증가시키고 문자열 변환은 수집(scrape) 때 한 번만 하므로
+부하가 높을 때 15초마다 수집해도 비용이 시리즈 수에 비례하는 수준으로 유지됩니다.
+레이블 값은 경로 템플릿/메서드/상태 코드/등급처럼 개수가 제한된 값만 사용합니다.
+값은 프로세스 단위이므로 여러 워커로 실행하면 워커별로 수집해야 합니다.
+"""
+
+import asyncio
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 초 단위 히스토그램 버킷 상한값
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (관측값 단위: 초)"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict:
+        """누적 버킷 카운트와 합계를 반환합니다"""
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative['+Inf'] = self.count
+        return {'count': self.count, 'sum': round(self.sum, 6), 'buckets': cumulative}
+
+
+class PhaseTimer:
+    """분석 한 건의 단계별 소요 시간(ms)을 기록합니다 - 같은 단계가 반복되면 합산"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    def record(self, phase: str, seconds: float):
+        self.timings[phase] = round(self.timings.get(phase, 0.0) + seconds * 1000, 1)
+
+    @contextmanager
+    def phase(self, phase: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - started)
+
+
+class LabeledHistogram:
+    """레이블 값 조합별 히스토그램 묶음 (예: 경로/메서드별 응답 시간)"""
+
+    def __init__(self, label_names: Tuple[str, ...], buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self.histograms: Dict[Tuple[str, ...], Histogram] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        histogram = self.histograms.get(labels)
+        if histogram is None:
+            histogram = self.histograms[labels] = Histogram(self.buckets)
+        histogram.observe(value)
+
+
+class LabeledCounter:
+    """레이블 값 조합별 카운터"""
+
+    def __init__(self, label_names: Tuple[str, ...]):
+        self.label_names = label_names
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+
+# 프로세스 전체 단계별 소요 시간 히스토그램
+phase_histograms: Dict[str, Histogram] = {}
+
+
+def observe_phase_timings(timings: Dict[str, float]):
+    """분석 결과의 timings(ms)를 단계별 히스토그램에 누적합니다"""
+    for phase, milliseconds in timings.items():
+        histogram = phase_histograms.get(phase)
+        if histogram is None:
+            histogram = phase_histograms[phase] = Histogram()
+        histogram.observe(milliseconds / 1000)
+
+
+def phase_timing_snapshot(phase: Optional[str] = None) -> Dict:
+    if phase is not None:
+        return phase_histograms[phase].snapshot()
+    return {name: histogram.snapshot() for name, histogram in phase_histograms.items()}
+
+
+# PDF 보고서 크기 히스토그램 버킷 (바이트)
+SIZE_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 512 * 1024, 1024 * 1024, 2 * 1024 * 1024,
+                5 * 1024 * 1024, 10 * 1024 * 1024)
+
+# 이벤트 루프 지연 히스토그램 버킷 (초) - 정상 상태는 수 ms 이하
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# HTTP 요청 (경로 템플릿/메서드/상태 코드별)
+http_requests = LabeledCounter(('path', 'method', 'status'))
+http_request_durations = LabeledHistogram(('path', 'method'))
+
+# 분석 결과 등급 분포, PDF 생성 시간/크기
+analysis_grades = LabeledCounter(('grade',))
+# 요청 처리와 분리되어 응답에 드러나지 않는 오류 (백그라운드 분석 실패, 작업 기록 저장소 오류, 진행 상황 콜백 오류)
+# 상세 내용은 각 모듈의 logging 로거로 남김
+background_errors = LabeledCounter(('source',))
+pdf_generation_seconds = Histogram()
+pdf_size_bytes = Histogram(SIZE_BUCKETS)
+
+
+class RequestMetricsMiddleware:
+    """요청 수와 응답 시간을 경로 템플릿별로 기록하는 ASGI 미들웨어
+
+    경로는 라우트 템플릿(/api/v1/jobs/{job_id})으로 기록하여 ID 마다 시리즈가 늘어나지 않게 하고,
+    라우트에 맞지 않는 요청은 'unmatched' 하나로 묶습니다.
+    스트리밍 응답(SSE/NDJSON)은 본문 전송이 끝날 때까지의 시간이 기록됩니다.
+    """
+
+    # 처리 중인 요청 수 (모든 인스턴스 합계)
+    in_progress = 0
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # 응답 시작 전에 예외가 나면 500 으로 기록
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        RequestMetricsMiddleware.in_progress += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            RequestMetricsMiddleware.in_progress -= 1
+            route = scope.get('route')
+            path = getattr(route, 'path', None) or 'unmatched'
+            method = scope['method']
+            http_requests.inc((path, method, str(status)))
+            http_request_durations.observe((path, method), time.perf_counter() - started)
+
+
+class EventLoopLagMonitor:
+    """interval 마다 잠들었다 깨어난 시각의 지연으로 이벤트 루프 블로킹을 측정합니다"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.histogram = Histogram(LAG_BUCKETS)
+        self.last = 0.0
+        self.max = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self.last = lag
+            self.max = max(self.max, lag)
+            self.histogram.observe(lag)
+
+    def stats(self) -> Dict:
+        return {'last': round(self.last, 6), 'max': round(self.max, 6), 'samples': self.histogram.count}
+
+
+event_loop_lag = EventLoopLagMonitor()
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ','.join(f'{name}="{_escape_label(str(value))}"' for name, value in zip(names, values))
+    return '{' + pairs + '}' if pairs else ''
+
+
+class PrometheusWriter:
+    """Prometheus 텍스트 형식(0.0.4) 출력기 - 메트릭 묶음(family)마다 HELP/TYPE 을 한 번씩 씁니다"""
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, prefix: str = ''):
+        self.prefix = prefix
+        self.lines: List[str] = []
+
+    def _header(self, name: str, kind: str, help_text: str) -> str:
+        name = self.prefix + name
+        self.lines.append(f'# HELP {name} {help_text}')
+        self.lines.append(f'# TYPE {name} {kind}')
+        return name
+
+    def counter(self, name: str, help_text: str, value: float):
+        name = self._header(name, 'counter', help_text)
+        self.lines.append(f'{name} {_format_value(value)}')
+
+    def gauge(self, name: str, help_text: str, value: float):
+        name = self._header(name, 'gauge', help_text)
+        self.lines.append(f'{name} {_format_value(value)}')
+
+    def labeled(self, name: str, kind: str, help_text: str, label_names: Tuple[str, ...],
+                samples: Iterable[Tuple[Tuple[str, ...], float]]):
+        """레이블이 있는 counter/gauge - samples: (레이블 값 튜플, 값)"""
+        name = self._header(name, kind, help_text)
+        for labels, value in samples:
+            self.lines.append(f'{name}{_format_labels(label_names, labels)} {_format_value(value)}')
+
+    def histograms(self, name: str, help_text: str, label_names: Tuple[str, ...],
+                   histograms: Iterable[Tuple[Tuple[str, ...], Histogram]]):
+        """레이블 값 조합별 히스토그램 - _bucket(누적, le 레이블), _sum, _count 로 출력"""
+        name = self._header(name, 'histogram', help_text)
+        lines = self.lines
+        for labels, histogram in histograms:
+            prefix = ','.join(f'{label}="{_escape_label(str(value))}"' for label, value in zip(label_names, labels))
+            prefix = prefix + ',' if prefix else ''
+            running = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                running += count
+                lines.append(f'{name}_bucket{{{prefix}le="{_format_value(float(bound))}"}} {running}')
+            lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+            suffix = '{' + prefix[:-1] + '}' if prefix else ''
+            lines.append(f'{name}_sum{suffix} {_format_value(histogram.sum)}')
+            lines.append(f'{name}_count{suffix} {histogram.count}')
+
+    def histogram(self, name: str, help_text: str, histogram: Histogram):
+        self.histograms(name, help_text, (), [((), histogram)])
+
+    def render(self) -> str:
+        return '\n'.join(self.lines) + '\n'
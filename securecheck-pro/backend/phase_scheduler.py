@@ -0,0 +1,89 @@
+"""
+분석 단계 병렬 실행 모듈
+
+서로 의존하지 않는 분석 단계(포트 테스트, 인증서 분석, 보안 헤더, HTTP 리다이렉트)를
+처음부터 동시에 시작하고, 필요한 결과만 기존 우선순위 순서대로 기다립니다.
+결과가 필요 없어진 단계(예: 443 포트가 열려 있을 때의 리다이렉트 확인)는 취소합니다.
+on_result 가 주어지면 각 단계가 끝나는 즉시 (기다리는 순서와 무관하게) 결과를 전달합니다 (진행 상황 스트리밍용).
+다만 결과가 버려질 수 있는 추측 실행 단계(speculative)는 result() 로 결과를 실제로 사용할 때 전달합니다.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from metrics import PhaseTimer
+from retry_policy import Deadline
+
+
+class PhaseScheduler:
+    """분석 한 건의 단계들을 공통 마감 시간 안에서 동시에 실행합니다"""
+
+    def __init__(self, deadline: Deadline, timer: PhaseTimer,
+                 on_result: Optional[Callable[[str, Any], None]] = None):
+        self.deadline = deadline
+        self.timer = timer
+        self.on_result = on_result
+        # 결과를 기다리다 마감 시간을 넘긴 단계 (기다린 순서대로)
+        self.timed_out: List[str] = []
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # 결과를 사용할 때까지 on_result 전달을 미루는 단계와, 이미 전달한 단계
+        self._speculative: Set[str] = set()
+        self._reported: Set[str] = set()
+
+    def start(self, phase: str, factory: Callable[[], Awaitable[Any]], speculative: bool = False):
+        """단계를 즉시 시작합니다 - 결과는 result(phase) 로 기다림
+
+        speculative 이면 result(phase) 를 호출하기 전에는 on_result 로 결과를 전달하지 않음
+        (취소되거나 결과를 기다리지 않은 단계는 진행 상황에 나타나지 않음)
+        """
+        if speculative:
+            self._speculative.add(phase)
+
+        async def run():
+            started = time.perf_counter()
+            cancelled = False
+            try:
+                value = await asyncio.wait_for(factory(), timeout=self.deadline.remaining())
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # 취소된 추측 실행은 소요 시간에 기록하지 않음
+                if not cancelled:
+                    self.timer.record(phase, time.perf_counter() - started)
+            if phase not in self._speculative:
+                self._report(phase, value)
+            return value
+
+        self._tasks[phase] = asyncio.create_task(run())
+
+    async def result(self, phase: str) -> Any:
+        """단계 결과를 기다립니다 - 마감 시간을 넘기면 None"""
+        try:
+            value = await self._tasks[phase]
+        except asyncio.TimeoutError:
+            if not self.deadline.expired():
+                raise
+            self.timed_out.append(phase)
+            return None
+        self._report(phase, value)
+        return value
+
+    def _report(self, phase: str, value: Any):
+        if self.on_result is not None and phase not in self._reported:
+            self._reported.add(phase)
+            self.on_result(phase, value)
+
+    def cancel(self, *phases: str):
+        for phase in phases:
+            task = self._tasks.get(phase)
+            if task is not None:
+                task.cancel()
+
+    async def close(self):
+        """남은 단계를 모두 취소하고 종료를 기다립니다 (결과를 기다리지 않은 단계의 예외는 무시)"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,134 @@
+"""
+TLS 프로토콜/암호 스위트 지원 범위 조사 모듈 (심층 분석 모드)
+
+프로토콜 버전(TLS 1.0 ~ 1.3)과 취약 암호 스위트 그룹마다 해당 항목만 제시하는 핸드셰이크를 시도하여
+서버가 받아들이는지 확인합니다. 대상당 동시 연결 수(connection_budget) 안에서 모든 항목을 병렬로 시도하므로
+수십 번의 순차 핸드셰이크 대신 몇 초 안에 끝납니다.
+
+로컬 OpenSSL 빌드가 제시할 수 없는 암호 그룹(예: OpenSSL 3 의 RC4/3DES)은 None(확인 불가)으로 기록합니다.
+"""
+
+import asyncio
+import ssl
+import time
+import warnings
+from typing import AsyncContextManager, Callable, Dict, List, Optional
+
+from retry_policy import RetryPolicy
+
+# 조사할 프로토콜 버전 (ssl.SSLObject.version() 표기)
+PROTOCOL_VERSIONS = {
+    'TLSv1': ssl.TLSVersion.TLSv1,
+    'TLSv1.1': ssl.TLSVersion.TLSv1_1,
+    'TLSv1.2': ssl.TLSVersion.TLSv1_2,
+    'TLSv1.3': ssl.TLSVersion.TLSv1_3,
+}
+
+# 조사할 암호 스위트 그룹 (TLS 1.2 이하, OpenSSL 암호 문자열)
+CIPHER_GROUPS = {
+    'null': 'eNULL',             # 암호화 없음
+    'anonymous': 'aNULL',        # 서버 인증 없음
+    'export_des': 'EXP:LOW:DES',  # 56비트 이하
+    'rc4': 'RC4',
+    '3des': '3DES',              # SWEET32
+    'static_rsa': 'kRSA',        # 순방향 비밀성 없음
+}
+
+# 그룹별 대표 암호 강도(비트) - 암호 강도 점수 계산용
+CIPHER_GROUP_BITS = {
+    'null': 0,
+    'anonymous': 128,
+    'export_des': 56,
+    'rc4': 128,
+    '3des': 112,
+    'static_rsa': 128,
+}
+
+# 서버가 핸드셰이크를 거절한 것으로 보는 오류 분류 (그 외는 확인 불가)
+REJECTED_REASONS = ('tls', 'reset')
+
+ConnectFactory = Callable[..., AsyncContextManager[ssl.SSLObject]]
+
+_contexts: Dict[str, Optional[ssl.SSLContext]] = {}
+
+
+def _build_context(protocol: Optional[str] = None, ciphers: Optional[str] = None) -> Optional[ssl.SSLContext]:
+    """특정 버전 또는 암호 그룹만 제시하는 미검증 컨텍스트 - 로컬 OpenSSL 이 지원하지 않으면 None"""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    try:
+        with warnings.catch_warnings():
+            # TLS 1.0/1.1 지정 시 DeprecationWarning
+            warnings.simplefilter('ignore', DeprecationWarning)
+            if protocol is not None:
+                context.minimum_version = PROTOCOL_VERSIONS[protocol]
+                context.maximum_version = PROTOCOL_VERSIONS[protocol]
+            else:
+                context.maximum_version = ssl.TLSVersion.TLSv1_2
+        # 구형 프로토콜/암호는 OpenSSL 기본 보안 수준에서 비활성화되므로 SECLEVEL=0 으로 허용
+        context.set_ciphers(f"{ciphers or 'ALL:COMPLEMENTOFALL'}:@SECLEVEL=0")
+    except (ssl.SSLError, ValueError):
+        return None
+    return context
+
+
+def _probe_context(key: str, protocol: Optional[str] = None, ciphers: Optional[str] = None) -> Optional[ssl.SSLContext]:
+    if key not in _contexts:
+        _contexts[key] = _build_context(protocol, ciphers)
+    return _contexts[key]
+
+
+class ProtocolScanner:
+    """대상 하나의 프로토콜 버전과 취약 암호 그룹 지원 여부를 병렬로 조사합니다"""
+
+    def __init__(self, connect: ConnectFactory, connection_budget: int = 6, timeout: float = 5):
+        # connect(domain, port, context, timeout=..., addresses=...) -> ssl_object 를 내주는 async context manager
+        self.connect = connect
+        self.connection_budget = connection_budget
+        self.timeout = timeout
+
+    async def scan(self, domain: str, port: int, addresses: Optional[List[str]] = None) -> Dict:
+        """addresses 는 연결 시도 순서 (포트 테스트/인증서 분석과 같은 서버로 연결되도록 같은 순서 사용)"""
+        started = time.perf_counter()
+        budget = asyncio.Semaphore(self.connection_budget)
+        handshakes = 0
+
+        async def probe(context: Optional[ssl.SSLContext]) -> Optional[bool]:
+            nonlocal handshakes
+            if context is None:
+                return None
+            async with budget:
+                handshakes += 1
+                try:
+                    async with self.connect(domain, port, context, timeout=self.timeout, addresses=addresses):
+                        return True
+                except Exception as e:
+                    return False if RetryPolicy.classify(e) in REJECTED_REASONS else None
+
+        protocol_names = list(PROTOCOL_VERSIONS)
+        group_names = list(CIPHER_GROUPS)
+        outcomes = await asyncio.gather(
+            *[probe(_probe_context(f'protocol:{name}', protocol=name)) for name in protocol_names],
+            *[probe(_probe_context(f'ciphers:{name}', ciphers=CIPHER_GROUPS[name])) for name in group_names]
+        )
+        protocols = dict(zip(protocol_names, outcomes[:len(protocol_names)]))
+        cipher_groups = dict(zip(group_names, outcomes[len(protocol_names):]))
+
+        return {
+            'protocols': protocols,
+            'supported_protocols': [name for name, supported in protocols.items() if supported],
+            'cipher_groups': cipher_groups,
+            'weak_cipher_groups': [name for name, accepted in cipher_groups.items()
+                                   if accepted and name != 'static_rsa'],
+            'handshakes': handshakes,
+            'connection_budget': self.connection_budget,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+
+
+def weakest_cipher_bits(protocol_scan: Dict) -> Optional[int]:
+    """서버가 받아들인 암호 그룹 중 가장 약한 암호 강도 - 취약 그룹이 없으면 None"""
+    accepted: List[int] = [CIPHER_GROUP_BITS[name] for name, ok in protocol_scan.get('cipher_groups', {}).items()
+                           if ok and name in CIPHER_GROUP_BITS]
+    return min(accepted) if accepted else None
@@ -16,6 +16,8 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 import os
 
+from tls_capabilities import capability_scores
+
 
 def register_korean_fonts():
     """한글 폰트 등록"""
@@ -585,14 +587,28 @@ server {{<br/>
         # Updated score mapping for all grades including A-
         ssl_score = 95 if ssl_grade == 'A+' else 90 if ssl_grade == 'A' else 85 if ssl_grade == 'A-' else 80 if ssl_grade == 'B' else 70 if ssl_grade == 'C' else 50 if ssl_grade == 'D' else 0
         
-        security_assessment = f"""SSL Labs 등급: {ssl_grade}
+        # 프로토콜/키 교환/암호 강도는 실제 핸드셰이크에서 협상된 값으로 평가
+        ssl_result = analysis_data.get('ssl_result', {})
+        tls_scores = capability_scores(ssl_result)
+        if tls_scores:
+            key_size = ssl_result.get('key_size')
+            key_description = f"{ssl_result.get('key_type')} {key_size}비트" if key_size else '확인 불가'
+            security_assessment = f"""SSL Labs 등급: {ssl_grade}
+보안 점수: {ssl_score}/100
+
+세부 평가:
+- Certificate: {ssl_score}/100 
+- Protocol Support: {tls_scores['protocol_score']}/100 ({ssl_result.get('tls_version')})
+- Key Exchange: {tls_scores['key_exchange_score']}/100 ({key_description}, 순방향 비밀성 {'지원' if ssl_result.get('forward_secrecy') else '미지원'})
+- Cipher Strength: {tls_scores['cipher_strength_score']}/100 ({ssl_result.get('cipher_suite')}, {ssl_result.get('cipher_bits')}비트)
+- ALPN: {ssl_result.get('alpn_protocol') or '협상 안 됨'}"""
+        else:
+            security_assessment = f"""SSL Labs 등급: {ssl_grade}
 보안 점수: {ssl_score}/100
 
 세부 평가:
 - Certificate: {ssl_score}/100 
-- Protocol Support: {min(ssl_score + 10, 100)}/100
-- Key Exchange: {min(ssl_score + 5, 100)}/100  
-- Cipher Strength: {min(ssl_score + 15, 100)}/100"""
+- Protocol Support / Key Exchange / Cipher Strength: HTTPS 연결이 되지 않아 측정할 수 없음"""
         
         story.append(Paragraph(security_assessment, body_style))
         story.append(Spacer(1, 15))
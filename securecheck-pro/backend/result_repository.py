@@ -0,0 +1,261 @@
+"""
+분석 결과 저장소(repository) 모듈
+
+PDF 보고서 다운로드에 필요한 분석 결과를 저장하는 공통 인터페이스(ResultRepository)와 구현체입니다.
+    memory://              프로세스 메모리 (ResultStore, 워커 하나 / 재시작 시 삭제)
+    sqlite:///<파일 경로>   SQLite WAL 모드 - 여러 uvicorn 워커와 재시작 사이에서 결과 공유
+
+SQLite 작업은 저장소 전용 스레드 하나에서 순서대로 실행하므로 이벤트 루프를 블로킹하지 않고,
+WAL 모드라 다른 워커 프로세스의 읽기와 쓰기가 서로를 기다리지 않습니다.
+PostgreSQL 등 다른 백엔드는 같은 인터페이스를 구현하여 create_result_repository 에 등록하면 됩니다.
+분석 작업 기록처럼 보관 기간과 용량이 다른 데이터는 저장소를 따로 만들어(SQLite 는 다른 테이블) 서로 밀어내지 않게 합니다.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from analysis_cache import normalize_target
+from result_store import ResultStore
+
+
+class ResultRepository(ABC):
+    """분석 결과 저장소 인터페이스 (save/get/delete/removal_reason 을 모두 구현해야 생성 가능)"""
+
+    @abstractmethod
+    async def save(self, result_id: str, data: Dict):
+        ...
+
+    @abstractmethod
+    async def get(self, result_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    async def delete(self, result_id: str):
+        """요청에 의한 삭제 - 이후 get/removal_reason 모두 None (저장된 적 없는 결과와 같음)"""
+
+    @abstractmethod
+    async def removal_reason(self, result_id: str) -> Optional[str]:
+        """삭제된 결과이면 사유('expired' / 'evicted'), 저장된 적 없으면 None"""
+
+    async def close(self):
+        pass
+
+    def stats(self) -> Dict:
+        return {}
+
+
+class MemoryResultRepository(ResultRepository):
+    """프로세스 메모리 저장소 (ResultStore 의 항목 수/바이트/TTL 제한 적용)"""
+
+    def __init__(self, store: Optional[ResultStore] = None):
+        # 빈 ResultStore 는 len() 이 0 이라 거짓이므로 None 과 비교
+        self.store = store if store is not None else ResultStore()
+
+    async def save(self, result_id: str, data: Dict):
+        self.store.put(result_id, data)
+
+    async def get(self, result_id: str) -> Optional[Dict]:
+        return self.store.get(result_id)
+
+    async def delete(self, result_id: str):
+        self.store.delete(result_id)
+
+    async def removal_reason(self, result_id: str) -> Optional[str]:
+        return self.store.removal_reason(result_id)
+
+    def stats(self) -> Dict:
+        return {'backend': 'memory', **self.store.stats()}
+
+
+class SQLiteResultRepository(ResultRepository):
+    """SQLite(WAL) 저장소 - 보관 기간(ttl)과 최대 항목 수를 넘은 결과는 오래된 것부터 삭제
+
+    table/removed_table 로 테이블을 나누면 같은 파일에 여러 저장소를 두어도 보관 기간과 항목 수 제한이 따로 적용됨
+    """
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS {table} (
+            id TEXT PRIMARY KEY,
+            domain TEXT NOT NULL,
+            url TEXT NOT NULL,
+            ssl_grade TEXT,
+            created_at REAL NOT NULL,
+            size INTEGER NOT NULL,
+            data TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_domain ON {table} (domain)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_created_at ON {table} (created_at)",
+        # 삭제된 결과 기록 (다운로드 요청에 404 대신 410 으로 응답하기 위함)
+        """CREATE TABLE IF NOT EXISTS {removed_table} (
+            id TEXT PRIMARY KEY,
+            reason TEXT NOT NULL,
+            removed_at REAL NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_{removed_table}_removed_at ON {removed_table} (removed_at)",
+    )
+
+    def __init__(self, path: str, max_entries: int = 100000, ttl: float = 7 * 86400,
+                 prune_interval: float = 60, busy_timeout: float = 5.0,
+                 table: str = 'analysis_results', removed_table: str = 'removed_results'):
+        self.path = path
+        self.table = table
+        self.removed_table = removed_table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prune_interval = prune_interval
+        self.busy_timeout = busy_timeout
+
+        # 연결은 전용 스레드에서만 사용 (sqlite3 연결은 생성한 스레드에 묶임)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='result-repository')
+        self._connection: Optional[sqlite3.Connection] = None
+        self._last_prune = 0.0
+
+        self.saved = 0
+        self.expired = 0
+        self.evicted = 0
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            # WAL 모드에서는 NORMAL 로도 손상 없이 안전 (전원 장애 시 마지막 커밋만 유실 가능)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            for statement in self.SCHEMA:
+                connection.execute(statement.format(table=self.table, removed_table=self.removed_table))
+            self._connection = connection
+        return self._connection
+
+    async def save(self, result_id: str, data: Dict):
+        await self._run(self._save, result_id, data)
+
+    def _save(self, result_id: str, data: Dict):
+        connection = self._connect()
+        payload = json.dumps(data, ensure_ascii=False, default=str)
+        domain, _, _ = normalize_target(data.get('url', ''))
+        with connection:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute(
+                f'INSERT OR REPLACE INTO {self.table} (id, domain, url, ssl_grade, created_at, size, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (result_id, domain, data.get('url', ''), data.get('ssl_grade'), time.time(), len(payload), payload)
+            )
+            connection.execute(f'DELETE FROM {self.removed_table} WHERE id = ?', (result_id,))
+        self.saved += 1
+        self._prune_if_due(connection)
+
+    async def get(self, result_id: str) -> Optional[Dict]:
+        return await self._run(self._get, result_id)
+
+    def _get(self, result_id: str) -> Optional[Dict]:
+        row = self._connect().execute(
+            f'SELECT data, created_at FROM {self.table} WHERE id = ?', (result_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        # 정리 주기 전이라도 보관 기간이 지난 결과는 반환하지 않음
+        if time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    async def delete(self, result_id: str):
+        await self._run(self._delete, result_id)
+
+    def _delete(self, result_id: str):
+        connection = self._connect()
+        with connection:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute(f'DELETE FROM {self.table} WHERE id = ?', (result_id,))
+            connection.execute(f'DELETE FROM {self.removed_table} WHERE id = ?', (result_id,))
+
+    async def removal_reason(self, result_id: str) -> Optional[str]:
+        return await self._run(self._removal_reason, result_id)
+
+    def _removal_reason(self, result_id: str) -> Optional[str]:
+        connection = self._connect()
+        row = connection.execute(f'SELECT reason FROM {self.removed_table} WHERE id = ?', (result_id,)).fetchone()
+        if row is not None:
+            return row[0]
+        row = connection.execute(f'SELECT created_at FROM {self.table} WHERE id = ?', (result_id,)).fetchone()
+        if row is not None and time.time() - row[0] > self.ttl:
+            return 'expired'
+        return None
+
+    def _prune_if_due(self, connection: sqlite3.Connection):
+        """prune_interval 마다 보관 기간/최대 항목 수를 넘은 결과를 삭제 (삭제 기록도 같은 기간만 유지)"""
+        now = time.time()
+        if now - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = now
+        cutoff = now - self.ttl
+        with connection:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute(
+                f"INSERT OR REPLACE INTO {self.removed_table} (id, reason, removed_at) "
+                f"SELECT id, 'expired', ? FROM {self.table} WHERE created_at < ?", (now, cutoff)
+            )
+            self.expired += connection.execute(
+                f'DELETE FROM {self.table} WHERE created_at < ?', (cutoff,)
+            ).rowcount
+            overflow = connection.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                oldest = f'SELECT id FROM {self.table} ORDER BY created_at LIMIT ?'
+                connection.execute(
+                    f"INSERT OR REPLACE INTO {self.removed_table} (id, reason, removed_at) "
+                    f"SELECT id, 'evicted', ? FROM ({oldest})", (now, overflow)
+                )
+                self.evicted += connection.execute(
+                    f'DELETE FROM {self.table} WHERE id IN ({oldest})', (overflow,)
+                ).rowcount
+            connection.execute(f'DELETE FROM {self.removed_table} WHERE removed_at < ?', (cutoff,))
+
+    async def close(self):
+        def close_connection():
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+        await self._run(close_connection)
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict:
+        return {
+            'backend': 'sqlite',
+            'path': self.path,
+            'table': self.table,
+            'saved': self.saved,
+            'expired': self.expired,
+            'evicted': self.evicted,
+            'max_entries': self.max_entries,
+            'ttl': self.ttl
+        }
+
+
+def create_result_repository(url: str, max_entries: int, max_bytes: int, ttl: float,
+                             table: str = 'analysis_results', removed_table: str = 'removed_results') -> ResultRepository:
+    """저장소 URL 로 구현체 생성 - memory:// 또는 sqlite:///<경로> (sqlite:////절대/경로)
+
+    max_bytes 는 메모리 저장소에만 적용 (SQLite 는 디스크에 저장하므로 항목 수와 보관 기간으로만 제한)
+    table/removed_table 은 SQLite 저장소의 테이블 이름 (메모리 저장소는 인스턴스마다 따로 있으므로 무시)
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in ('', 'memory'):
+        return MemoryResultRepository(ResultStore(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl))
+    if parsed.scheme == 'sqlite':
+        path = url[len('sqlite:///'):]
+        if not url.startswith('sqlite:///') or not path:
+            raise ValueError(f'SQLite 파일 경로가 필요합니다: {url}')
+        return SQLiteResultRepository(path, max_entries=max_entries, ttl=ttl, table=table, removed_table=removed_table)
+    raise ValueError(f'지원하지 않는 결과 저장소입니다: {url}')
@@ -0,0 +1,125 @@
+"""
+분석 결과 저장소 모듈
+
+/api/v1/analyze 응답(원본 ssl_result 포함)을 PDF 보고서 다운로드 때까지 보관합니다.
+항목 수 상한(max_entries), 바이트 예산(max_bytes), 보관 기간(ttl)을 넘으면 가장 오래 사용하지 않은 항목부터
+삭제하므로 트래픽이 계속되어도 메모리 사용량이 일정하게 유지됩니다.
+
+삭제된 ID 는 일정 개수까지 기억하여 "존재하지 않는 결과"(404)와 "삭제된 결과"(410)를 구분합니다.
+
+결과는 UTF-8 JSON 바이트로 직렬화하여 보관합니다. 파이썬 dict 그대로 두면 실제 메모리가 JSON 길이의
+수 배가 되어 바이트 예산이 메모리 사용량을 제한하지 못하기 때문입니다 (조회 시 역직렬화, PDF 다운로드 때만 발생).
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+def serialize(data: Dict) -> bytes:
+    return json.dumps(data, ensure_ascii=False, default=str, separators=(',', ':')).encode('utf-8')
+
+
+def estimate_size(data: Dict) -> int:
+    """결과를 저장할 때 차지하는 바이트 수 (직렬화 길이)"""
+    return len(serialize(data))
+
+
+class ResultStore:
+    """항목 수/바이트 예산/TTL 로 제한되는 LRU 결과 저장소"""
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 128 * 1024 * 1024, ttl: float = 86400,
+                 max_tombstones: Optional[int] = None, sweep_interval: float = 60):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_tombstones = max_tombstones if max_tombstones is not None else max_entries
+        self.sweep_interval = sweep_interval
+
+        # id -> (저장 시각(monotonic), 크기, 직렬화된 결과), 가장 최근에 사용한 항목이 끝에 위치
+        self._entries: "OrderedDict[str, Tuple[float, int, bytes]]" = OrderedDict()
+        # 삭제된 id -> 삭제 사유 ('expired' / 'evicted')
+        self._tombstones: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._last_sweep = time.monotonic()
+
+        self.expired = 0
+        self.evicted = 0
+
+    def __contains__(self, result_id: str) -> bool:
+        return self.get(result_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        return {
+            'size': len(self._entries),
+            'bytes': self._bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'expired': self.expired,
+            'evicted': self.evicted,
+            'tombstones': len(self._tombstones)
+        }
+
+    def put(self, result_id: str, data: Dict):
+        payload = serialize(data)
+        size = len(payload)
+        if result_id in self._entries:
+            self._remove(result_id)
+        self._tombstones.pop(result_id, None)
+        self._entries[result_id] = (time.monotonic(), size, payload)
+        self._bytes += size
+
+        self._sweep_expired()
+        # 가장 오래 사용하지 않은 항목부터 삭제 (방금 저장한 항목이 예산보다 커도 그 항목은 유지)
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest_id = next(iter(self._entries))
+            self._remove(oldest_id, 'evicted')
+            self.evicted += 1
+
+    def get(self, result_id: str) -> Optional[Dict]:
+        entry = self._entries.get(result_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl:
+            self._remove(result_id, 'expired')
+            self.expired += 1
+            return None
+        self._entries.move_to_end(result_id)
+        return json.loads(entry[2])
+
+    def removal_reason(self, result_id: str) -> Optional[str]:
+        """삭제된 결과이면 사유('expired' / 'evicted'), 저장된 적 없거나 기록이 밀려난 경우 None"""
+        return self._tombstones.get(result_id)
+
+    def delete(self, result_id: str):
+        """요청에 의한 삭제 - 삭제 기록(tombstone)을 남기지 않음"""
+        self._tombstones.pop(result_id, None)
+        if result_id in self._entries:
+            self._remove(result_id)
+
+    def clear(self):
+        self._entries.clear()
+        self._tombstones.clear()
+        self._bytes = 0
+
+    def _remove(self, result_id: str, reason: Optional[str] = None):
+        _, size, _ = self._entries.pop(result_id)
+        self._bytes -= size
+        if reason is not None and self.max_tombstones > 0:
+            self._tombstones[result_id] = reason
+            while len(self._tombstones) > self.max_tombstones:
+                self._tombstones.popitem(last=False)
+
+    def _sweep_expired(self):
+        """sweep_interval 마다 보관 기간이 지난 항목을 한꺼번에 삭제 (LRU 순서와 저장 순서가 달라 전체 확인)"""
+        now = time.monotonic()
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        for result_id in [key for key, (stored_at, _, _) in self._entries.items() if now - stored_at > self.ttl]:
+            self._remove(result_id, 'expired')
+            self.expired += 1
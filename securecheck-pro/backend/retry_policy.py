@@ -0,0 +1,78 @@
+"""
+포트 연결 재시도 정책 모듈
+
+연결 실패 원인을 분류하여 재시도해도 결과가 달라지지 않는 오류(DNS 실패, 연결 거부 등)는
+즉시 포기하고, 일시적인 오류(타임아웃, 연결 초기화)만 분석 전체 마감 시간 안에서 재시도합니다.
+"""
+
+import asyncio
+import errno
+import socket
+import ssl
+import time
+from typing import Iterable, Optional
+
+from dns_resolver import DNSResolutionError
+
+
+class Deadline:
+    """분석 한 건에 주어진 전체 시간 예산"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float) -> float:
+        """단계별 타임아웃을 남은 시간으로 제한합니다"""
+        return min(cap, self.remaining())
+
+
+class RetryPolicy:
+    """오류 종류별 재시도 여부와 백오프 간격을 결정하는 정책"""
+
+    # 오류 분류: dns, refused, unreachable, timeout, reset, tls, other
+    RETRYABLE_REASONS = ('timeout', 'reset')
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0,
+                 retry_on: Iterable[str] = RETRYABLE_REASONS, min_attempt_time: float = 0.5):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.retry_on = tuple(retry_on)
+        # 남은 시간이 이보다 짧으면 재시도해도 의미가 없으므로 포기
+        self.min_attempt_time = min_attempt_time
+
+    @staticmethod
+    def classify(error: BaseException) -> str:
+        """연결 오류를 재시도 판단용 분류로 변환합니다"""
+        if isinstance(error, (DNSResolutionError, socket.gaierror)):
+            return 'dns'
+        if isinstance(error, ConnectionRefusedError):
+            return 'refused'
+        if isinstance(error, (asyncio.TimeoutError, TimeoutError, socket.timeout)):
+            return 'timeout'
+        if isinstance(error, (ConnectionResetError, ConnectionAbortedError, BrokenPipeError,
+                              ssl.SSLEOFError, asyncio.IncompleteReadError)):
+            return 'reset'
+        if isinstance(error, ssl.SSLError):
+            return 'tls'
+        if isinstance(error, OSError) and error.errno in (errno.EHOSTUNREACH, errno.ENETUNREACH):
+            return 'unreachable'
+        return 'other'
+
+    def delay(self, attempt: int) -> float:
+        """attempt 번째(1부터) 실패 후 대기 시간 - 재시도마다 선형 증가"""
+        return self.base_delay * attempt
+
+    def should_retry(self, reason: str, attempt: int, deadline: Optional[Deadline] = None) -> bool:
+        if reason not in self.retry_on or attempt >= self.max_attempts:
+            return False
+        if deadline is not None and deadline.remaining() < self.delay(attempt) + self.min_attempt_time:
+            return False
+        return True
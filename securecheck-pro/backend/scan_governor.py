@@ -0,0 +1,189 @@
+"""
+외부 스캔 연결 동시성 제어 모듈
+
+SSLAnalyzer 가 여는 모든 TLS/HTTP 연결을 다음 세 가지로 제한합니다.
+- 전역 동시 연결 수 (파일 디스크립터 고갈 방지)
+- 대상 IP별 토큰 버킷 (대상 서버의 WAF 차단 방지, per_target_rate 를 지정한 경우에만)
+- 타임아웃 비율에 따라 줄었다 늘어나는 적응형 한도 (AIMD)
+
+대상별 속도 제한은 기본적으로 꺼져 있습니다. CDN 뒤의 여러 도메인이 같은 IP 를 쓰는 경우처럼
+같은 주소로 향하는 정상적인 분석까지 늦추기 때문에, 한 대상에 대량으로 스캔하는 환경에서만 켭니다.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Callable, Deque, Dict, Optional
+
+
+class TokenBucket:
+    """초당 rate 개씩 채워지고 최대 burst 개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고, 사용 가능해질 때까지 기다려야 하는 시간(초)을 반환합니다"""
+        self._refill()
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class ScanGovernor:
+    """전역 동시성 + 대상별 속도 제한 + 적응형 한도"""
+
+    def __init__(self, max_concurrency: int = 200, min_concurrency: int = 10,
+                 per_target_rate: Optional[float] = None, per_target_burst: float = 100,
+                 timeout_threshold: float = 0.2, window_size: int = 50, increase_every: int = 20,
+                 max_tracked_targets: int = 10000):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.limit = max_concurrency
+        # 대상별 초당 연결 수 (None 이면 제한 없음)
+        self.per_target_rate = per_target_rate
+        self.per_target_burst = per_target_burst
+        # 최근 window_size 개 연결 중 타임아웃 비율이 timeout_threshold 를 넘으면 한도를 줄이고,
+        # increase_every 번 연속 정상 완료되면 한도를 1씩 늘림
+        self.timeout_threshold = timeout_threshold
+        self.window_size = window_size
+        self.increase_every = increase_every
+        self.max_tracked_targets = max_tracked_targets
+
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._rate_limited = 0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._success_streak = 0
+
+        self.backoffs = 0
+
+    def stats(self) -> Dict:
+        """현재 한도와 대기열 길이 (운영 모니터링용)"""
+        return {
+            'limit': self.limit,
+            'max_concurrency': self.max_concurrency,
+            'min_concurrency': self.min_concurrency,
+            'active': self._active,
+            'queued': len(self._waiters),
+            'per_target_rate': self.per_target_rate,
+            'rate_limited': self._rate_limited,
+            'tracked_targets': len(self._buckets),
+            'timeout_ratio': self._timeout_ratio(),
+            'backoffs': self.backoffs
+        }
+
+    @asynccontextmanager
+    async def slot(self, target: str):
+        """대상(IP 또는 호스트명)에 대한 연결 하나의 실행 권한을 얻습니다"""
+        await self._wait_for_token(target)
+        await self._acquire()
+        try:
+            yield
+        except (asyncio.TimeoutError, TimeoutError):
+            self._record_outcome(timed_out=True)
+            raise
+        else:
+            self._record_outcome(timed_out=False)
+        finally:
+            self._release()
+
+    def retain(self) -> Callable[[], None]:
+        """slot() 블록이 끝난 뒤에도 열려 있는 연결(TLS 세션 티켓 대기 등)을 위해 슬롯 하나를 계속 점유합니다
+
+        slot() 안에서 호출해야 하며, 반환된 함수를 호출하면(여러 번 호출해도 한 번만) 반납합니다.
+        """
+        self._active += 1
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self._release()
+
+        return release
+
+    async def _wait_for_token(self, target: str):
+        if self.per_target_rate is None:
+            return
+        bucket = self._buckets.get(target)
+        if bucket is None:
+            self._evict_idle_buckets()
+            bucket = self._buckets[target] = TokenBucket(self.per_target_rate, self.per_target_burst)
+        else:
+            self._buckets.move_to_end(target)
+
+        wait = bucket.reserve()
+        if wait > 0:
+            self._rate_limited += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._rate_limited -= 1
+
+    def _evict_idle_buckets(self):
+        # 가장 오래 사용되지 않은 대상부터 제거
+        while len(self._buckets) >= self.max_tracked_targets:
+            self._buckets.popitem(last=False)
+
+    async def _acquire(self):
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 슬롯을 넘겨받은 직후 취소된 경우 슬롯 반환
+                self._release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _release(self):
+        self._active -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        while self._waiters and self._active < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._active += 1
+                waiter.set_result(None)
+
+    def _timeout_ratio(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def _record_outcome(self, timed_out: bool):
+        self._outcomes.append(timed_out)
+        if timed_out:
+            self._success_streak = 0
+            if len(self._outcomes) >= self.window_size // 2 and self._timeout_ratio() > self.timeout_threshold:
+                # 타임아웃 급증: 한도를 25% 줄이고 관측 구간 초기화
+                new_limit = max(self.min_concurrency, int(self.limit * 0.75))
+                if new_limit < self.limit:
+                    self.limit = new_limit
+                    self.backoffs += 1
+                self._outcomes.clear()
+            return
+
+        self._success_streak += 1
+        if self._success_streak >= self.increase_every and self.limit < self.max_concurrency:
+            self.limit += 1
+            self._success_streak = 0
+            self._wake_waiters()
@@ -1,19 +1,101 @@
 import ssl
-import socket
 import asyncio
 import aiohttp
-import certifi
+import logging
 from datetime import datetime
 from urllib.parse import urlparse
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import subprocess
 import json
 import re
+import time
+from contextlib import asynccontextmanager
+
+from cert_chain import analyze_certificate_chain, describe_certificate_chain, verify_certificate_chain
+from dns_resolver import AiohttpResolver, AsyncResolver
+from retry_policy import Deadline, RetryPolicy
+from metrics import PhaseTimer, observe_phase_timings, background_errors
+from ssl_contexts import SSLContextRegistry, default_registry
+from scan_governor import ScanGovernor
+from phase_scheduler import PhaseScheduler
+from tls_capabilities import connection_info, grade_cap
+from protocol_scan import ProtocolScanner
+from tls_sessions import TLSSessionCache
+
+logger = logging.getLogger(__name__)
+
+# 진행 상황 콜백 - progress(도메인, 단계 이름, 단계 결과)
+ProgressCallback = Callable[[str, str, Dict], None]
+
+# 등급 점수 - 유효한 인증서 기본 점수와 보안 헤더 가산점 상한
+VALID_CERTIFICATE_SCORE = 80
+SECURITY_HEADERS_BONUS_MAX = 10
+
+
+def score_to_grade(score: int) -> str:
+    """유효한 인증서의 점수를 등급으로 변환"""
+    if score >= 95:
+        return 'A+'
+    elif score >= 90:
+        return 'A'
+    elif score >= 80:
+        return 'B'
+    elif score >= 70:
+        return 'C'
+    elif score >= 50:
+        return 'D'
+    return 'F'
 
 class SSLAnalyzer:
     """SSL/TLS 보안 분석 클래스 - SSL_Certificate_Analysis_Guide.md 기반 구현"""
+
+    # 등급 순서 정의 (좋은 순서대로)
+    GRADE_ORDER = ['A+', 'A', 'B', 'C', 'D', 'F']
+    # _calculate_ssl_grade_real 이 실제로 줄 수 있는 최고 등급 (경쟁 분석은 이 등급이 나오면 종료)
+    MAX_GRADE = score_to_grade(VALID_CERTIFICATE_SCORE + SECURITY_HEADERS_BONUS_MAX)
     
-    def __init__(self):
+    def __init__(self, single_handshake: bool = False, resolver: Optional[AsyncResolver] = None,
+                 connection_limit: int = 100, connection_limit_per_host: int = 10,
+                 retry_policy: Optional[RetryPolicy] = None, analysis_timeout: float = 30,
+                 race_variants: bool = False, race_stagger: float = 0.25, variant_winner_ttl: float = 3600,
+                 ssl_contexts: Optional[SSLContextRegistry] = None, governor: Optional[ScanGovernor] = None,
+                 deep_scan: bool = False, deep_scan_connections: int = 6,
+                 scan_all_addresses: bool = False, happy_eyeballs_delay: float = 0.25,
+                 tls_sessions: Optional[TLSSessionCache] = None):
+        # single_handshake: 포트 테스트의 미검증 핸드셰이크에서 인증서 체인을 수집하고
+        # 검증/자체 서명/만료 여부는 certifi 기준으로 오프라인 계산 (인증서용 추가 연결 없음)
+        self.single_handshake = single_handshake
+        # TTL 캐시가 있는 비동기 DNS 리졸버 (조회한 IP로 바로 연결)
+        self.resolver = resolver or AsyncResolver()
+        # 공유 SSLContext (연결마다 CA 번들을 다시 로드하지 않도록)
+        self.ssl_contexts = ssl_contexts or default_registry
+        # (호스트, 주소, 포트)별 TLS 세션 캐시 - 재분석/모니터링 시 포트 테스트는 세션 재개
+        # (인증서를 분석하는 연결은 서버가 지금 제공하는 인증서를 받도록 항상 전체 핸드셰이크)
+        self.tls_sessions = tls_sessions or TLSSessionCache()
+        # 외부 연결 동시성 제어 (전역 한도, 대상 IP별 속도 제한, 타임아웃 기반 적응형 한도)
+        self.governor = governor or ScanGovernor()
+        # deep_scan: TLS 1.0~1.3 지원 여부와 취약 암호 그룹 수용 여부를 대상당 deep_scan_connections 개
+        # 동시 연결로 조사하여 등급에 반영 (핸드셰이크 10회 추가)
+        self.deep_scan = deep_scan
+        self.protocol_scanner = ProtocolScanner(self._tls_connection, connection_budget=deep_scan_connections)
+        # scan_all_addresses: 조회된 모든 IPv4/IPv6 주소에 동시에 접속하여 주소별 인증서 일치 여부 확인
+        # (기본 경로는 Happy Eyeballs - happy_eyeballs_delay 간격으로 주소를 바꿔 가며 경쟁 연결)
+        self.scan_all_addresses = scan_all_addresses
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+        # 포트 연결 재시도 정책과 분석 한 건의 전체 시간 예산(초) - 모든 단계가 이 마감 시간을 공유하며,
+        # 초과 시 완료된 단계의 결과만 담고 나머지 단계는 timed_out 으로 표시
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.analysis_timeout = analysis_timeout
+        # race_variants: www/non-www 중 지난번 최고 결과였던 쪽을 먼저 시작하고(race_stagger 초 먼저),
+        # 한쪽이 최고 등급을 받으면 다른 쪽 분석을 즉시 취소
+        self.race_variants = race_variants
+        self.race_stagger = race_stagger
+        self.variant_winner_ttl = variant_winner_ttl
+        self._variant_winners: Dict[str, Tuple[float, str]] = {}  # 원래 도메인 -> (만료 시각, 최고 결과 도메인)
+        # 헤더/리다이렉트 확인용 공유 aiohttp 세션 (start()/close() 로 수명 관리)
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self._session: Optional[aiohttp.ClientSession] = None
         self.security_headers = [
             'Strict-Transport-Security',
             'Content-Security-Policy', 
@@ -23,8 +105,38 @@ class SSLAnalyzer:
             'Referrer-Policy'
         ]
     
-    async def analyze(self, url: str) -> Dict:
-        """웹사이트의 전체 SSL 보안 분석을 수행합니다 - SSL_Certificate_Analysis_Guide.md 방법론 적용"""
+    async def start(self):
+        """공유 HTTP 커넥션 풀을 생성하고 SSLContext 를 미리 로드합니다 (FastAPI lifespan 시작 시 호출)"""
+        self.ssl_contexts.warm_up()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+                resolver=AiohttpResolver(self.resolver),
+                use_dns_cache=False  # DNS 캐시는 AsyncResolver 가 담당
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+
+    async def close(self):
+        """공유 HTTP 커넥션 풀을 닫습니다 (FastAPI lifespan 종료 시 호출)"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # lifespan 없이 사용하는 경우(스크립트, 벤치마크)를 위해 필요 시 생성
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+    async def analyze(self, url: str, timeout: Optional[float] = None,
+                      progress: Optional[ProgressCallback] = None) -> Dict:
+        """웹사이트의 전체 SSL 보안 분석을 수행합니다 - SSL_Certificate_Analysis_Guide.md 방법론 적용
+
+        timeout: 분석 전체 마감 시간(초), 지정하지 않으면 analysis_timeout
+        progress: 단계(dns, port, certificate, headers, redirect, protocol_scan, address_scan, grade)가
+                  끝날 때마다 호출 - www/non-www 를 함께 분석하면 도메인별로 호출됨
+        """
         parsed_url = urlparse(url)
 
         # 포트 추출 (URL에 포트가 명시된 경우)
@@ -46,16 +158,110 @@ class SSLAnalyzer:
             non_www_domain = domain[4:]  # www. 제거
             domains_to_check.append(non_www_domain)
 
-        # 병렬로 동시에 분석
-        tasks = [self._analyze_single_domain(check_domain, port, parsed_url.scheme) for check_domain in domains_to_check]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        deadline = Deadline(timeout or self.analysis_timeout)
+        if self.race_variants and len(domains_to_check) > 1:
+            # 지난번 최고 결과 도메인부터 시작하고 최고 등급이 나오면 나머지 취소
+            results = await self._race_domains(domains_to_check, port, parsed_url.scheme, deadline, progress)
+        else:
+            # 병렬로 동시에 분석
+            tasks = [self._analyze_single_domain(check_domain, port, parsed_url.scheme, deadline, progress)
+                     for check_domain in domains_to_check]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # 더 좋은 결과 선택 (F가 아닌 것 우선, 같으면 더 높은 등급)
         best_result = self._select_best_result(results, domain)
+        if (len(domains_to_check) > 1 and best_result.get('domain') in domains_to_check
+                and best_result.get('ssl_grade') not in (None, 'F')):
+            self._remember_variant_winner(domain, best_result['domain'])
         return best_result
 
-    async def _analyze_single_domain(self, domain: str, port: int, scheme: str) -> Dict:
+    def _preferred_domain_order(self, original_domain: str, domains: List[str]) -> List[str]:
+        """지난번에 최고 결과를 낸 도메인을 앞에 둔 분석 순서"""
+        remembered = self._variant_winners.get(original_domain)
+        if remembered is None or remembered[0] <= time.monotonic() or remembered[1] not in domains:
+            return list(domains)
+        return [remembered[1]] + [d for d in domains if d != remembered[1]]
+
+    def _remember_variant_winner(self, original_domain: str, winner: str):
+        if len(self._variant_winners) >= 10000:
+            self._variant_winners.pop(next(iter(self._variant_winners)))
+        self._variant_winners.pop(original_domain, None)
+        self._variant_winners[original_domain] = (time.monotonic() + self.variant_winner_ttl, winner)
+
+    async def _race_domains(self, domains: List[str], port: int, scheme: str, deadline: Deadline,
+                            progress: Optional[ProgressCallback] = None) -> List:
+        """도메인 변형들을 시차를 두고 분석하고, 최고 등급 결과가 나오면 나머지를 취소합니다"""
+        ordered = self._preferred_domain_order(domains[0], domains)
+        best_grade = self.MAX_GRADE
+        results = []
+        pending = set()
+
+        try:
+            for index, check_domain in enumerate(ordered):
+                pending.add(asyncio.create_task(
+                    self._analyze_single_domain(check_domain, port, scheme, deadline, progress)
+                ))
+                # 마지막 도메인이 아니면 race_stagger 동안만 기다린 뒤 다음 도메인 시작
+                wait_timeout = self.race_stagger if index < len(ordered) - 1 else None
+                while pending:
+                    done, pending = await asyncio.wait(pending, timeout=wait_timeout,
+                                                       return_when=asyncio.FIRST_COMPLETED)
+                    if not done:
+                        break
+                    for task in done:
+                        result = task.exception() or task.result()
+                        results.append(result)
+                        if isinstance(result, dict) and result.get('ssl_grade') == best_grade:
+                            return results
+                    if wait_timeout is not None:
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return results
+
+    async def _analyze_single_domain(self, domain: str, port: int, scheme: str,
+                                     deadline: Optional[Deadline] = None,
+                                     progress: Optional[ProgressCallback] = None) -> Dict:
         """단일 도메인에 대한 SSL 분석을 수행합니다"""
+        timer = PhaseTimer()
+        with timer.phase('total'):
+            result = await self._run_domain_phases(domain, port, scheme, deadline, timer, progress)
+        # 단계별 소요 시간(ms) 기록 및 프로세스 히스토그램에 누적
+        result['timings'] = timer.timings
+        observe_phase_timings(timer.timings)
+        self._report_progress(progress, domain, 'grade', {
+            'ssl_grade': result.get('ssl_grade'),
+            'ssl_status': result.get('ssl_status'),
+            'certificate_valid': result.get('certificate_valid', False),
+            'timed_out': result.get('timed_out', False),
+            'timings': result['timings']
+        })
+        return result
+
+    @staticmethod
+    def _report_progress(progress: Optional[ProgressCallback], domain: str, phase: str, data: Optional[Dict]):
+        """진행 상황 콜백 호출 - 콜백 오류는 분석에 영향을 주지 않음"""
+        if progress is None or data is None:
+            return
+        try:
+            progress(domain, phase, data)
+        except Exception as e:
+            background_errors.inc(('progress_callback',))
+            logger.warning('진행 상황 전달 실패: %s %s - %s', domain, phase, e)
+
+    async def _report_dns(self, domain: str, progress: ProgressCallback):
+        """DNS 조회 결과를 진행 상황으로 전달 (리졸버 캐시/진행 중 조회를 포트 테스트와 공유하므로 추가 조회 없음)"""
+        try:
+            dns_info = await self.resolver.resolve(domain)
+        except Exception as e:
+            dns_info = {'dns_error': str(e)}
+        self._report_progress(progress, domain, 'dns', dns_info)
+
+    async def _run_domain_phases(self, domain: str, port: int, scheme: str,
+                                 deadline: Optional[Deadline], timer: PhaseTimer,
+                                 progress: Optional[ProgressCallback] = None) -> Dict:
         result = {
             'domain': domain,
             'port': port,
@@ -73,15 +279,51 @@ class SSLAnalyzer:
             })
             return result
 
+        if deadline is None:
+            deadline = Deadline(self.analysis_timeout)
+
+        # 독립적인 단계는 포트 테스트 결과를 기다리지 않고 동시에 시작 (결과 병합은 기존 순서대로)
+        domain_url = f"{scheme}://{domain}:{port}" if port not in [80, 443] else f"{scheme}://{domain}"
+        def phase_done(phase: str, value):
+            # 포트 테스트 결과는 (포트 상태, DER 인증서 체인) - 체인은 전달하지 않음
+            self._report_progress(progress, domain, phase, value[0] if phase == 'port' else value)
+
+        scheduler = PhaseScheduler(deadline, timer, on_result=phase_done if progress is not None else None)
+        dns_report = asyncio.create_task(self._report_dns(domain, progress)) if progress is not None else None
+        # 포트 테스트 외의 단계는 포트 상태에 따라 결과가 버려질 수 있으므로 사용할 때 진행 상황을 전달
+        scheduler.start('port', lambda: self._handshake_probe(domain, port, deadline, timer))
+        scheduler.start('redirect', lambda: self._check_http_redirect(domain), speculative=True)
+        scheduler.start('headers', lambda: self._analyze_security_headers(domain_url), speculative=True)
+        if not self.single_handshake:
+            scheduler.start('certificate', lambda: self._analyze_certificate_resolved(domain, port), speculative=True)
+        if self.deep_scan:
+            scheduler.start('protocol_scan', lambda: self._scan_protocols_resolved(domain, port), speculative=True)
+        if self.scan_all_addresses:
+            scheduler.start('address_scan', lambda: self._scan_addresses(domain, port), speculative=True)
+
         try:
             # 1. 포트 연결 테스트 (가이드의 nc -z 명령 구현)
-            port_status = await self._test_port_connection(domain, port)
+            probe = await scheduler.result('port')
+            port_status, peer_chain = probe if probe is not None else ({}, [])
             result.update(port_status)
             
             if not port_status.get('port_443_open', False):
+                scheduler.cancel('certificate', 'headers', 'protocol_scan', 'address_scan')
+                if probe is None or deadline.expired():
+                    # 마감 시간 안에 포트 상태를 확인하지 못함 - SSL 없음으로 단정하지 않음 (등급 판정 보류)
+                    self._mark_timed_out(result, 'port', 'certificate', 'headers')
+                    result.update({
+                        'ssl_grade': None,
+                        'certificate_valid': False,
+                        'ssl_status': 'timed_out',
+                        'analysis_result': '분석 제한 시간 초과 - 포트 연결 확인 미완료'
+                    })
+                    return result
+
                 # 443 포트 연결 실패시 HTTP 리다이렉션 체크
-                http_redirect_info = await self._check_http_redirect(domain)
-                result.update(http_redirect_info)
+                http_redirect_info = await scheduler.result('redirect')
+                if http_redirect_info is not None:
+                    result.update(http_redirect_info)
 
                 # 여전히 SSL 없음으로 판단
                 result.update({
@@ -91,15 +333,33 @@ class SSLAnalyzer:
                     'analysis_result': 'SSL 인증서가 아예 없는 경우'
                 })
                 return result
+
+            # 443 포트가 열려 있으면 리다이렉트 확인 결과는 사용하지 않음
+            scheduler.cancel('redirect')
             
             # 2. SSL 인증서 분석 (가이드의 openssl s_client 구현)
-            cert_info = await self._analyze_certificate_real(domain, port)
+            if self.single_handshake:
+                with timer.phase('certificate'):
+                    cert_info = analyze_certificate_chain(peer_chain, domain, self.ssl_contexts.trust_store())
+                self._report_progress(progress, domain, 'certificate', cert_info)
+            else:
+                cert_info = await scheduler.result('certificate')
+            if cert_info is None:
+                cert_info = {'certificate_valid': False, 'ssl_status': 'timed_out'}
             result.update(cert_info)
             
             # 3. 보안 헤더 분석
-            domain_url = f"{scheme}://{domain}:{port}" if port not in [80, 443] else f"{scheme}://{domain}"
-            headers_info = await self._analyze_security_headers(domain_url)
-            result.update(headers_info)
+            headers_info = await scheduler.result('headers')
+            if headers_info is not None:
+                result.update(headers_info)
+
+            # 3-1. 프로토콜/암호 스위트 지원 범위 (심층 분석 모드)
+            if self.deep_scan:
+                result['protocol_scan'] = await scheduler.result('protocol_scan')
+
+            # 3-2. 주소별 인증서 일치 여부 (전체 주소 분석 모드)
+            if self.scan_all_addresses:
+                result['address_scan'] = await scheduler.result('address_scan')
             
             # 4. 전체 SSL 등급 계산 (가이드 기준)
             result['ssl_grade'] = self._calculate_ssl_grade_real(result)
@@ -108,9 +368,20 @@ class SSLAnalyzer:
             result['error'] = str(e)
             result['ssl_grade'] = 'F'
             result['certificate_valid'] = False
+        finally:
+            await scheduler.close()
+            if dns_report is not None:
+                dns_report.cancel()
 
+        if scheduler.timed_out:
+            self._mark_timed_out(result, *scheduler.timed_out)
         return result
 
+    @staticmethod
+    def _mark_timed_out(result: Dict, *phases: str):
+        result['timed_out'] = True
+        result.setdefault('timed_out_phases', []).extend(phases)
+
     def _select_best_result(self, results: List, original_domain: str) -> Dict:
         """여러 결과 중 가장 좋은 결과를 선택합니다"""
         # 예외 처리된 결과 제외
@@ -125,8 +396,7 @@ class SSLAnalyzer:
                 'analysis_result': '분석 중 오류 발생'
             }
 
-        # 등급 순서 정의 (좋은 순서대로)
-        grade_order = ['A+', 'A', 'B', 'C', 'D', 'F']
+        grade_order = self.GRADE_ORDER
 
         def grade_score(grade):
             try:
@@ -145,84 +415,246 @@ class SSLAnalyzer:
     
     async def _test_port_connection(self, domain: str, port: int) -> Dict:
         """포트 연결 테스트 (가이드의 nc -z domain 443 구현) - 재시도 로직 포함"""
-        max_retries = 3
-        base_retry_delay = 1  # 기본 1초 간격
+        port_status, _ = await self._handshake_probe(domain, port)
+        return port_status
+
+    async def _handshake_probe(self, domain: str, port: int, deadline: Optional[Deadline] = None,
+                               timer: Optional[PhaseTimer] = None) -> Tuple[Dict, List[bytes]]:
+        """미검증 TLS 핸드셰이크로 포트를 테스트하고, 성공하면 서버의 DER 인증서 체인도 함께 반환
+
+        재시도는 retry_policy 가 결정 (타임아웃/연결 초기화만 재시도, 분석 마감 시간 내에서만)
+        """
+        if deadline is None:
+            deadline = Deadline(self.analysis_timeout)
+        if timer is None:
+            timer = PhaseTimer()
+        attempt_log = []
+
+        def failure(reason: str, error: str) -> Tuple[Dict, List[bytes]]:
+            result = {
+                'port_443_open': False,
+                'port_test_result': 'error',
+                'port_error': error,
+                'port_failure_reason': reason,
+                'attempts': len(attempt_log),
+                'attempt_log': attempt_log,
+                'connection_method': 'ssl_direct_failed'
+            }
+            result.update(dns_info)
+            return result, []
 
-        # DNS resolution 확인
+        # DNS resolution 확인 (비동기 리졸버, TTL 캐시 사용)
         try:
-            resolved_ips = socket.gethostbyname_ex(domain)
-            dns_info = {
-                'hostname': resolved_ips[0],
-                'aliases': resolved_ips[1],
-                'ip_addresses': resolved_ips[2]
-            }
+            with timer.phase('dns'):
+                dns_info = await asyncio.wait_for(self.resolver.resolve(domain), timeout=deadline.remaining())
         except Exception as e:
             dns_info = {'dns_error': str(e)}
+            # 존재하지 않는 도메인은 연결을 시도해도 결과가 같으므로 바로 종료
+            return failure(self.retry_policy.classify(e), str(e))
+        addresses = self._connect_addresses(dns_info)
 
-        for attempt in range(max_retries):
-            # 백오프 전략: 재시도마다 대기 시간 증가
-            retry_delay = base_retry_delay * (attempt + 1)
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline.expired():
+                return failure('deadline', '분석 제한 시간 초과')
 
+            started = time.monotonic()
             try:
                 # SSL 직접 연결 시도 (더 신뢰성 있는 방법)
-                import ssl as ssl_module
-                context = ssl_module.create_default_context()
-                context.check_hostname = False
-                context.verify_mode = ssl_module.CERT_NONE
-
-                with socket.create_connection((domain, port), timeout=5) as sock:
-                    with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                        # SSL 연결 성공
-                        result = {
-                            'port_443_open': True,
-                            'port_test_result': 'success',
-                            'port_error_code': 0,
-                            'attempts': attempt + 1,
-                            'connection_method': 'ssl_direct'
-                        }
-                        result.update(dns_info)
-                        return result
+                context = self.ssl_contexts.probe()
+
+                # 인증서를 함께 분석하는 단일 핸드셰이크 모드가 아니면 세션 재개 사용 (연결 정보만 필요)
+                async with self._tls_connection(domain, port, context, timeout=deadline.timeout(5),
+                                                addresses=addresses, timer=timer,
+                                                resume=not self.single_handshake) as ssl_object:
+                    # SSL 연결 성공
+                    peer_chain = self._get_peer_chain(ssl_object)
+                    result = {
+                        'port_443_open': True,
+                        'port_test_result': 'success',
+                        'port_error_code': 0,
+                        'attempts': attempt,
+                        'attempt_log': attempt_log,
+                        'connection_method': 'ssl_direct'
+                    }
+                    # 협상된 프로토콜/암호 스위트/ALPN/공개키 정보 (추가 연결 없음)
+                    result.update(connection_info(ssl_object, peer_chain))
+                    result.update(dns_info)
+                    return result, peer_chain
 
             except Exception as e:
-                # 연결 실패시 재시도 (마지막 시도가 아닌 경우)
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
-                    continue
+                reason = self.retry_policy.classify(e)
+                error = str(e) or type(e).__name__
+                attempt_log.append({
+                    'attempt': attempt,
+                    'reason': reason,
+                    'error': error,
+                    'elapsed_ms': int((time.monotonic() - started) * 1000)
+                })
+                if not self.retry_policy.should_retry(reason, attempt, deadline):
+                    return failure(reason, error)
+                # 백오프 전략: 재시도마다 대기 시간 증가
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+
+    @staticmethod
+    def _get_peer_chain(ssl_object: ssl.SSLObject) -> List[bytes]:
+        """서버가 보낸 인증서 체인을 DER 목록으로 반환 (리프 인증서가 첫 번째)"""
+        if ssl_object.session_reused:
+            # 재개된 핸드셰이크에서는 서버가 인증서를 보내지 않음
+            return []
+        if hasattr(ssl_object, 'get_unverified_chain'):
+            # Python 3.13+
+            return list(ssl_object.get_unverified_chain())
+        sslobj = getattr(ssl_object, '_sslobj', None)
+        if sslobj is not None and hasattr(sslobj, 'get_unverified_chain'):
+            # Python 3.10-3.12: 비공개 API로 체인 조회
+            return [cert.public_bytes(ssl._ssl.ENCODING_DER) for cert in sslobj.get_unverified_chain() or []]
+        leaf = ssl_object.getpeercert(binary_form=True)
+        return [leaf] if leaf else []
+
+    @staticmethod
+    def _connect_addresses(dns_info: Dict) -> List[str]:
+        """Happy Eyeballs 연결 시도 순서 - IPv6 와 IPv4 주소를 번갈아 배치 (RFC 8305, IPv6 우선)
+
+        포트 테스트, 인증서 분석, 프로토콜 스캔과 속도 제한 대상(첫 번째 주소)이 모두 이 순서를 사용하므로
+        한 분석의 연결은 같은 서버로 향하고, 속도 제한은 실제로 먼저 연결하는 주소에 적용됩니다.
+        """
+        ipv6 = dns_info.get('ipv6_addresses', [])
+        ipv4 = dns_info.get('ip_addresses', [])
+        ordered = []
+        for index in range(max(len(ipv6), len(ipv4))):
+            ordered += ipv6[index:index + 1] + ipv4[index:index + 1]
+        return ordered
+
+    async def _happy_eyeballs_connect(self, addresses: List[str], port: int):
+        """주소마다 happy_eyeballs_delay 간격으로(앞선 시도가 실패하면 즉시) 연결을 시작하고 먼저 성공한 연결 사용"""
+        loop = asyncio.get_running_loop()
+        if len(addresses) == 1:
+            return await loop.create_connection(asyncio.Protocol, addresses[0], port)
+
+        def close_late_connection(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is None:
+                task.result()[0].abort()
+
+        remaining = list(addresses)
+        pending = set()
+        last_error: Optional[BaseException] = None
+        try:
+            while remaining or pending:
+                if remaining:
+                    pending.add(asyncio.create_task(
+                        loop.create_connection(asyncio.Protocol, remaining.pop(0), port)
+                    ))
+                done, pending = await asyncio.wait(pending, timeout=self.happy_eyeballs_delay if remaining else None,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                winner = None
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                    elif winner is None:
+                        winner = task.result()
+                    else:
+                        task.result()[0].abort()
+                if winner is not None:
+                    return winner
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(close_late_connection)
+        raise last_error
+
+    @asynccontextmanager
+    async def _tls_connection(self, domain: str, port: int, context: ssl.SSLContext, timeout: float,
+                              address: Optional[str] = None, timer: Optional[PhaseTimer] = None,
+                              addresses: Optional[List[str]] = None, resume: bool = False):
+        """asyncio 기반 TLS 연결 - 핸드셰이크 대기 중에도 이벤트 루프를 블로킹하지 않음
+
+        address 가 주어지면 DNS 를 다시 조회하지 않고 해당 IP로 연결 (SNI 는 domain 사용)
+        addresses 가 주어지면 Happy Eyeballs 방식으로 여러 주소에 경쟁 연결
+        timer 가 주어지면 TCP 연결과 TLS 핸드셰이크 시간을 나누어 기록
+        resume 이 True 이면 같은 서버(주소)의 이전 세션으로 재개 시도 - 재개되면 인증서 체인을 받지 못하므로
+        인증서를 분석하는 연결에서는 사용하지 않음
+        """
+        loop = asyncio.get_running_loop()
+        targets = addresses or [address or domain]
+        # 속도 제한은 가장 먼저 연결을 시도하는 주소 기준
+        async with self.governor.slot(targets[0]):
+            started = time.perf_counter()
+            try:
+                transport, protocol = await asyncio.wait_for(
+                    self._happy_eyeballs_connect(targets, port),
+                    timeout=timeout
+                )
+            finally:
+                connected = time.perf_counter()
+                if timer is not None:
+                    timer.record('tcp_connect', connected - started)
+
+            session_key = None
+            if resume:
+                peername = transport.get_extra_info('peername')
+                session_key = self.tls_sessions.key(context, domain, peername[0] if peername else None, port)
+            try:
+                handshake_timeout = max(timeout - (connected - started), 0.001)
+                # 같은 서버(주소)의 이전 세션이 있으면 제시하여 세션 재개 시도
+                with self.tls_sessions.offer(session_key):
+                    transport = await asyncio.wait_for(
+                        loop.start_tls(
+                            transport, protocol, context,
+                            server_hostname=domain,
+                            ssl_handshake_timeout=handshake_timeout
+                        ),
+                        timeout=handshake_timeout
+                    )
+            except BaseException:
+                transport.abort()
+                raise
+            finally:
+                if timer is not None:
+                    timer.record('tls_handshake', time.perf_counter() - connected)
+
+            ssl_object = transport.get_extra_info('ssl_object')
+            self.tls_sessions.record(session_key, ssl_object)
+            try:
+                yield ssl_object
+            finally:
+                # 분석용 연결이므로 close_notify 교환 없이 종료 (TLS 1.3 세션 티켓은 슬롯을 점유한 채 잠시 기다린 뒤)
+                self.tls_sessions.close_transport(session_key, transport, ssl_object, self.governor.retain)
 
-        result = {
-            'port_443_open': False,
-            'port_test_result': 'error',
-            'port_error': str(e),
-            'attempts': max_retries,
-            'connection_method': 'ssl_direct_failed'
-        }
-        result.update(dns_info)
-        return result
+    async def _governor_target(self, domain: str) -> str:
+        """속도 제한 기준 대상 - 조회된 IP (캐시 사용), 조회 실패 시 도메인"""
+        try:
+            addresses = self._connect_addresses(await self.resolver.resolve(domain))
+            return addresses[0] if addresses else domain
+        except Exception:
+            return domain
 
     async def _check_http_redirect(self, domain: str) -> Dict:
         """HTTP 접속시 HTTPS로 리다이렉트되는지 확인"""
         try:
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                # HTTP로 접속하여 리다이렉트 확인
-                async with session.get(f'http://{domain}',
-                                     allow_redirects=False,
-                                     timeout=aiohttp.ClientTimeout(total=10)) as response:
-
-                    # 3xx 리다이렉트 응답 확인
-                    if response.status in [301, 302, 303, 307, 308]:
-                        location = response.headers.get('Location', '')
-                        if location.startswith('https://'):
-                            return {
-                                'http_redirect_to_https': True,
-                                'redirect_location': location,
-                                'redirect_note': 'HTTP에서 HTTPS로 리다이렉트됨'
-                            }
-
-                    return {
-                        'http_redirect_to_https': False,
-                        'redirect_note': 'HTTP 리다이렉트 없음'
-                    }
+            session = await self._get_session()
+            # HTTP로 접속하여 리다이렉트 확인
+            async with self.governor.slot(await self._governor_target(domain)), \
+                    session.get(f'http://{domain}',
+                                allow_redirects=False,
+                                timeout=aiohttp.ClientTimeout(total=10)) as response:
+
+                # 3xx 리다이렉트 응답 확인
+                if response.status in [301, 302, 303, 307, 308]:
+                    location = response.headers.get('Location', '')
+                    if location.startswith('https://'):
+                        return {
+                            'http_redirect_to_https': True,
+                            'redirect_location': location,
+                            'redirect_note': 'HTTP에서 HTTPS로 리다이렉트됨'
+                        }
+
+                return {
+                    'http_redirect_to_https': False,
+                    'redirect_note': 'HTTP 리다이렉트 없음'
+                }
+
 
         except Exception as e:
             return {
@@ -231,128 +663,115 @@ class SSLAnalyzer:
                 'redirect_note': 'HTTP 접속 실패'
             }
 
-    async def _analyze_certificate_real(self, domain: str, port: int) -> Dict:
-        """실제 SSL 인증서 분석 (가이드의 openssl s_client 구현)"""
-        cert = None
-        ssl_verification_error = None
-        
-        # 첫 번째 시도: 정상 검증으로 인증서 정보 가져오기
+    async def _analyze_certificate_resolved(self, domain: str, port: int) -> Dict:
+        """포트 테스트와 동시에 시작하는 인증서 분석 - DNS 조회는 리졸버 캐시/진행 중 조회를 공유"""
+        dns_info = await self.resolver.resolve(domain)
+        return await self._analyze_certificate_real(domain, port, self._connect_addresses(dns_info))
+
+    async def _scan_protocols_resolved(self, domain: str, port: int) -> Dict:
+        dns_info = await self.resolver.resolve(domain)
+        return await self.protocol_scanner.scan(domain, port, self._connect_addresses(dns_info))
+
+    async def _scan_addresses(self, domain: str, port: int) -> Dict:
+        """조회된 모든 주소의 인증서를 동시에 수집하여 서버 간 일치 여부를 확인합니다"""
+        dns_info = await self.resolver.resolve(domain)
+        addresses = dns_info.get('ip_addresses', []) + dns_info.get('ipv6_addresses', [])
+
+        async def scan(address: str) -> Dict:
+            entry = {'address': address, 'family': 'ipv6' if ':' in address else 'ipv4'}
+            try:
+                async with self._tls_connection(domain, port, self.ssl_contexts.probe(), timeout=5,
+                                                address=address) as ssl_object:
+                    der_chain = self._get_peer_chain(ssl_object)
+                    entry['tls_version'] = ssl_object.version()
+            except Exception as e:
+                entry.update({'reachable': False, 'error': str(e) or type(e).__name__,
+                              'failure_reason': self.retry_policy.classify(e)})
+                return entry
+
+            certificate = analyze_certificate_chain(der_chain, domain, self.ssl_contexts.trust_store())
+            entry.update({
+                'reachable': True,
+                'fingerprint_sha256': certificate.get('fingerprint_sha256'),
+                'subject_cn': certificate.get('subject_cn'),
+                'not_after': certificate.get('not_after'),
+                'days_until_expiry': certificate.get('days_until_expiry'),
+                'ssl_status': certificate.get('ssl_status')
+            })
+            return entry
+
+        entries = await asyncio.gather(*[scan(address) for address in addresses])
+        reachable = [entry for entry in entries if entry['reachable']]
+        fingerprints = {entry['fingerprint_sha256'] for entry in reachable}
+        return {
+            'addresses': entries,
+            'reachable_count': len(reachable),
+            'distinct_certificates': len(fingerprints),
+            # 모든 주소가 같은 인증서를 제공하고 모두 정상인지
+            'consistent': len(fingerprints) <= 1 and len({entry['ssl_status'] for entry in reachable}) <= 1,
+            'problem_addresses': [entry['address'] for entry in entries
+                                  if not entry['reachable'] or entry['ssl_status'] != 'valid']
+        }
+
+    async def _analyze_certificate_real(self, domain: str, port: int, addresses: Optional[List[str]] = None) -> Dict:
+        """실제 SSL 인증서 분석 (가이드의 openssl s_client 구현)
+
+        서버의 DER 인증서 체인을 받아 파싱하고(지문 캐시 사용), 신뢰 체인/호스트명 검증은 OpenSSL 결과를 사용
+        """
+        der_chain: List[bytes] = []
+        verification_error = None
+        verify_offline = False
+
+        # 첫 번째 시도: 정상 검증으로 인증서 체인 가져오기
         try:
-            context = ssl.create_default_context()
-            with socket.create_connection((domain, port), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert = ssock.getpeercert()
-        except ssl.SSLError as e:
-            ssl_verification_error = str(e)
-            # 두 번째 시도: 검증 비활성화로 인증서 정보 가져오기
+            context = self.ssl_contexts.verified()
+            async with self._tls_connection(domain, port, context, timeout=10, addresses=addresses) as ssl_object:
+                der_chain = self._get_peer_chain(ssl_object)
+        except ssl.SSLCertVerificationError as e:
+            verification_error = e.verify_message or str(e)
+        except (ssl.SSLError, ConnectionResetError):
+            # 기본 보안 정책(TLS 1.2+, 순방향 비밀성)과 맞지 않는 서버는 핸드셰이크를 끊기도 함 - 검증은 오프라인으로
+            verify_offline = True
+
+        if not der_chain:
+            # 두 번째 시도: 검증 비활성화로 인증서 체인 가져오기
             try:
-                context = ssl.create_default_context()
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE
-                with socket.create_connection((domain, port), timeout=10) as sock:
-                    with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                        cert = ssock.getpeercert()
-            except Exception:
-                pass
-        
+                context = self.ssl_contexts.unverified()
+                async with self._tls_connection(domain, port, context, timeout=10, addresses=addresses) as ssl_object:
+                    der_chain = self._get_peer_chain(ssl_object)
+            except Exception as e:
+                # SSL 연결 실패
+                return {
+                    'certificate_valid': False,
+                    'certificate_error': str(e) or type(e).__name__,
+                    'ssl_status': 'connection_error',
+                    'analysis_result': 'SSL 연결 오류',
+                    'days_until_expiry': 0
+                }
+
         try:
-            if not cert or 'notBefore' not in cert:
-                raise Exception(f"Unable to retrieve certificate info: {ssl_verification_error}")
-                
-            # 인증서 파싱
-            import datetime as dt
-            
-            # 유효기간 파싱
-            not_before_str = cert['notBefore']
-            not_after_str = cert['notAfter'] 
-            
-            # 날짜 형식: 'Aug 18 00:00:00 2025 GMT'
-            not_before = dt.datetime.strptime(not_before_str, '%b %d %H:%M:%S %Y %Z')
-            not_after = dt.datetime.strptime(not_after_str, '%b %d %H:%M:%S %Y %Z')
-            now = dt.datetime.now()
-            
-            # 인증서 유효성 검사
-            is_valid = not_before <= now <= not_after
-            days_until_expiry = (not_after - now).days
-            
-            # subject와 issuer 추출 (가이드의 핵심 체크 포인트)
-            subject_dict = dict(x[0] for x in cert['subject'])
-            issuer_dict = dict(x[0] for x in cert['issuer'])
-            
-            subject_cn = subject_dict.get('commonName', '')
-            issuer_cn = issuer_dict.get('commonName', '')
-            
-            # 자체 서명 인증서 판별 (가이드의 핵심 로직)
-            is_self_signed = (subject_dict == issuer_dict)
-            
-            # SSL 상태 분류 (가이드 기준)
-            if not is_valid:
-                if now > not_after:
-                    ssl_status = 'expired'
-                    analysis_result = 'SSL 인증서가 만료된 경우'
-                else:
-                    ssl_status = 'not_yet_valid'
-                    analysis_result = 'SSL 인증서가 아직 유효하지 않은 경우'
-            elif is_self_signed:
-                ssl_status = 'self_signed'
-                analysis_result = '자체 서명 인증서인 경우'
-            else:
-                ssl_status = 'valid'
-                analysis_result = '정상적인 SSL 인증서'
-            
-            return {
-                'certificate_valid': is_valid,
-                'certificate_expired': now > not_after,
-                'days_until_expiry': days_until_expiry,
-                'not_before': not_before_str,
-                'not_after': not_after_str,
-                'subject_cn': subject_cn,
-                'issuer_cn': issuer_cn,
-                'is_self_signed': is_self_signed,
-                'ssl_status': ssl_status,
-                'analysis_result': analysis_result,
-                'subject_dict': subject_dict,
-                'issuer_dict': issuer_dict,
-                'serial_number': cert.get('serialNumber', ''),
-                'version': cert.get('version', 0)
-            }
-            
-        except Exception as e:
-            # SSL 연결 실패 (가이드의 다양한 오류 케이스)
-            error_str = str(e).lower()
-            
-            if 'certificate verify failed' in error_str:
-                ssl_status = 'verify_failed'
-                analysis_result = '인증서 검증 실패'
-            elif 'certificate has expired' in error_str:
-                ssl_status = 'expired'
-                analysis_result = 'SSL 인증서가 만료된 경우'
-            elif 'self signed certificate' in error_str:
-                ssl_status = 'self_signed'
-                analysis_result = '자체 서명 인증서인 경우'
-            else:
-                ssl_status = 'connection_error'
-                analysis_result = 'SSL 연결 오류'
-                
+            if verify_offline and der_chain:
+                verification_error = verify_certificate_chain(der_chain, domain, self.ssl_contexts.trust_store())
+            return describe_certificate_chain(der_chain, verification_error)
+        except ValueError as e:
+            # 파싱할 수 없는 인증서
             return {
                 'certificate_valid': False,
                 'certificate_error': str(e),
-                'ssl_status': ssl_status,
-                'analysis_result': analysis_result,
+                'ssl_status': 'invalid',
+                'analysis_result': '인증서 형식 오류',
                 'days_until_expiry': 0
             }
     
-    
     async def _analyze_security_headers(self, url: str) -> Dict:
         """보안 헤더 분석"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # SSL 인증서 검증을 건너뛰고 헤더만 가져오기 (HTTPS 유지)
-                ssl_context = ssl.create_default_context()
-                ssl_context.check_hostname = False
-                ssl_context.verify_mode = ssl.CERT_NONE
-                async with session.get(url, ssl=ssl_context, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    headers = dict(response.headers)
+            session = await self._get_session()
+            # SSL 인증서 검증을 건너뛰고 헤더만 가져오기 (HTTPS 유지)
+            async with self.governor.slot(await self._governor_target(urlparse(url).hostname or url)), \
+                    session.get(url, ssl=self.ssl_contexts.unverified(),
+                                timeout=aiohttp.ClientTimeout(total=10)) as response:
+                headers = dict(response.headers)
             
             present_headers = []
             missing_headers = []
@@ -395,8 +814,13 @@ class SSLAnalyzer:
     
     
     
-    def _calculate_ssl_grade_real(self, analysis_result: Dict) -> str:
-        """Updated SSL grade calculation matching new criteria"""
+    def _calculate_ssl_grade_real(self, analysis_result: Dict) -> Optional[str]:
+        """Updated SSL grade calculation matching new criteria
+
+        마감 시간 안에 인증서를 확인하지 못한 경우(ssl_status 'timed_out')는 느린 서버일 뿐이므로 등급을 매기지 않음 (None)
+        """
+        if analysis_result.get('ssl_status') == 'timed_out':
+            return None
 
         # Step 1: Critical Issues Check (F Grade)
         if not analysis_result.get('port_443_open', False):
@@ -413,7 +837,7 @@ class SSLAnalyzer:
 
         # Step 2: Base Score Calculation
         if ssl_status == 'valid':
-            score = 80  # Valid certificate: 80 points (B grade)
+            score = VALID_CERTIFICATE_SCORE  # Valid certificate: 80 points (B grade)
         elif ssl_status == 'self_signed':
             score = 30  # Self-signed certificate: 30 points (D grade)
         elif ssl_status in ['verify_failed', 'invalid']:
@@ -428,7 +852,7 @@ class SSLAnalyzer:
             headers_percentage = (len(present_headers) / total_headers * 100) if total_headers > 0 else 0
 
             if headers_percentage == 100:
-                score += 10  # All recommended headers: +10 points
+                score += SECURITY_HEADERS_BONUS_MAX  # All recommended headers: +10 points
             elif headers_percentage >= 50:
                 score += 5   # 50%+ headers: +5 points
             elif headers_percentage > 0:
@@ -438,19 +862,14 @@ class SSLAnalyzer:
         # Step 4: Final Grade Assignment
         # Special handling for self-signed and invalid certificates
         if ssl_status in ['self_signed', 'verify_failed', 'invalid']:
-            return 'D'  # Always D grade for these statuses
-
+            grade = 'D'  # Always D grade for these statuses
         # Grade based on score for valid certificates
-        if score >= 95:
-            return 'A+'
-        elif score >= 90:
-            return 'A'
-        elif score >= 80:
-            return 'B'
-        elif score >= 70:
-            return 'C'
-        elif score >= 50:
-            return 'D'
         else:
-            return 'F'
+            grade = score_to_grade(score)
+
+        # Step 5: Cap by negotiated protocol, cipher strength, forward secrecy and key size
+        cap = grade_cap(analysis_result)
+        if cap is not None and self.GRADE_ORDER.index(cap) > self.GRADE_ORDER.index(grade):
+            grade = cap
+        return grade
     
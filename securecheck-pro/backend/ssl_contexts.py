@@ -0,0 +1,120 @@
+"""
+재사용 가능한 SSLContext 저장소
+
+ssl.create_default_context() 는 호출될 때마다 CA 번들 전체를 다시 읽고 파싱하므로
+(연결당 수십 ms의 CPU 작업), 검증/미검증 컨텍스트를 한 번만 만들어 모든 연결에서 공유합니다.
+certifi 번들 파일이 바뀐 경우에만(check_interval 초마다 확인) 다시 로드합니다.
+"""
+
+import os
+import ssl
+import time
+import warnings
+from typing import Optional, Tuple
+
+import certifi
+
+from tls_sessions import enable_resumption
+
+
+class SSLContextRegistry:
+    """검증용/미검증용 SSLContext 와 오프라인 검증용 신뢰 저장소를 공유합니다"""
+
+    def __init__(self, cafile: Optional[str] = None, check_interval: float = 60):
+        self.cafile = cafile or certifi.where()
+        self.check_interval = check_interval
+        self.reloads = 0
+
+        self._bundle_stamp: Optional[Tuple[int, int]] = None
+        self._last_check = 0.0
+        self._verified: Optional[ssl.SSLContext] = None
+        self._unverified: Optional[ssl.SSLContext] = None
+        self._probe: Optional[ssl.SSLContext] = None
+        self._trust_store = None
+
+    def verified(self) -> ssl.SSLContext:
+        """인증서 체인과 호스트명을 검증하는 컨텍스트"""
+        self._reload_if_changed()
+        if self._verified is None:
+            self._verified = enable_resumption(ssl.create_default_context(cafile=self.cafile))
+        return self._verified
+
+    def unverified(self) -> ssl.SSLContext:
+        """검증 없이 핸드셰이크만 수행하는 컨텍스트 (CA 번들을 로드하지 않음)"""
+        if self._unverified is None:
+            self._unverified = enable_resumption(self._analysis_context())
+        return self._unverified
+
+    def probe(self) -> ssl.SSLContext:
+        """포트 테스트용 미검증 컨텍스트 - 협상된 ALPN 프로토콜을 기록하기 위해 h2/http1.1 을 제시
+
+        aiohttp 는 HTTP/1.1 만 사용하므로 헤더 조회용 unverified() 와 분리합니다.
+        """
+        if self._probe is None:
+            from tls_capabilities import ALPN_PROTOCOLS
+
+            context = enable_resumption(self._analysis_context())
+            context.set_alpn_protocols(ALPN_PROTOCOLS)
+            self._probe = context
+        return self._probe
+
+    @staticmethod
+    def _analysis_context() -> ssl.SSLContext:
+        """분석 대상이 구형 설정(TLS 1.0/1.1, 정적 RSA 키 교환)만 지원해도 연결되는 미검증 컨텍스트
+
+        Python 기본값(TLS 1.2 이상, 순방향 비밀성 암호만)으로는 이런 서버를 'SSL 없음'으로 오판하므로
+        OpenSSL DEFAULT 암호 목록(강한 암호 우선)과 보안 수준 0을 사용합니다. 등급은 협상 결과로 별도 제한됩니다.
+        """
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            context.minimum_version = ssl.TLSVersion.TLSv1
+        context.set_ciphers('DEFAULT:@SECLEVEL=0')
+        return context
+
+    def trust_store(self):
+        """cryptography 오프라인 체인 검증용 신뢰 저장소 (cert_chain 모듈에서 사용)"""
+        self._reload_if_changed()
+        if self._trust_store is None:
+            from cryptography import x509
+            from cryptography.utils import CryptographyDeprecationWarning
+            from cryptography.x509.verification import Store
+
+            with open(self.cafile, 'rb') as f:
+                bundle = f.read()
+            # 일부 루트 인증서의 비표준 일련번호 경고는 무시
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', CryptographyDeprecationWarning)
+                self._trust_store = Store(x509.load_pem_x509_certificates(bundle))
+        return self._trust_store
+
+    def warm_up(self):
+        """애플리케이션 시작 시 미리 생성하여 첫 요청이 로딩 비용을 부담하지 않도록 함"""
+        self.verified()
+        self.unverified()
+        self.probe()
+        self.trust_store()
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if self._bundle_stamp is not None and now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        try:
+            stat = os.stat(self.cafile)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return
+        if stamp != self._bundle_stamp:
+            if self._bundle_stamp is not None:
+                self.reloads += 1
+            self._bundle_stamp = stamp
+            self._verified = None
+            self._trust_store = None
+
+
+# 프로세스 전역 기본 저장소
+default_registry = SSLContextRegistry()
@@ -0,0 +1,180 @@
+"""AnalysisCache - TTL 만료, stale-while-revalidate, single-flight, 취소 전파"""
+
+import asyncio
+import types
+
+import pytest
+
+import analysis_cache
+from analysis_cache import AnalysisCache
+
+URL = 'https://example.test'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 이벤트 루프가 쓰는 time 모듈은 그대로 두고 캐시 모듈의 시계만 교체
+    fake = FakeClock()
+    monkeypatch.setattr(analysis_cache, 'time', types.SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+class CountingAnalyzer:
+    """호출 횟수를 세고, gate 가 주어지면 열릴 때까지 분석을 붙잡아 두는 가짜 분석 함수"""
+
+    def __init__(self, gate: asyncio.Event = None):
+        self.calls = 0
+        self.cancelled = 0
+        self.gate = gate
+
+    async def __call__(self, url: str):
+        self.calls += 1
+        try:
+            if self.gate is not None:
+                await self.gate.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {'url': url, 'run': self.calls}
+
+
+def test_fresh_entry_is_served_until_ttl_expires(clock):
+    async def scenario():
+        cache = AnalysisCache(ttl=10)
+        analyze = CountingAnalyzer()
+
+        first, age = await cache.get_or_analyze(URL, analyze)
+        assert (first['run'], age) == (1, None)
+
+        clock.now += 5
+        cached, age = await cache.get_or_analyze(URL, analyze)
+        assert (cached['run'], age) == (1, 5)
+
+        clock.now += 6
+        refreshed, age = await cache.get_or_analyze(URL, analyze)
+        assert (refreshed['run'], age) == (2, None)
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 2
+
+    asyncio.run(scenario())
+
+
+def test_stale_entry_is_returned_while_refreshing_in_background(clock):
+    async def scenario():
+        cache = AnalysisCache(ttl=10, stale_while_revalidate=5)
+        analyze = CountingAnalyzer()
+        await cache.get_or_analyze(URL, analyze)
+
+        clock.now += 12
+        stale, age = await cache.get_or_analyze(URL, analyze)
+        assert (stale['run'], age) == (1, 12)
+        assert cache.stats()['stale_hits'] == 1
+
+        # 백그라운드 갱신이 끝나면 새 결과가 캐시됨
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        fresh, age = await cache.get_or_analyze(URL, analyze)
+        assert (fresh['run'], age) == (2, 0)
+        assert analyze.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_entry_past_stale_window_is_analyzed_again(clock):
+    async def scenario():
+        cache = AnalysisCache(ttl=10, stale_while_revalidate=5)
+        analyze = CountingAnalyzer()
+        await cache.get_or_analyze(URL, analyze)
+
+        clock.now += 16
+        result, age = await cache.get_or_analyze(URL, analyze)
+        assert (result['run'], age) == (2, None)
+        assert cache.stats()['stale_hits'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_timed_out_result_is_not_cached(clock):
+    async def scenario():
+        cache = AnalysisCache(ttl=10)
+
+        async def analyze(url: str):
+            return {'url': url, 'timed_out': True}
+
+        await cache.get_or_analyze(URL, analyze)
+        assert cache.stats()['size'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_requests_share_one_analysis(clock):
+    async def scenario():
+        cache = AnalysisCache(ttl=10)
+        gate = asyncio.Event()
+        analyze = CountingAnalyzer(gate)
+
+        # 같은 대상(정규화 후 같은 키)에 대한 동시 요청
+        requests = [asyncio.create_task(cache.get_or_analyze(url, analyze))
+                    for url in (URL, 'https://EXAMPLE.test', 'https://example.test:443/path')]
+        await asyncio.sleep(0)
+        assert cache.stats()['inflight'] == 1
+        gate.set()
+        results = await asyncio.gather(*requests)
+
+        assert analyze.calls == 1
+        assert {result['run'] for result, _ in results} == {1}
+        assert cache.stats()['coalesced'] == 2
+        assert cache.stats()['inflight'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_one_waiter_keeps_the_shared_analysis(clock):
+    async def scenario():
+        cache = AnalysisCache(ttl=10)
+        gate = asyncio.Event()
+        analyze = CountingAnalyzer(gate)
+
+        first = asyncio.create_task(cache.get_or_analyze(URL, analyze))
+        second = asyncio.create_task(cache.get_or_analyze(URL, analyze))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+
+        gate.set()
+        result, _ = await second
+        assert result['run'] == 1
+        assert analyze.cancelled == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_the_last_waiter_cancels_the_analysis(clock):
+    async def scenario():
+        cache = AnalysisCache(ttl=10)
+        analyze = CountingAnalyzer(asyncio.Event())
+
+        waiters = [asyncio.create_task(cache.get_or_analyze(URL, analyze)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert analyze.cancelled == 1
+        assert cache.stats()['inflight'] == 0
+
+        # 취소된 분석에 합류하지 않고 새 분석을 시작
+        analyze.gate.set()
+        result, _ = await cache.get_or_analyze(URL, analyze)
+        assert result['run'] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,171 @@
+"""JobManager - 작업 취소와 분석 중단, 대기열 제한, 저장소를 통한 작업 상태 공유"""
+
+import asyncio
+
+import pytest
+
+from analysis_cache import AnalysisCache
+from job_queue import JobManager, JobQueueFull, CANCELLED, QUEUED, RUNNING, SUCCEEDED
+from result_repository import SQLiteResultRepository
+
+URL = 'https://example.test'
+
+
+async def wait_for_status(manager: JobManager, job_id: str, status: str):
+    for _ in range(100):
+        record = await manager.lookup(job_id)
+        if record is not None and record['status'] == status:
+            return record
+        await asyncio.sleep(0.01)
+    raise AssertionError(f'{job_id} 가 {status} 상태가 되지 않음')
+
+
+def job_repository(path) -> SQLiteResultRepository:
+    return SQLiteResultRepository(str(path), max_entries=100, ttl=3600,
+                                  table='analysis_jobs', removed_table='removed_jobs')
+
+
+def test_cancelling_every_job_stops_the_shared_analysis():
+    async def scenario():
+        cache = AnalysisCache()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def analyze(url: str):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def run(url: str, force_refresh: bool):
+            result, _ = await cache.get_or_analyze(url, analyze, bypass=force_refresh)
+            return result
+
+        manager = JobManager(run, workers=2)
+        await manager.start()
+        try:
+            jobs = [manager.submit(URL) for _ in range(2)]
+            await started.wait()
+            await wait_for_status(manager, jobs[1].id, RUNNING)
+            assert cache.stats()['coalesced'] == 1
+
+            manager.cancel(jobs[0].id)
+            await asyncio.sleep(0)
+            assert not cancelled.is_set()  # 다른 작업이 아직 기다리는 중
+
+            manager.cancel(jobs[1].id)
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+            assert cache.stats()['inflight'] == 0
+            assert [job.status for job in jobs] == [CANCELLED, CANCELLED]
+        finally:
+            await manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_queued_job_never_runs():
+    async def scenario():
+        release = asyncio.Event()
+        runs = []
+
+        async def run(url: str, force_refresh: bool):
+            runs.append(url)
+            await release.wait()
+            return {'url': url}
+
+        manager = JobManager(run, workers=1)
+        await manager.start()
+        try:
+            first = manager.submit('https://first.test')
+            second = manager.submit('https://second.test')
+            await wait_for_status(manager, first.id, RUNNING)
+            assert second.status == QUEUED
+
+            manager.cancel(second.id)
+            release.set()
+            await wait_for_status(manager, first.id, SUCCEEDED)
+            await asyncio.sleep(0.01)
+            assert runs == ['https://first.test']
+            assert manager.stats()['cancelled'] == 1
+        finally:
+            await manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_new_jobs():
+    async def scenario():
+        async def run(url: str, force_refresh: bool):
+            await asyncio.Event().wait()
+
+        manager = JobManager(run, workers=1, max_queued=1)
+        await manager.start()
+        try:
+            manager.submit(URL)
+            await asyncio.sleep(0)  # 첫 작업은 워커가 꺼내 실행
+            manager.submit(URL)
+            with pytest.raises(JobQueueFull):
+                manager.submit(URL)
+            assert manager.stats()['rejected'] == 1
+        finally:
+            await manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_job_status_is_shared_through_the_repository(tmp_path):
+    async def scenario():
+        release = asyncio.Event()
+
+        async def run(url: str, force_refresh: bool):
+            await release.wait()
+            return {'url': url, 'ssl_grade': 'B'}
+
+        # 같은 SQLite 파일을 쓰는 두 워커 프로세스
+        owner = JobManager(run, repository=job_repository(tmp_path / 'jobs.db'))
+        other = JobManager(run, repository=job_repository(tmp_path / 'jobs.db'))
+        await owner.start()
+        await other.start()
+        try:
+            job = owner.submit(URL)
+            await owner.persist(job)
+            assert (await other.lookup(job.id))['status'] in (QUEUED, RUNNING)
+            await wait_for_status(other, job.id, RUNNING)
+
+            release.set()
+            record = await wait_for_status(other, job.id, SUCCEEDED)
+            assert record['result'] == {'url': URL, 'ssl_grade': 'B'}
+            assert await other.lookup('unknown') is None
+
+            # 끝난 작업의 기록 삭제는 어느 워커에서나 가능
+            await other.delete(job.id)
+            assert await other.lookup(job.id) is None
+        finally:
+            await owner.close()
+            await other.close()
+            await owner.repository.close()
+            await other.repository.close()
+
+    asyncio.run(scenario())
+
+
+def test_unfinished_job_cannot_be_deleted():
+    async def scenario():
+        async def run(url: str, force_refresh: bool):
+            await asyncio.Event().wait()
+
+        manager = JobManager(run)
+        await manager.start()
+        try:
+            job = manager.submit(URL)
+            with pytest.raises(ValueError):
+                await manager.delete(job.id)
+            manager.cancel(job.id)
+            await manager.delete(job.id)
+            assert manager.get(job.id) is None
+        finally:
+            await manager.close()
+
+    asyncio.run(scenario())
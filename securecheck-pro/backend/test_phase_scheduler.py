@@ -0,0 +1,105 @@
+"""PhaseScheduler - 공통 마감 시간, 추측 실행 단계의 결과 폐기와 진행 상황 전달 시점"""
+
+import asyncio
+
+import pytest
+
+from metrics import PhaseTimer
+from phase_scheduler import PhaseScheduler
+from retry_policy import Deadline
+
+
+async def value_after(value, delay: float = 0):
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_phase_past_the_deadline_returns_none_and_is_recorded():
+    async def scenario():
+        scheduler = PhaseScheduler(Deadline(0.05), PhaseTimer())
+        scheduler.start('fast', lambda: value_after('ok'))
+        scheduler.start('slow', lambda: value_after('late', delay=5))
+        try:
+            assert await scheduler.result('fast') == 'ok'
+            assert await scheduler.result('slow') is None
+            assert scheduler.timed_out == ['slow']
+        finally:
+            await scheduler.close()
+
+    asyncio.run(scenario())
+
+
+def test_phase_errors_before_the_deadline_are_raised():
+    async def scenario():
+        async def fail():
+            raise asyncio.TimeoutError()
+
+        scheduler = PhaseScheduler(Deadline(5), PhaseTimer())
+        scheduler.start('port', fail)
+        try:
+            # 단계 자체의 타임아웃은 마감 시간 초과로 취급하지 않음
+            with pytest.raises(asyncio.TimeoutError):
+                await scheduler.result('port')
+        finally:
+            await scheduler.close()
+        assert scheduler.timed_out == []
+
+    asyncio.run(scenario())
+
+
+def test_phases_run_concurrently_and_record_timings():
+    async def scenario():
+        timer = PhaseTimer()
+        scheduler = PhaseScheduler(Deadline(5), timer)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for phase in ('port', 'certificate', 'headers'):
+            scheduler.start(phase, lambda phase=phase: value_after(phase, delay=0.05))
+        for phase in ('port', 'certificate', 'headers'):
+            assert await scheduler.result(phase) == phase
+        await scheduler.close()
+
+        assert loop.time() - started < 0.15
+        assert set(timer.timings) == {'port', 'certificate', 'headers'}
+
+    asyncio.run(scenario())
+
+
+def test_speculative_phase_is_reported_only_when_used():
+    async def scenario():
+        reported = []
+        scheduler = PhaseScheduler(Deadline(5), PhaseTimer(), on_result=lambda phase, value: reported.append(phase))
+        scheduler.start('port', lambda: value_after({'port_443_open': True}))
+        scheduler.start('certificate', lambda: value_after({'ssl_status': 'valid'}), speculative=True)
+        await asyncio.sleep(0.01)
+
+        # 끝났어도 결과를 사용하기 전에는 전달하지 않음
+        assert reported == ['port']
+        await scheduler.result('certificate')
+        await scheduler.result('certificate')
+        assert reported == ['port', 'certificate']
+        await scheduler.close()
+
+    asyncio.run(scenario())
+
+
+def test_discarded_speculative_phase_is_never_reported():
+    async def scenario():
+        reported = []
+        timer = PhaseTimer()
+        scheduler = PhaseScheduler(Deadline(5), timer, on_result=lambda phase, value: reported.append(phase))
+        scheduler.start('port', lambda: value_after({'port_443_open': True}))
+        scheduler.start('redirect', lambda: value_after({'http_redirect_to_https': True}), speculative=True)
+        scheduler.start('headers', lambda: value_after({}, delay=5), speculative=True)
+
+        await scheduler.result('port')
+        await asyncio.sleep(0.01)
+        # 443 포트가 열려 있으면 리다이렉트 결과는 버리고, 남은 단계는 종료 시 취소
+        scheduler.cancel('redirect')
+        await scheduler.close()
+
+        assert reported == ['port']
+        # 취소된 추측 실행은 소요 시간에 기록하지 않음
+        assert 'headers' not in timer.timings
+
+    asyncio.run(scenario())
@@ -0,0 +1,128 @@
+"""ResultStore - 항목 수/바이트 예산 제한, 보관 기간, 삭제 기록(410 응답)"""
+
+import asyncio
+import types
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import result_store
+from result_repository import MemoryResultRepository, SQLiteResultRepository
+from result_store import ResultStore, estimate_size
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(result_store, 'time', types.SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def result(index: int, padding: int = 0) -> dict:
+    return {'url': f'https://site{index}.test', 'ssl_grade': 'B', 'padding': 'x' * padding}
+
+
+def test_entry_limit_evicts_least_recently_used():
+    store = ResultStore(max_entries=2)
+    store.put('a', result(1))
+    store.put('b', result(2))
+    assert store.get('a') is not None  # a 를 최근 사용으로 갱신
+    store.put('c', result(3))
+
+    assert store.get('b') is None
+    assert store.removal_reason('b') == 'evicted'
+    assert store.get('a') == result(1)
+    assert store.stats()['evicted'] == 1
+
+
+def test_byte_budget_evicts_oldest_until_it_fits():
+    size = estimate_size(result(1, padding=100))
+    store = ResultStore(max_entries=100, max_bytes=size * 2)
+    for index in range(3):
+        store.put(str(index), result(index, padding=100))
+
+    assert len(store) == 2
+    assert store.removal_reason('0') == 'evicted'
+    assert store.stats()['bytes'] <= size * 2
+
+
+def test_oversized_entry_is_kept_alone():
+    store = ResultStore(max_bytes=10)
+    store.put('small', result(1))
+    store.put('large', result(2, padding=1000))
+    assert 'large' in store
+    assert store.removal_reason('small') == 'evicted'
+
+
+def test_expired_entry_leaves_a_tombstone(clock):
+    store = ResultStore(ttl=60)
+    store.put('a', result(1))
+    clock.now += 61
+    assert store.get('a') is None
+    assert store.removal_reason('a') == 'expired'
+    assert store.removal_reason('never-stored') is None
+
+
+def test_saving_again_clears_the_tombstone():
+    store = ResultStore(max_entries=1)
+    store.put('a', result(1))
+    store.put('b', result(2))
+    store.put('a', result(1))
+    assert store.removal_reason('a') is None
+    assert store.get('a') == result(1)
+
+
+def test_deleted_entry_has_no_tombstone():
+    store = ResultStore()
+    store.put('a', result(1))
+    store.delete('a')
+    assert store.get('a') is None
+    assert store.removal_reason('a') is None
+
+
+def test_tombstones_are_bounded():
+    store = ResultStore(max_entries=1, max_tombstones=2)
+    for index in range(5):
+        store.put(str(index), result(index))
+    assert store.stats()['tombstones'] == 2
+    assert store.removal_reason('0') is None
+    assert store.removal_reason('3') == 'evicted'
+
+
+def test_sqlite_repository_keeps_tombstones_for_evicted_results(tmp_path):
+    async def scenario():
+        repository = SQLiteResultRepository(str(tmp_path / 'results.db'), max_entries=1, prune_interval=0)
+        try:
+            await repository.save('a', result(1))
+            await repository.save('b', result(2))
+            assert await repository.get('a') is None
+            assert await repository.removal_reason('a') == 'evicted'
+            assert await repository.get('b') == result(2)
+
+            await repository.delete('b')
+            assert await repository.get('b') is None
+            assert await repository.removal_reason('b') is None
+        finally:
+            await repository.close()
+
+    asyncio.run(scenario())
+
+
+def test_download_distinguishes_evicted_from_unknown_reports(monkeypatch):
+    repository = MemoryResultRepository(ResultStore(max_entries=1))
+    monkeypatch.setattr(main, 'analysis_results', repository)
+    repository.store.put('old', result(1))
+    repository.store.put('new', result(2))
+
+    client = TestClient(main.app)
+    assert client.get('/api/v1/reports/old/download').status_code == 410
+    assert client.get('/api/v1/reports/unknown/download').status_code == 404
@@ -0,0 +1,149 @@
+"""ScanGovernor - 토큰 버킷 충전, 대상별 제한(선택), 전역 동시성, AIMD 한도 조정"""
+
+import asyncio
+import types
+
+import pytest
+
+import scan_governor
+from scan_governor import ScanGovernor, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(scan_governor, 'time', types.SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def test_token_bucket_spends_burst_then_refills_at_rate(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # 토큰이 없으면 예약한 순서대로 기다릴 시간이 늘어남
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    # 예약분(-2)을 갚고 1초 동안 2개 충전 -> 다시 0개에서 시작
+    clock.now += 1.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+    # 오래 쉬어도 burst 까지만 쌓임
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() > 0
+
+
+def test_per_target_rate_is_off_by_default():
+    async def scenario():
+        governor = ScanGovernor()
+        for _ in range(50):
+            async with governor.slot('192.0.2.1'):
+                pass
+        assert governor.stats()['tracked_targets'] == 0
+        assert governor.stats()['per_target_rate'] is None
+
+    asyncio.run(scenario())
+
+
+def test_per_target_rate_delays_only_the_busy_target():
+    async def scenario():
+        governor = ScanGovernor(per_target_rate=1000, per_target_burst=2)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(4):
+            async with governor.slot('192.0.2.1'):
+                pass
+        # burst 2개 이후 2개는 1ms 간격으로 대기
+        assert loop.time() - started >= 0.001
+        async with governor.slot('192.0.2.2'):
+            pass
+        assert governor.stats()['tracked_targets'] == 2
+
+    asyncio.run(scenario())
+
+
+def test_global_limit_queues_extra_connections():
+    async def scenario():
+        governor = ScanGovernor(max_concurrency=2, min_concurrency=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with governor.slot('192.0.2.1'):
+                await release.wait()
+
+        holders = [asyncio.create_task(hold()) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert governor.stats()['active'] == 2
+        assert governor.stats()['queued'] == 1
+
+        release.set()
+        await asyncio.gather(*holders)
+        assert governor.stats()['active'] == 0
+        assert governor.stats()['queued'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_retained_slot_counts_until_released():
+    async def scenario():
+        governor = ScanGovernor(max_concurrency=2)
+        async with governor.slot('192.0.2.1'):
+            release = governor.retain()
+        assert governor.stats()['active'] == 1
+        release()
+        release()
+        assert governor.stats()['active'] == 0
+
+    asyncio.run(scenario())
+
+
+async def _connect(governor: ScanGovernor, timed_out: bool):
+    try:
+        async with governor.slot('192.0.2.1'):
+            if timed_out:
+                raise asyncio.TimeoutError()
+    except asyncio.TimeoutError:
+        pass
+
+
+def test_timeout_spike_cuts_the_limit_and_successes_raise_it_again():
+    async def scenario():
+        governor = ScanGovernor(max_concurrency=8, min_concurrency=2, window_size=10,
+                                timeout_threshold=0.2, increase_every=3)
+
+        # 관측 구간의 절반(5회)이 채워질 때까지는 줄이지 않음
+        for _ in range(4):
+            await _connect(governor, timed_out=True)
+        assert governor.limit == 8
+
+        await _connect(governor, timed_out=True)
+        assert governor.limit == 6  # 25% 감소
+        assert governor.stats()['backoffs'] == 1
+
+        # increase_every 번 연속 성공마다 1씩 회복
+        for _ in range(3):
+            await _connect(governor, timed_out=False)
+        assert governor.limit == 7
+        for _ in range(6):
+            await _connect(governor, timed_out=False)
+        assert governor.limit == 8  # max_concurrency 를 넘지 않음
+
+    asyncio.run(scenario())
+
+
+def test_limit_never_drops_below_min_concurrency():
+    async def scenario():
+        governor = ScanGovernor(max_concurrency=4, min_concurrency=3, window_size=4)
+        for _ in range(20):
+            await _connect(governor, timed_out=True)
+        assert governor.limit == 3
+
+    asyncio.run(scenario())
@@ -0,0 +1,138 @@
+"""
+TLS 연결 특성 수집 및 평가 모듈
+
+포트 테스트에서 이미 맺은 핸드셰이크로부터 협상된 프로토콜 버전, 암호 스위트, ALPN,
+서버 인증서 공개키 종류/길이를 기록하고 (추가 연결 없음),
+SSL Labs 평가 방식을 단순화하여 프로토콜/키 교환/암호 강도 점수와 등급 상한을 계산합니다.
+심층 분석(protocol_scan) 결과가 있으면 서버가 받아들이는 가장 약한 프로토콜/암호까지 반영합니다.
+"""
+
+import ssl
+from typing import Dict, List, Optional
+
+from cert_chain import parse_certificate
+from protocol_scan import weakest_cipher_bits
+
+# 협상된 프로토콜 버전별 점수 (SSL Labs Protocol Support 기준)
+PROTOCOL_SCORES = {
+    'TLSv1.3': 100,
+    'TLSv1.2': 100,
+    'TLSv1.1': 95,
+    'TLSv1': 90,
+    'SSLv3': 80,
+    'SSLv2': 0,
+}
+
+# 포트 테스트 핸드셰이크에서 제시하는 ALPN 프로토콜
+ALPN_PROTOCOLS = ['h2', 'http/1.1']
+
+
+def connection_info(ssl_object: ssl.SSLObject, peer_chain: List[bytes]) -> Dict:
+    """핸드셰이크가 끝난 연결의 협상 결과"""
+    cipher_name, _, cipher_bits = ssl_object.cipher() or (None, None, None)
+    tls_version = ssl_object.version()
+    info = {
+        'tls_version': tls_version,
+        'cipher_suite': cipher_name,
+        'cipher_bits': cipher_bits,
+        'alpn_protocol': ssl_object.selected_alpn_protocol(),
+        'session_resumed': ssl_object.session_reused,
+        # TLS 1.3 은 항상 (EC)DHE, TLS 1.2 이하는 암호 스위트 이름으로 판단
+        'forward_secrecy': tls_version == 'TLSv1.3'
+                           or bool(cipher_name and cipher_name.startswith(('ECDHE', 'DHE', 'EDH'))),
+        'key_type': None,
+        'key_size': None,
+    }
+    if peer_chain:
+        try:
+            # 인증서 분석 단계와 같은 파싱 캐시 사용
+            info.update(parse_certificate(peer_chain[0]).key_info)
+        except ValueError:
+            pass
+    return info
+
+
+def _rsa_equivalent_bits(key_type: Optional[str], key_size: Optional[int]) -> Optional[int]:
+    """공개키 길이를 RSA 기준 보안 강도로 환산 (EC 256비트 ≈ RSA 3072비트)"""
+    if key_size is None:
+        return None
+    if key_type in ('EC', 'Ed25519', 'Ed448'):
+        return 3072 if key_size < 384 else 7680
+    return key_size
+
+
+def _cipher_bits_score(cipher_bits: int) -> int:
+    if cipher_bits == 0:
+        return 0
+    if cipher_bits < 128:
+        return 20
+    if cipher_bits < 256:
+        return 80
+    return 100
+
+
+def capability_scores(result: Dict) -> Optional[Dict[str, int]]:
+    """프로토콜 지원 / 키 교환 / 암호 강도 점수 (0-100) - TLS 연결 정보가 없으면 None"""
+    tls_version = result.get('tls_version')
+    if not tls_version:
+        return None
+
+    # SSL Labs 방식: (가장 좋은 항목 + 가장 약한 항목) / 2 - 심층 분석이 없으면 협상된 값만 사용
+    protocol_scan = result.get('protocol_scan') or {}
+    supported = [PROTOCOL_SCORES[name] for name in protocol_scan.get('supported_protocols', [])
+                 if name in PROTOCOL_SCORES]
+    if supported:
+        protocol_score = (max(supported) + min(supported)) // 2
+    else:
+        protocol_score = PROTOCOL_SCORES.get(tls_version, 0)
+
+    # 키 교환: 순방향 비밀성이 있으면 (EC)DHE, 없으면 서버 인증서 키로 세션 키를 전달
+    key_bits = _rsa_equivalent_bits(result.get('key_type'), result.get('key_size'))
+    if result.get('forward_secrecy'):
+        key_exchange_score = 90
+    elif key_bits is None:
+        key_exchange_score = 0
+    elif key_bits < 512:
+        key_exchange_score = 20
+    elif key_bits < 1024:
+        key_exchange_score = 40
+    elif key_bits < 2048:
+        key_exchange_score = 80
+    elif key_bits < 4096:
+        key_exchange_score = 90
+    else:
+        key_exchange_score = 100
+
+    cipher_score = _cipher_bits_score(result.get('cipher_bits') or 0)
+    weakest_bits = weakest_cipher_bits(protocol_scan)
+    if weakest_bits is not None:
+        cipher_score = (cipher_score + _cipher_bits_score(weakest_bits)) // 2
+
+    return {
+        'protocol_score': protocol_score,
+        'key_exchange_score': key_exchange_score,
+        'cipher_strength_score': cipher_score,
+    }
+
+
+def grade_cap(result: Dict) -> Optional[str]:
+    """협상 결과(와 심층 분석 결과)로 정해지는 최고 가능 등급 - 제한이 없으면 None"""
+    tls_version = result.get('tls_version')
+    if not tls_version:
+        return None
+
+    protocol_scan = result.get('protocol_scan') or {}
+    weak_groups = set(protocol_scan.get('weak_cipher_groups', []))
+    supported = set(protocol_scan.get('supported_protocols', [])) | {tls_version}
+
+    key_bits = _rsa_equivalent_bits(result.get('key_type'), result.get('key_size'))
+    if (supported & {'SSLv2', 'SSLv3'} or weak_groups & {'null', 'anonymous', 'export_des'}
+            or (key_bits is not None and key_bits < 1024)):
+        return 'F'
+    cipher_bits = result.get('cipher_bits')
+    if (cipher_bits is not None and cipher_bits < 128) or weak_groups & {'rc4', '3des'}:
+        return 'C'
+    if (supported & {'TLSv1', 'TLSv1.1'} or not result.get('forward_secrecy')
+            or (key_bits is not None and key_bits < 2048)):
+        return 'B'
+    return None
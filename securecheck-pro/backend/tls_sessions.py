@@ -0,0 +1,152 @@
+"""
+TLS 세션 재개 캐시 모듈
+
+같은 서버(호스트, 주소, 포트)에 다시 연결할 때 이전 핸드셰이크의 ssl.SSLSession 을 제시하여
+전체 핸드셰이크(인증서 전송/검증, 키 교환) 대신 세션 재개를 시도합니다.
+
+asyncio 의 start_tls 는 session 인자를 받지 않으므로, SSLContext.sslobject_class 를 ResumableSSLObject 로 바꾸고
+연결 직전에 contextvar 로 사용할 세션을 넘겨줍니다 (SSLContextRegistry 가 만든 컨텍스트에만 적용).
+TLS 1.3 세션 티켓은 핸드셰이크 직후에 도착하므로 연결을 ticket_grace 초 늦게 닫으며 티켓을 기다립니다.
+
+재개된 핸드셰이크에서는 서버가 인증서를 보내지 않습니다. 인증서 분석에 쓰는 연결은 서버가 지금 제공하는
+인증서를 받아야 하므로(갱신/교체된 인증서, 서버별로 다른 인증서) 세션 재개를 사용하지 않고,
+연결을 여는 쪽이 인증서가 필요 없는 연결에만 key() 로 만든 키를 넘겨 재개를 요청합니다.
+주소별로 다른 서버일 수 있으므로 키에 연결한 IP 주소를 포함합니다.
+"""
+
+import asyncio
+import ssl
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional, Tuple
+
+# (SSLContext id, 호스트(SNI), 연결한 IP 주소, 포트)
+SessionKey = Tuple[int, str, str, int]
+
+# 다음에 생성되는 SSLObject 에 제시할 세션 (_tls_connection 에서 start_tls 호출 동안만 설정)
+_offered_session: ContextVar[Optional[ssl.SSLSession]] = ContextVar('offered_tls_session', default=None)
+
+
+class ResumableSSLObject(ssl.SSLObject):
+    """contextvar 로 전달된 세션을 사용하여 생성되는 SSLObject"""
+
+    @classmethod
+    def _create(cls, incoming, outgoing, server_side=False, server_hostname=None, session=None, context=None):
+        offered = _offered_session.get() if session is None and not server_side else None
+        if offered is None:
+            return super()._create(incoming, outgoing, server_side, server_hostname,
+                                   session=session, context=context)
+        try:
+            return super()._create(incoming, outgoing, server_side, server_hostname,
+                                   session=offered, context=context)
+        except ValueError:
+            # 다른 SSLContext 에서 만든 세션 (컨텍스트 재생성 후 등) - 세션 없이 연결
+            return super()._create(incoming, outgoing, server_side, server_hostname, context=context)
+
+
+def enable_resumption(context: ssl.SSLContext) -> ssl.SSLContext:
+    context.sslobject_class = ResumableSSLObject
+    return context
+
+
+class TLSSessionCache:
+    """(SSLContext, 호스트, 주소, 포트)별 최근 TLS 세션 LRU 캐시"""
+
+    def __init__(self, max_entries: int = 10000, ticket_grace: float = 0.5):
+        self.max_entries = max_entries
+        self.ticket_grace = ticket_grace
+        self._entries: "OrderedDict[SessionKey, ssl.SSLSession]" = OrderedDict()
+
+        self.offered = 0
+        self.resumed = 0
+        self.full_handshakes = 0
+
+    def stats(self) -> Dict:
+        connections = self.resumed + self.full_handshakes
+        return {
+            'size': len(self._entries),
+            'offered': self.offered,
+            'resumed': self.resumed,
+            'full_handshakes': self.full_handshakes,
+            'resumption_ratio': self.resumed / connections if connections else 0.0
+        }
+
+    @staticmethod
+    def supports(context: ssl.SSLContext) -> bool:
+        return context.sslobject_class is ResumableSSLObject
+
+    def key(self, context: ssl.SSLContext, host: str, address: Optional[str], port: int) -> Optional[SessionKey]:
+        """세션 재개를 사용할 연결의 키 - 재개할 수 없는 컨텍스트이거나 주소를 모르면 None"""
+        if not self.supports(context) or not address:
+            return None
+        return id(context), host, address, port
+
+    def get(self, key: SessionKey) -> Optional[ssl.SSLSession]:
+        session = self._entries.get(key)
+        if session is None:
+            return None
+        if session.time + session.timeout <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return session
+
+    def store(self, key: SessionKey, session: Optional[ssl.SSLSession]):
+        if session is None:
+            return
+        self._entries[key] = session
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @contextmanager
+    def offer(self, key: Optional[SessionKey]):
+        """이 블록 안에서 생성되는 SSLObject 에 캐시된 세션을 제시합니다 (key 가 None 이면 제시하지 않음)"""
+        session = self.get(key) if key is not None else None
+        if session is not None:
+            self.offered += 1
+        token = _offered_session.set(session)
+        try:
+            yield
+        finally:
+            _offered_session.reset(token)
+
+    def record(self, key: Optional[SessionKey], ssl_object: ssl.SSLObject) -> bool:
+        """핸드셰이크가 끝난 연결의 세션 재개 여부를 기록하고 새 세션을 캐시합니다"""
+        if key is None:
+            return False
+        resumed = ssl_object.session_reused
+        if resumed:
+            self.resumed += 1
+        else:
+            self.full_handshakes += 1
+        session = ssl_object.session
+        if session is not None and (session.has_ticket or ssl_object.version() != 'TLSv1.3'):
+            self.store(key, session)
+        return resumed
+
+    def close_transport(self, key: Optional[SessionKey], transport: asyncio.BaseTransport,
+                        ssl_object: Optional[ssl.SSLObject], retain: Callable[[], Callable[[], None]]):
+        """연결을 닫습니다 - TLS 1.3 티켓을 아직 받지 못했으면 ticket_grace 초 동안 기다린 뒤 저장하고 닫음
+
+        retain() 은 연결이 열려 있는 동안 동시 연결 한도(ScanGovernor 슬롯)를 계속 점유하고 반납 함수를 돌려줍니다.
+        """
+        if (key is None or ssl_object is None or self.ticket_grace <= 0
+                or ssl_object.version() != 'TLSv1.3' or (ssl_object.session and ssl_object.session.has_ticket)):
+            transport.abort()
+            return
+
+        release = retain()
+
+        def finish():
+            try:
+                session = ssl_object.session
+                if session is not None and session.has_ticket:
+                    self.store(key, session)
+                transport.abort()
+            finally:
+                release()
+
+        asyncio.get_running_loop().call_later(self.ticket_grace, finish)
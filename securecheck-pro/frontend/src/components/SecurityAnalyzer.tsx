@@ -6,8 +6,8 @@ import { SecurityReport } from './SecurityReport';
 interface AnalysisResult {
   id: string;
   url: string;
-  ssl_grade: string;
-  security_score: number;
+  ssl_grade: string | null;
+  security_score: number | null;
   issues: Array<{
     type: string;
     severity: 'low' | 'medium' | 'high' | 'critical';
@@ -3,8 +3,8 @@
 interface AnalysisResult {
   id: string;
   url: string;
-  ssl_grade: string;
-  security_score: number;
+  ssl_grade: string | null;  // 분석 시간 초과로 판정하지 못하면 null
+  security_score: number | null;
   issues: Array<{
     type: string;
     severity: 'low' | 'medium' | 'high' | 'critical';
@@ -71,6 +71,9 @@ export function SecurityReport({ data }: SecurityReportProps) {
   const generatePDFContent = (data: AnalysisResult): string => {
     const domain = data.url.replace(/https?:\/\//, '').replace(/\/$/, '');
     const analysisDate = new Date().toLocaleDateString('ko-KR');
+    const grade = data.ssl_grade ?? '판정 보류';
+    const score = data.security_score ?? 0;
+    const scoreLabel = data.security_score ?? '-';
 
     return `<!DOCTYPE html>
 <html lang="ko">
@@ -162,11 +165,11 @@ export function SecurityReport({ data }: SecurityReportProps) {
         <div class="metrics-grid">
             <div class="metric-card ${data.ssl_grade === 'F' ? 'critical' : data.ssl_grade === 'D' ? 'warning' : 'normal'}">
                 <span class="metric-label">SSL 등급</span>
-                <span class="metric-number">${data.ssl_grade}</span>
+                <span class="metric-number">${grade}</span>
             </div>
-            <div class="metric-card ${data.security_score < 50 ? 'critical' : data.security_score < 80 ? 'warning' : 'normal'}">
+            <div class="metric-card ${score < 50 ? 'critical' : score < 80 ? 'warning' : 'normal'}">
                 <span class="metric-label">보안 점수</span>
-                <span class="metric-number">${data.security_score}/100</span>
+                <span class="metric-number">${scoreLabel}/100</span>
             </div>
             <div class="metric-card critical">
                 <span class="metric-label">발견된 문제</span>
@@ -201,8 +204,8 @@ export function SecurityReport({ data }: SecurityReportProps) {
     <div style="background: #f7fafc; padding: 12px; border-radius: 4px; border: 1px solid #e2e8f0; font-family: monospace; font-size: 10px;">
         Domain: ${domain}<br/>
         Valid: ${data.ssl_grade !== 'F' ? 'Yes' : 'No'}<br/>
-        SSL Grade: ${data.ssl_grade}<br/>
-        Security Score: ${data.security_score}/100
+        SSL Grade: ${grade}<br/>
+        Security Score: ${scoreLabel}/100
     </div>
 
     <h4>📊 문제점 분석</h4>
@@ -224,7 +227,7 @@ export function SecurityReport({ data }: SecurityReportProps) {
             </tr>
             <tr>
                 <td style="padding: 6px; border-bottom: 1px solid #f1f5f9;">SSL 등급</td>
-                <td style="padding: 6px; border-bottom: 1px solid #f1f5f9;">${data.ssl_grade}</td>
+                <td style="padding: 6px; border-bottom: 1px solid #f1f5f9;">${grade}</td>
                 <td style="padding: 6px; border-bottom: 1px solid #f1f5f9;">${data.ssl_grade === 'F' ? 'SSL 미적용 또는 심각한 문제' : '양호'}</td>
                 <td style="padding: 6px; border-bottom: 1px solid #f1f5f9;">${data.ssl_grade === 'F' ? '🔴 높음' : '🟢 낮음'}</td>
             </tr>
@@ -332,12 +335,12 @@ export function SecurityReport({ data }: SecurityReportProps) {
             <div className="space-y-3">
               <div className="flex justify-between items-center p-3 bg-gray-50 rounded">
                 <span className="font-medium">SSL 등급</span>
-                <span className="text-xl font-bold text-blue-600">{data.ssl_grade}</span>
+                <span className="text-xl font-bold text-blue-600">{data.ssl_grade ?? '판정 보류'}</span>
               </div>
               <div className="flex justify-between items-center p-3 bg-gray-50 rounded">
                 <span className="font-medium">보안 점수</span>
-                <span className={`text-xl font-bold ${getScoreColor(data.security_score)}`}>
-                  {data.security_score}/100
+                <span className={`text-xl font-bold ${getScoreColor(data.security_score ?? 0)}`}>
+                  {data.security_score ?? '-'}/100
                 </span>
               </div>
               <div className="flex justify-between items-center p-3 bg-gray-50 rounded">